@@ -0,0 +1,207 @@
+"""
+Benchmarks the creation of mutation classes and the schema for synthetic models.
+
+    python benchmarks/schema_build.py --models 200 --mutations 3 --repeat 5
+
+Each repetition runs in a fresh process. It creates N models, a node type for each
+model, and M mutations per model (in the order create, update, patch, batch create,
+batch update, batch patch, delete). It then builds a schema containing all of them.
+
+The reported "import time" covers creating the node types and mutation classes,
+which is what importing a schema module costs. "Schema time" is the time to build
+the schema, and "peak memory" is the peak memory allocated during both. The
+median of the repetitions is reported. Pass --profile to print the schema build
+profile of the last repetition.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MUTATION_KINDS = (
+    ("Create", "DjangoCreateMutation"),
+    ("Update", "DjangoUpdateMutation"),
+    ("Patch", "DjangoPatchMutation"),
+    ("BatchCreate", "DjangoBatchCreateMutation"),
+    ("BatchUpdate", "DjangoBatchUpdateMutation"),
+    ("BatchPatch", "DjangoBatchPatchMutation"),
+    ("Delete", "DjangoDeleteMutation"),
+)
+
+
+def setup_django():
+    import django
+    from django.conf import settings
+
+    settings.configure(
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "graphene_django",
+        ],
+        DATABASES={
+            "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+        },
+    )
+    django.setup()
+
+
+def create_models(count, field_count, choice_count):
+    from django.db import models
+
+    choices = [(f"CHOICE_{i}", f"Choice {i}") for i in range(choice_count)]
+    result = []
+    for i in range(count):
+        attrs = {
+            "__module__": "benchmark.models",
+            "Meta": type("Meta", (), {"app_label": "benchmark"}),
+        }
+        for j in range(field_count):
+            kind = j % 5
+            if kind == 0:
+                attrs[f"text_{j}"] = models.CharField(max_length=64)
+            elif kind == 1:
+                attrs[f"number_{j}"] = models.IntegerField(default=0)
+            elif kind == 2:
+                attrs[f"flag_{j}"] = models.BooleanField(default=False)
+            elif kind == 3:
+                attrs[f"timestamp_{j}"] = models.DateTimeField(null=True)
+            else:
+                attrs[f"choice_{j}"] = models.CharField(max_length=16, choices=choices)
+        if result:
+            attrs["parent"] = models.ForeignKey(
+                result[-1], null=True, on_delete=models.SET_NULL, related_name="+"
+            )
+        result.append(type(f"Model{i}", (models.Model,), attrs))
+    return result
+
+
+def run(args):
+    setup_django()
+
+    import graphene
+    from graphene_django import DjangoObjectType
+
+    from graphene_django_cud import mutations
+    from graphene_django_cud.profiling import SchemaBuildProfiler
+
+    models = create_models(args.models, args.fields, args.choices)
+
+    tracemalloc.start()
+    with SchemaBuildProfiler() as profiler:
+        start = time.perf_counter()
+        mutation_fields = {}
+        for model in models:
+            type(
+                f"{model.__name__}Node",
+                (DjangoObjectType,),
+                {"Meta": type("Meta", (), {"model": model})},
+            )
+            for prefix, base_name in MUTATION_KINDS[: args.mutations]:
+                meta_attrs = {"model": model}
+                if args.lazy and base_name != "DjangoDeleteMutation":
+                    meta_attrs["lazy_input_type"] = True
+                mutation = type(
+                    f"{prefix}{model.__name__}Mutation",
+                    (getattr(mutations, base_name),),
+                    {"Meta": type("Meta", (), meta_attrs)},
+                )
+                mutation_fields[f"{prefix.lower()}_{model.__name__.lower()}"] = (
+                    mutation.Field()
+                )
+        import_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graphene.Schema(
+            query=type(
+                "Query", (graphene.ObjectType,), {"ping": graphene.String()}
+            ),
+            mutation=type("Mutation", (graphene.ObjectType,), mutation_fields),
+        )
+        schema_time = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    report = profiler.get_report()
+    return {
+        "import_time": import_time,
+        "schema_time": schema_time,
+        "peak_memory": peak_memory,
+        "fields_converted": report["fields_converted"],
+        "nested_input_types": report["nested_input_types"],
+        "enums": report["enums"],
+        "profile": profiler.format_report(limit=10),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--models", type=int, default=100, help="Number of models")
+    parser.add_argument(
+        "--mutations",
+        type=int,
+        default=3,
+        choices=range(1, len(MUTATION_KINDS) + 1),
+        help="Number of mutations per model",
+    )
+    parser.add_argument("--fields", type=int, default=10, help="Fields per model")
+    parser.add_argument(
+        "--choices", type=int, default=20, help="Choices of the choice fields"
+    )
+    parser.add_argument("--lazy", action="store_true", help="Use lazy input types")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of processes")
+    parser.add_argument("--profile", action="store_true", help="Print the profile")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run(args)))
+        return
+
+    child_args = [a for a in sys.argv[1:] if a not in ("--json", "--profile")]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT] + sys.path))
+    results = []
+    for _ in range(args.repeat):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child"] + child_args,
+            check=True,
+            stdout=subprocess.PIPE,
+            env=env,
+        ).stdout
+        results.append(json.loads(output))
+
+    summary = {
+        key: statistics.median(result[key] for result in results)
+        for key in ("import_time", "schema_time", "peak_memory")
+    }
+    for key in ("fields_converted", "nested_input_types", "enums"):
+        summary[key] = results[-1][key]
+
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        print(
+            f"{args.models} models x {args.mutations} mutations"
+            f"{' (lazy)' if args.lazy else ''}, median of {args.repeat} runs:"
+        )
+        print(f"  import time:  {summary['import_time'] * 1000:.1f} ms")
+        print(f"  schema time:  {summary['schema_time'] * 1000:.1f} ms")
+        print(f"  peak memory:  {summary['peak_memory'] / 2 ** 20:.1f} MiB")
+        print(
+            f"  {summary['fields_converted']} fields converted, "
+            f"{summary['nested_input_types']} nested input types, "
+            f"{summary['enums']} enums"
+        )
+    if args.profile:
+        print(results[-1]["profile"])
+
+
+if __name__ == "__main__":
+    main()
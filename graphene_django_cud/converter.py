@@ -34,6 +34,7 @@ from graphene_django.compat import ArrayField, HStoreField, JSONField, RangeFiel
 from graphene_file_upload.scalars import Upload
 from graphql import assert_valid_name, GraphQLError
 
+from graphene_django_cud.profiling import count_build_event, profile_build_step
 from graphene_django_cud.types import TimeDelta
 
 
@@ -61,7 +62,7 @@ def convert_choice_name(name):
 
 
 def get_choices(choices):
-    converted_names = []
+    converted_names = set()
     for value, help_text in choices:
         if isinstance(help_text, (tuple, list)):
             for choice in get_choices(help_text):
@@ -70,15 +71,62 @@ def get_choices(choices):
             name = convert_choice_name(value)
             while name in converted_names:
                 name += "_" + str(len(converted_names))
-            converted_names.append(name)
+            converted_names.add(name)
             description = help_text
             yield name, value, description
 
 
+# Enums created from choices, keyed on their name and the normalized choices
+_choices_enums = {}
+# Converted choices, keyed on the normalized choices
+_converted_choices = {}
+
+
+def normalize_choices(choices):
+    """
+    Returns a hashable representation of the choices, which is equal for choices
+    converting to the same enum. Returns None if a choice value is not hashable.
+    """
+    normalized = []
+    for value, help_text in choices:
+        if isinstance(help_text, (tuple, list)):
+            group = normalize_choices(help_text)
+            if group is None:
+                return None
+            normalized.append((force_str(value), group))
+        else:
+            normalized.append((type(value), value, force_str(help_text)))
+
+    normalized = tuple(normalized)
+    try:
+        hash(normalized)
+    except TypeError:
+        return None
+    return normalized
+
+
+@profile_build_step("convert_choices_field")
 def convert_choices_field(field, choices, required=None):
+    """
+    Converts the choices of a field to an enum, which is named after the field.
+    Fields with identical choices share the converted choices, and an enum is only
+    shared if it would have the same name, so that names never depend on the order
+    in which fields are converted.
+    """
     meta = field.model._meta
     name = to_camel_case("{}_{}_{}".format(meta.object_name, field.name, "Input"))
-    choices = list(get_choices(choices))
+
+    key = normalize_choices(choices)
+    enum = _choices_enums.get((name, key)) if key is not None else None
+    if enum is not None:
+        return enum
+
+    converted_choices = _converted_choices.get(key) if key is not None else None
+    if converted_choices is None:
+        converted_choices = list(get_choices(choices))
+        if key is not None:
+            _converted_choices[key] = converted_choices
+    choices = converted_choices
     named_choices = [(c[0], c[1]) for c in choices]
     named_choices_descriptions = {c[0]: c[2] for c in choices}
 
@@ -88,12 +136,16 @@ def convert_choices_field(field, choices, required=None):
             return named_choices_descriptions[self.name]
 
     enum = Enum(name, list(named_choices), type=EnumWithDescriptionsType)
+    count_build_event("enums")
+    if key is not None:
+        enum = _choices_enums.setdefault((name, key), enum)
     # Note that we do not instantiate the field here, so we can store it un-instantiated in the registry.
     # This is the allow different parameters (e.g. `required`) to be passed to the field.
     return enum
     # return enum(description=field.help_text, required=is_required(field, required))
 
 
+@profile_build_step("convert_django_field_with_choices")
 def convert_django_field_with_choices(
     field,
     registry=None,
@@ -101,6 +153,7 @@ def convert_django_field_with_choices(
     field_many_to_many_extras=None,
     field_foreign_key_extras=None,
 ):
+    count_build_event("fields_converted")
     choices = getattr(field, "choices", None)
     if choices:
         registry_name = to_camel_case(
@@ -0,0 +1,8 @@
+from graphql import GraphQLError
+
+
+class ConcurrentModificationError(GraphQLError):
+    """
+    Raised when an object has been changed since the version supplied to a mutation
+    using optimistic concurrency control.
+    """
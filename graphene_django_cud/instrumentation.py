@@ -0,0 +1,184 @@
+import inspect
+import logging
+from collections import OrderedDict
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.db import connections, router
+
+logger = logging.getLogger(__name__)
+
+# The phases which are recorded, and the mutation methods belonging to them. Methods which
+# a mutation class does not have are skipped. In addition, all `handle_<name>`-methods are
+# recorded as "handlers", and everything not covered by a phase is recorded as "mutate".
+INSTRUMENTED_METHODS = OrderedDict(
+    [
+        ("before_mutate", "before_mutate"),
+        ("check_permissions", "check_permissions"),
+        ("validate", "validate"),
+        ("create_obj", "create"),
+        ("bulk_create_objs", "create"),
+        ("update_obj", "update"),
+        ("bulk_update_objs", "update"),
+        ("fast_update", "update"),
+        ("get_many_to_many_changes", "many_to_many"),
+        ("apply_many_to_many_changes", "many_to_many"),
+        ("apply_many_to_one_extras", "many_to_one"),
+        ("before_save", "before_save"),
+        ("after_mutate", "after_mutate"),
+    ]
+)
+
+_current_recorder = ContextVar("graphene_django_cud_recorder", default=None)
+
+
+class MutationRecorder:
+    """
+    Records the wall time and number of queries of each phase of a single mutation
+    call. Phases may be nested, in which case time and queries are attributed to the
+    innermost phase only, so that the phases add up to the total.
+    """
+
+    def __init__(self):
+        self.phases = OrderedDict()
+        self._stack = []
+        self._mark = None
+        self._start = None
+
+    def _get_stats(self, phase):
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = {"time": 0.0, "queries": 0}
+        return stats
+
+    def enter(self, phase):
+        now = perf_counter()
+        if self._stack:
+            self._get_stats(self._stack[-1])["time"] += now - self._mark
+        else:
+            self._start = now
+        self._stack.append(phase)
+        self._mark = now
+
+    def exit(self):
+        now = perf_counter()
+        self._get_stats(self._stack.pop())["time"] += now - self._mark
+        self._mark = now
+
+    def count_query(self, execute, sql, params, many, context):
+        if self._stack:
+            self._get_stats(self._stack[-1])["queries"] += 1
+        return execute(sql, params, many, context)
+
+    def get_report(self, mutation):
+        return {
+            "mutation": mutation.__name__,
+            "time": self._mark - self._start if self._start is not None else 0.0,
+            "queries": sum(stats["queries"] for stats in self.phases.values()),
+            "phases": self.phases,
+        }
+
+
+def _instrument_function(func, phase):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = _current_recorder.get()
+        if recorder is None:
+            return func(*args, **kwargs)
+
+        recorder.enter(phase)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            recorder.exit()
+
+    wrapper._instrumented_phase = phase
+    return wrapper
+
+
+def _instrument_attribute(cls, name, phase):
+    attribute = inspect.getattr_static(cls, name)
+    if isinstance(attribute, (classmethod, staticmethod)):
+        func = attribute.__func__
+    elif inspect.isfunction(attribute):
+        func = attribute
+    else:
+        return
+
+    if getattr(func, "_instrumented_phase", None) == phase:
+        # Already instrumented by a parent class
+        return
+
+    wrapper = _instrument_function(func, phase)
+    if not inspect.isfunction(attribute):
+        wrapper = type(attribute)(wrapper)
+    setattr(cls, name, wrapper)
+
+
+def instrument_mutation(cls, sink, resolver=None):
+    """
+    Instruments the hooks and handlers of a mutation class, and returns a resolver
+    which records each call of the mutation and passes the report to the sink.
+
+    Nothing is changed on classes without instrumentation, so the cost of this
+    functionality is only paid by mutations which enable it.
+
+    :param resolver: The resolver to instrument. Defaults to the `mutate`-method.
+    """
+    for name, phase in INSTRUMENTED_METHODS.items():
+        if hasattr(cls, name):
+            _instrument_attribute(cls, name, phase)
+
+    for name in dir(cls):
+        if name.startswith("handle_"):
+            _instrument_attribute(cls, name, "handlers")
+
+    mutate = resolver or cls.mutate
+
+    def instrumented_resolver(root, info, **kwargs):
+        recorder = MutationRecorder()
+        token = _current_recorder.set(recorder)
+        connection = connections[router.db_for_write(cls._meta.model)]
+
+        try:
+            with connection.execute_wrapper(recorder.count_query):
+                recorder.enter("mutate")
+                try:
+                    return mutate(root, info, **kwargs)
+                finally:
+                    recorder.exit()
+        finally:
+            _current_recorder.reset(token)
+            sink(info, cls, recorder.get_report(cls))
+
+    return instrumented_resolver
+
+
+def log_report(info, mutation, report):
+    """
+    An instrumentation sink which logs the report on the debug level.
+    """
+    logger.debug(
+        "%s: %.2f ms, %d queries (%s)",
+        report["mutation"],
+        report["time"] * 1000,
+        report["queries"],
+        ", ".join(
+            f"{phase}: {stats['time'] * 1000:.2f} ms, {stats['queries']} queries"
+            for phase, stats in report["phases"].items()
+        ),
+    )
+
+
+def context_report(info, mutation, report):
+    """
+    An instrumentation sink which collects the reports in the list
+    `info.context.mutation_reports`, e.g. for adding them to the `extensions`
+    of the response in a view.
+    """
+    reports = getattr(info.context, "mutation_reports", None)
+    if reports is None:
+        reports = []
+        setattr(info.context, "mutation_reports", reports)
+    reports.append(report)
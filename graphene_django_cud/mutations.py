@@ -1,37 +1,102 @@
+import inspect
 from collections import OrderedDict
 from typing import Iterable
 
 import graphene
-from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
-from django.db import models, transaction
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ObjectDoesNotExist,
+    ValidationError,
+)
+from django.db import connections, models, router, transaction
+from django.db.models import signals
+from django.db.models.deletion import Collector
+from django.utils import timezone
 from graphene import Mutation, InputObjectType
 from graphene.types.mutation import MutationOptions
 from graphene.types.utils import yank_fields_from_attrs
 from graphene.utils.str_converters import to_snake_case
 from graphene_django.registry import get_global_registry
 from graphql import GraphQLError
-from graphql_relay import to_global_id
+from graphql_relay.utils import base64, unbase64
 
-from graphene_django_cud.registry import get_type_meta_registry
+from graphene_django_cud.converter import convert_django_field_with_choices
+from graphene_django_cud.exceptions import ConcurrentModificationError
+from graphene_django_cud.instrumentation import instrument_mutation
+from graphene_django_cud.profiling import profile_mutation_build
+from graphene_django_cud.registry import TypeMeta, get_type_meta_registry
 from .util import (
     disambiguate_id,
     disambiguate_ids,
+    LazyGlobalIds,
+    to_global_ids,
     get_input_fields_for_model,
+    get_input_field_names_for_model,
     get_all_optional_input_fields_for_model,
-    is_many_to_many,
-    get_m2m_all_extras_field_names,
     get_likely_operation_from_name,
-    get_fk_all_extras_field_names,
     get_filter_fields_input_args,
+    get_m2m_through_fields,
+    get_objs_by_ids,
+    get_node_type_names,
+    get_pks_by_ids,
+    can_write_through_model,
+    get_pks_for_objs,
+    update_many_to_many_relation,
+    is_field_selected,
+    compile_field_plan,
+    FIELD_EXTRA,
+    FIELD_FOREIGN_KEY,
+    FIELD_MANY_TO_MANY,
+    supports_delete_returning,
+    delete_returning_pks,
 )
 
 meta_registry = get_type_meta_registry()
 
+# The supported values of the `lock_mode` meta field, and the arguments they pass to
+# `QuerySet.select_for_update`.
+LOCK_MODES = {
+    "select_for_update": {},
+    "skip_locked": {"skip_locked": True},
+    "nowait": {"nowait": True},
+}
+
 
 class DjangoCudBase(Mutation):
     class Meta:
         abstract = True
 
+    def __init_subclass__(cls, **kwargs):
+        with profile_mutation_build(cls):
+            super().__init_subclass__(**kwargs)
+
+    @classmethod
+    def __init_subclass_with_meta__(
+        cls, instrumentation=None, retry_policy=None, _meta=None, **kwargs
+    ):
+        _meta.instrumentation = instrumentation
+        _meta.retry_policy = retry_policy
+
+        if retry_policy:
+            kwargs["resolver"] = retry_policy.wrap_resolver(
+                cls, kwargs.get("resolver") or cls.mutate
+            )
+
+        if instrumentation:
+            kwargs["resolver"] = instrument_mutation(
+                cls, instrumentation, kwargs.get("resolver")
+            )
+
+            # Recompile the field plan, so that it picks up the instrumented handlers
+            field_plan = getattr(_meta, "field_plan", None)
+            cls._field_plans = {}
+            if field_plan is not None:
+                _meta.field_plan = cls.get_field_plan(
+                    field_plan.model, *field_plan.extras
+                )
+
+        super().__init_subclass_with_meta__(_meta=_meta, **kwargs)
+
     @classmethod
     def get_or_create_foreign_obj(cls, field, value, data, info):
         field_type = data.get("type", "ID")
@@ -39,15 +104,15 @@ class DjangoCudBase(Mutation):
         if field_type == "ID":
             return value
         else:
-            input_type_meta = meta_registry.get_meta_for_type(field_type)
+            input_type_meta = meta_registry.get_meta_for_value(value, field_type)
             # Create new obj
             related_obj = cls.create_obj(
                 value,
                 info,
-                input_type_meta.get("auto_context_fields", {}),
-                input_type_meta.get("many_to_many_extras", {}),
-                input_type_meta.get("foreign_key_extras", {}),
-                input_type_meta.get("many_to_one_extras", {}),
+                input_type_meta.auto_context_fields,
+                input_type_meta.many_to_many_extras,
+                input_type_meta.foreign_key_extras,
+                input_type_meta.many_to_one_extras,
                 field.related_model,
             )
             return related_obj.id
@@ -64,22 +129,28 @@ class DjangoCudBase(Mutation):
 
         field_type = data.get("type", "ID")
 
-        for value in values:
-            if field_type == "ID":
-                related_obj = field.related_model.objects.get(pk=disambiguate_id(value))
-            else:
-                # This is something that we are going to create
-                input_type_meta = meta_registry.get_meta_for_type(field_type)
-                # Create new obj
-                related_obj = cls.create_obj(
-                    value,
-                    info,
-                    input_type_meta.get("auto_context_fields", {}),
-                    input_type_meta.get("many_to_many_extras", {}),
-                    input_type_meta.get("foreign_key_extras", {}),
-                    input_type_meta.get("many_to_one_extras", {}),
-                    field.related_model,
+        if field_type == "ID":
+            if type(field) in (models.ManyToManyField, models.ManyToManyRel):
+                # Many-to-many managers accept primary keys directly, so there is no
+                # need to fetch the related objects.
+                return get_pks_by_ids(
+                    field.related_model, values, data.get("check_ids", True)
                 )
+            return get_objs_by_ids(field.related_model, values)
+
+        for value in values:
+            # This is something that we are going to create
+            input_type_meta = meta_registry.get_meta_for_value(value, field_type)
+            # Create new obj
+            related_obj = cls.create_obj(
+                value,
+                info,
+                input_type_meta.auto_context_fields,
+                input_type_meta.many_to_many_extras,
+                input_type_meta.foreign_key_extras,
+                input_type_meta.many_to_one_extras,
+                field.related_model,
+            )
             results.append(related_obj)
 
         return results
@@ -92,11 +163,11 @@ class DjangoCudBase(Mutation):
             return results
 
         field_type = data.get("type", "auto")
+        if field_type == "ID":
+            return get_objs_by_ids(field.related_model, values)
+
         for value in values:
-            if field_type == "ID":
-                related_obj = field.related_model.objects.get(pk=disambiguate_id(value))
-                results.append(related_obj)
-            elif field_type == "auto":
+            if field_type == "auto":
                 # In this case, a new type has been created for us. Let's first find it's name,
                 # then get it's meta, and then create it. We also need to attach the obj as the
                 # foreign key.
@@ -114,24 +185,24 @@ class DjangoCudBase(Mutation):
                 related_obj = cls.upsert_obj(
                     value,
                     info,
-                    input_type_meta.get("auto_context_fields", {}),
-                    input_type_meta.get("many_to_many_extras", {}),
-                    input_type_meta.get("foreign_key_extras", {}),
-                    input_type_meta.get("many_to_one_extras", {}),
+                    input_type_meta.auto_context_fields,
+                    input_type_meta.many_to_many_extras,
+                    input_type_meta.foreign_key_extras,
+                    input_type_meta.many_to_one_extras,
                     field.related_model,
                 )
                 results.append(related_obj)
             else:
                 # This is something that we are going to create
-                input_type_meta = meta_registry.get_meta_for_type(field_type)
+                input_type_meta = meta_registry.get_meta_for_value(value, field_type)
                 # Create new obj
                 related_obj = cls.create_obj(
                     value,
                     info,
-                    input_type_meta.get("auto_context_fields", {}),
-                    input_type_meta.get("many_to_many_extras", {}),
-                    input_type_meta.get("foreign_key_extras", {}),
-                    input_type_meta.get("many_to_one_extras", {}),
+                    input_type_meta.auto_context_fields,
+                    input_type_meta.many_to_many_extras,
+                    input_type_meta.foreign_key_extras,
+                    input_type_meta.many_to_one_extras,
                     field.related_model,
                 )
                 results.append(related_obj)
@@ -187,21 +258,58 @@ class DjangoCudBase(Mutation):
         many_to_one_extras,
         Model,
     ):
-        meta_registry = get_type_meta_registry()
+        model_field_values, many_to_many_to_set = cls.get_create_field_values(
+            input,
+            info,
+            auto_context_fields,
+            many_to_many_extras,
+            foreign_key_extras,
+            many_to_one_extras,
+            Model,
+        )
+
+        # Foreign keys are added, we are ready to create our object
+        obj = Model.objects.create(**model_field_values)
+
+        (
+            many_to_many_to_set,
+            many_to_many_to_add,
+            many_to_many_to_remove,
+        ) = cls.get_many_to_many_changes(
+            input, info, many_to_many_extras, Model, many_to_many_to_set
+        )
+
+        cls.apply_many_to_one_extras(obj, input, info, many_to_one_extras, Model)
+        cls.apply_many_to_many_changes(
+            obj, many_to_many_to_set, many_to_many_to_add, many_to_many_to_remove
+        )
 
+        return obj
+
+    @classmethod
+    def get_create_field_values(
+        cls,
+        input,
+        info,
+        auto_context_fields,
+        many_to_many_extras,
+        foreign_key_extras,
+        many_to_one_extras,
+        Model,
+    ):
+        """
+        Converts the input of a create operation into keyword arguments for the
+        model constructor, creating foreign key extras along the way.
+
+        :return: A tuple of the model field values and a dict of the plain
+            many-to-many (and many-to-one) values which have to be set on the object
+            once it exists.
+        """
         model_field_values = {}
-        many_to_many_to_add = {}
-        many_to_many_to_remove = {}
         many_to_many_to_set = {}
 
-        many_to_many_extras_field_names = get_m2m_all_extras_field_names(
-            many_to_many_extras
-        )
-        many_to_one_extras_field_names = get_m2m_all_extras_field_names(
-            many_to_one_extras
-        )  # The layout is the same as for m2m
-        foreign_key_extras_field_names = get_fk_all_extras_field_names(
-            foreign_key_extras
+        field_plan = cls.get_field_plan(
+            Model, many_to_many_extras, foreign_key_extras, many_to_one_extras
         )
 
         for field_name, context_name in auto_context_fields.items():
@@ -209,45 +317,29 @@ class DjangoCudBase(Mutation):
                 model_field_values[field_name] = getattr(info.context, context_name)
 
         for name, value in super(type(input), input).items():
+            entry = field_plan.get(name)
+
             # Handle these separately
-            if (
-                name in many_to_many_extras_field_names
-                or name in foreign_key_extras_field_names
-                or name in many_to_one_extras_field_names
-            ):
+            if entry.category == FIELD_EXTRA:
                 continue
 
-            field = Model._meta.get_field(name)
             new_value = value
-
-            # We have to handle this case specifically, by using the fields
-            # .set()-method, instead of direct assignment
-            field_is_many_to_many = is_many_to_many(field)
-
-            value_handle_name = "handle_" + name
-            if hasattr(cls, value_handle_name):
-                handle_func = getattr(cls, value_handle_name)
-                assert callable(
-                    handle_func
-                ), f"Property {value_handle_name} on {cls.__name__} is not a function."
-                new_value = handle_func(value, name, info)
+            if entry.handler is not None:
+                new_value = entry.handler(value, name, info)
 
             # On some fields we perform some default conversion, if the value was not transformed above.
-            if new_value == value and value is not None:
-                if type(field) in (models.AutoField,):
-                    new_value = disambiguate_id(value)
-                elif type(field) in (models.ForeignKey, models.OneToOneField,):
+            if new_value == value and value is not None and entry.converter:
+                new_value = entry.converter(value)
+
+                if entry.category == FIELD_FOREIGN_KEY:
                     # Delete auto context field here, if it exists. We have to do this explicitly
                     # as we change the name below
-                    if name in auto_context_fields:
-                        del model_field_values[name]
-
-                    name = getattr(field, "db_column", None) or name + "_id"
-                    new_value = disambiguate_id(value)
-                elif field_is_many_to_many:
-                    new_value = disambiguate_ids(value)
+                    model_field_values.pop(name, None)
+                    name = entry.attname
 
-            if field_is_many_to_many:
+            # We have to handle many to many fields specifically, by using the fields
+            # .set()-method, instead of direct assignment
+            if entry.category == FIELD_MANY_TO_MANY:
                 many_to_many_to_set[name] = new_value
             else:
                 model_field_values[name] = new_value
@@ -262,21 +354,67 @@ class DjangoCudBase(Mutation):
 
             model_field_values[name + "_id"] = obj_id
 
-        # Foreign keys are added, we are ready to create our object
-        obj = Model.objects.create(**model_field_values)
+        return model_field_values, many_to_many_to_set
 
-        # Handle extras fields
+    @classmethod
+    def get_field_plan(
+        cls,
+        Model,
+        many_to_many_extras=None,
+        foreign_key_extras=None,
+        many_to_one_extras=None,
+    ):
+        """
+        Returns the precompiled field plan for the given model and extras. Plans are
+        compiled once per mutation class and set of extras; the plan of the mutation
+        itself is compiled when the class is created.
+        """
+        field_plans = cls.__dict__.get("_field_plans")
+        if field_plans is None:
+            field_plans = {}
+            cls._field_plans = field_plans
+
+        key = (
+            Model,
+            id(many_to_many_extras) if many_to_many_extras else None,
+            id(foreign_key_extras) if foreign_key_extras else None,
+            id(many_to_one_extras) if many_to_one_extras else None,
+        )
+        # The plan holds on to the extras it was compiled for, so their ids cannot
+        # be reused by other objects while it is cached.
+        field_plan = field_plans.get(key)
+        if field_plan is None:
+            field_plan = compile_field_plan(
+                cls, Model, many_to_many_extras, foreign_key_extras, many_to_one_extras
+            )
+            field_plans[key] = field_plan
+
+        return field_plan
+
+    @classmethod
+    def get_many_to_many_changes(
+        cls, input, info, many_to_many_extras, Model, many_to_many_to_set=None
+    ):
+        """
+        Resolves the many-to-many extras of the input into the objects that should
+        be set, added and removed for each relation.
+
+        :return: A tuple of three dicts (to_set, to_add, to_remove), keyed on the
+            field name. A value of None in to_set means that the relation should not
+            be (re)set.
+        """
         many_to_many_to_add = {}
         many_to_many_to_remove = {}
-        many_to_many_to_set = {}
+        many_to_many_to_set = dict(many_to_many_to_set or {})
+
         for name, extras in many_to_many_extras.items():
             field = Model._meta.get_field(name)
             if not name in many_to_many_to_add:
                 many_to_many_to_add[name] = []
                 many_to_many_to_remove[name] = []
-                many_to_many_to_set[
-                    name
-                ] = None  # None means that we should not (re)set the relation.
+                # None means that we should not (re)set the relation. A plain value
+                # for the field itself has already been collected, so keep it.
+                many_to_many_to_set.setdefault(name, None)
 
             for extra_name, data in extras.items():
                 field_name = name
@@ -295,12 +433,15 @@ class DjangoCudBase(Mutation):
 
                 if operation == "exact":
                     many_to_many_to_set[name] = objs
-                elif len(objs) > 0:
-                    if operation == "add":
-                        many_to_many_to_add[name] += objs
-                    else:
-                        many_to_many_to_remove[name] += objs
+                elif operation == "add":
+                    many_to_many_to_add[name] += objs
+                else:
+                    many_to_many_to_remove[name] += objs
+
+        return many_to_many_to_set, many_to_many_to_add, many_to_many_to_remove
 
+    @classmethod
+    def apply_many_to_one_extras(cls, obj, input, info, many_to_one_extras, Model):
         many_to_one_to_add = {}
         many_to_one_to_remove = {}
         many_to_one_to_set = {}
@@ -342,7 +483,9 @@ class DjangoCudBase(Mutation):
                     )
                     many_to_one_to_add[name] += objs
                 else:
-                    many_to_one_to_remove[name] += disambiguate_ids(values)
+                    many_to_one_to_remove[name] += disambiguate_ids(
+                        values, get_node_type_names(field.related_model)
+                    )
 
         for name, objs in many_to_one_to_set.items():
             if objs is not None:
@@ -370,17 +513,37 @@ class DjangoCudBase(Mutation):
                 # For other's we have to delete the relations
                 getattr(obj, name).filter(id__in=objs).delete()
 
-        for name, objs in many_to_many_to_set.items():
-            if objs is not None:
-                getattr(obj, name).set(objs)
+    @classmethod
+    def apply_many_to_many_changes(
+        cls, obj, many_to_many_to_set, many_to_many_to_add, many_to_many_to_remove
+    ):
+        names = OrderedDict.fromkeys(
+            list(many_to_many_to_set)
+            + list(many_to_many_to_add)
+            + list(many_to_many_to_remove)
+        )
 
-        for name, objs in many_to_many_to_add.items():
-            getattr(obj, name).add(*objs)
+        for name in names:
+            objs_to_set = many_to_many_to_set.get(name)
+            objs_to_add = many_to_many_to_add.get(name, [])
+            objs_to_remove = many_to_many_to_remove.get(name, [])
+            field = obj._meta.get_field(name)
 
-        for name, objs in many_to_many_to_remove.items():
-            getattr(obj, name).remove(*objs)
+            if can_write_through_model(field):
+                update_many_to_many_relation(
+                    obj, field, objs_to_set, objs_to_add, objs_to_remove
+                )
+                continue
 
-        return obj
+            # Custom through models and symmetrical relations are left to the
+            # related manager.
+            manager = getattr(obj, name)
+            if objs_to_set is not None:
+                manager.set(objs_to_set)
+            if objs_to_add:
+                manager.add(*objs_to_add)
+            if objs_to_remove:
+                manager.remove(*objs_to_remove)
 
     @classmethod
     def update_obj(
@@ -393,69 +556,57 @@ class DjangoCudBase(Mutation):
         foreign_key_extras,
         many_to_one_extras,
         Model,
+        updated_fields=None,
     ):
+        """
+        Updates the object with the values of the input.
+
+        :param updated_fields: If supplied, the names of the model fields which are
+            assigned on the object are added to this set.
+        """
+        if updated_fields is None:
+            updated_fields = set()
 
-        many_to_many_to_add = {}
-        many_to_many_to_remove = {}
         many_to_many_to_set = {}
 
-        many_to_many_extras_field_names = get_m2m_all_extras_field_names(
-            many_to_many_extras
-        )
-        many_to_one_extras_field_names = get_m2m_all_extras_field_names(
-            many_to_one_extras
-        )  # The layout is the same as for m2m
-        foreign_key_extras_field_names = get_fk_all_extras_field_names(
-            foreign_key_extras
+        field_plan = cls.get_field_plan(
+            Model, many_to_many_extras, foreign_key_extras, many_to_one_extras
         )
 
         for field_name, context_name in auto_context_fields.items():
             if hasattr(info.context, context_name):
                 setattr(obj, field_name, getattr(info.context, context_name))
+                updated_fields.add(field_name)
 
         for name, value in super(type(input), input).items():
+            entry = field_plan.get(name)
+
             # Handle these separately
-            if (
-                name in many_to_many_extras_field_names
-                or name in foreign_key_extras_field_names
-                or name in many_to_one_extras_field_names
-            ):
+            if entry.category == FIELD_EXTRA:
                 continue
 
-            field = Model._meta.get_field(name)
             new_value = value
-
-            # We have to handle this case specifically, by using the fields
-            # .set()-method, instead of direct assignment
-            field_is_many_to_many = is_many_to_many(field)
-
-            value_handle_name = "handle_" + name
-            if hasattr(cls, value_handle_name):
-                handle_func = getattr(cls, value_handle_name)
-                assert callable(
-                    handle_func
-                ), f"Property {value_handle_name} on {cls.__name__} is not a function."
-                new_value = handle_func(value, name, info)
+            if entry.handler is not None:
+                new_value = entry.handler(value, name, info)
 
             # On some fields we perform some default conversion, if the value was not transformed above.
-            if new_value == value and value is not None:
-                if type(field) in (models.AutoField,):
-                    new_value = disambiguate_id(value)
-                elif type(field) in (models.ForeignKey, models.OneToOneField,):
+            if new_value == value and value is not None and entry.converter:
+                new_value = entry.converter(value)
+
+                if entry.category == FIELD_FOREIGN_KEY:
                     # Delete auto context field here, if it exists. We have to do this explicitly
                     # as we change the name below
                     if name in auto_context_fields:
                         setattr(obj, name, None)
+                    name = entry.attname
 
-                    name = getattr(field, "db_column", None) or name + "_id"
-                    new_value = disambiguate_id(value)
-                elif field_is_many_to_many:
-                    new_value = disambiguate_ids(value)
-
-            if field_is_many_to_many:
+            # We have to handle many to many fields specifically, by using the fields
+            # .set()-method, instead of direct assignment
+            if entry.category == FIELD_MANY_TO_MANY:
                 many_to_many_to_set[name] = new_value
             else:
                 setattr(obj, name, new_value)
+                updated_fields.add(entry.name)
 
         # Handle extras fields
         for name, extras in foreign_key_extras.items():
@@ -464,118 +615,338 @@ class DjangoCudBase(Mutation):
 
             obj_id = cls.get_or_create_foreign_obj(field, value, extras, info)
             setattr(obj, name + "_id", obj_id)
+            updated_fields.add(name)
+
+        (
+            many_to_many_to_set,
+            many_to_many_to_add,
+            many_to_many_to_remove,
+        ) = cls.get_many_to_many_changes(
+            input, info, many_to_many_extras, Model, many_to_many_to_set
+        )
 
-        for name, extras in many_to_many_extras.items():
-            field = Model._meta.get_field(name)
-            if not name in many_to_many_to_add:
-                many_to_many_to_add[name] = []
-                many_to_many_to_remove[name] = []
-                many_to_many_to_set[
-                    name
-                ] = None  # None means that we should not (re)set the relation.
+        cls.apply_many_to_one_extras(obj, input, info, many_to_one_extras, Model)
+        cls.apply_many_to_many_changes(
+            obj, many_to_many_to_set, many_to_many_to_add, many_to_many_to_remove
+        )
 
-            for extra_name, data in extras.items():
-                field_name = name
-                if extra_name != "exact":
-                    field_name = name + "_" + extra_name
+        return obj
 
-                values = input.get(field_name, None)
+    @classmethod
+    def bulk_update_objs(cls, root, info, input, queryset):
+        """
+        Updates all objects of a batch update/patch input. The objects are fetched
+        and locked with a single query, updated with `update_obj`, and saved with
+        one `bulk_update` per distinct set of updated fields. As `bulk_update` does
+        not call `save()`, fields with `auto_now` are given their new value
+        explicitly, and no `pre_save` or `post_save` signals are sent.
+
+        :return: The updated objects, in the order of the input.
+        """
+        Model = cls._meta.model
+        auto_context_fields = cls._meta.auto_context_fields or {}
 
-                if isinstance(data, bool):
-                    data = {}
+        with transaction.atomic():
+            # The rows are locked until they are updated, so that they cannot
+            # change in between.
+            objs = get_objs_by_ids(
+                Model, [data.get("id") for data in input], queryset.select_for_update()
+            )
 
-                operation = data.get("operation") or get_likely_operation_from_name(
-                    extra_name
+            # Objects given more than once would be updated from several inputs
+            seen_pks = set()
+            duplicate_pks = OrderedDict()
+            for obj in objs:
+                if obj.pk in seen_pks:
+                    duplicate_pks[obj.pk] = None
+                seen_pks.add(obj.pk)
+            if duplicate_pks:
+                duplicates = ", ".join(str(pk) for pk in duplicate_pks)
+                raise GraphQLError(
+                    f"{Model._meta.object_name} matching the ids {duplicates} is given "
+                    f"more than once."
                 )
-                objs = cls.get_or_create_m2m_objs(field, values, data, operation, info)
 
-                if operation == "exact":
-                    many_to_many_to_set[name] = objs
-                elif operation == "add":
-                    many_to_many_to_add[name] += objs
-                else:
-                    many_to_many_to_remove[name] += objs
+            for data, obj in zip(input, objs):
+                cls.validate(root, info, data, id=obj.pk, obj=obj, full_input=input)
+
+            updated_objs = []
+            updated_fields_per_obj = []
+            for data, obj in zip(input, objs):
+                # The id identifies the object, and is not a value to update.
+                data = type(data)(
+                    {
+                        name: value
+                        for name, value in super(type(data), data).items()
+                        if name != "id"
+                    }
+                )
+                updated_fields = set()
+                obj = cls.update_obj(
+                    obj,
+                    data,
+                    info,
+                    auto_context_fields,
+                    cls._meta.many_to_many_extras,
+                    cls._meta.foreign_key_extras,
+                    cls._meta.many_to_one_extras,
+                    Model,
+                    updated_fields=updated_fields,
+                )
+                updated_objs.append(obj)
+                updated_fields_per_obj.append(updated_fields)
+
+            objs = cls.before_save(root, info, updated_objs) or updated_objs
+
+            # before_save may change any field, in which case we can no longer
+            # tell which fields have to be saved.
+            if cls._overrides_hook("before_save"):
+                all_fields = set(field.name for field in Model._meta.concrete_fields)
+                updated_fields_per_obj = [all_fields] * len(objs)
+
+            auto_now_fields = [
+                field
+                for field in Model._meta.concrete_fields
+                if getattr(field, "auto_now", False)
+            ]
+            objs_per_fields = OrderedDict()
+            for obj, updated_fields in zip(objs, updated_fields_per_obj):
+                for field in auto_now_fields:
+                    setattr(obj, field.attname, field.pre_save(obj, False))
+                fields = tuple(cls.get_update_fields(obj, updated_fields))
+                if fields:
+                    objs_per_fields.setdefault(fields, []).append(obj)
+
+            for fields, objs_to_update in objs_per_fields.items():
+                Model.objects.bulk_update(
+                    objs_to_update, fields, batch_size=cls._meta.bulk_update_batch_size
+                )
 
-        many_to_one_to_add = {}
-        many_to_one_to_remove = {}
-        many_to_one_to_set = {}
-        for name, extras in many_to_one_extras.items():
-            field = Model._meta.get_field(name)
+        return objs
 
-            if not name in many_to_one_to_add:
-                many_to_one_to_add[name] = []
-                many_to_one_to_remove[name] = []
-                many_to_one_to_set[
-                    name
-                ] = None  # None means that we should not (re)set the relation.
+    @classmethod
+    def get_update_fields(cls, obj, updated_fields):
+        """
+        Finds the `update_fields` to save an object with, given the names of the
+        fields assigned by `update_obj`. Fields with `auto_now` set are always
+        included, as they are updated on every save.
+        """
+        return [
+            field.name
+            for field in obj._meta.concrete_fields
+            if not field.primary_key
+            and (field.name in updated_fields or getattr(field, "auto_now", False))
+        ]
 
-            for extra_name, data in extras.items():
-                field_name = name
-                if extra_name != "exact":
-                    field_name = name + "_" + extra_name
+    @classmethod
+    def _overrides_hook(cls, name):
+        return (
+            inspect.unwrap(getattr(cls, name).__func__)
+            is not getattr(DjangoCudBase, name).__func__
+        )
 
-                values = input.get(field_name, None)
+    @classmethod
+    def get_update_kwargs(cls, input, info, auto_context_fields, Model):
+        """
+        Converts an input of concrete model fields into keyword arguments for
+        `QuerySet.update`. As `update` bypasses `save()`, fields with `auto_now`
+        are given their new value explicitly.
+        """
+        values = {}
 
-                if values is None:
-                    continue
+        for field_name, context_name in auto_context_fields.items():
+            if hasattr(info.context, context_name):
+                values[field_name] = getattr(info.context, context_name)
 
-                if isinstance(data, bool):
-                    data = {}
+        field_plan = cls.get_field_plan(Model)
 
-                operation = data.get("operation") or get_likely_operation_from_name(
-                    extra_name
-                )
+        for name, value in super(type(input), input).items():
+            entry = field_plan.get(name)
 
-                if operation == "exact":
-                    objs = cls.get_or_upsert_m2o_objs(
-                        obj, field, values, data, operation, info, Model
-                    )
-                    many_to_one_to_set[name] = objs
-                elif operation == "add" or operation == "update":
-                    objs = cls.get_or_upsert_m2o_objs(
-                        obj, field, values, data, operation, info, Model
-                    )
-                    many_to_one_to_add[name] += objs
-                else:
-                    many_to_one_to_remove[name] += disambiguate_ids(values)
+            new_value = value
+            if entry.handler is not None:
+                new_value = entry.handler(value, name, info)
 
-        for name, objs in many_to_one_to_set.items():
-            if objs is not None:
-                field = getattr(obj, name)
-                if hasattr(field, "remove"):
-                    # In this case, the relationship is nullable, and we can clear it, and then add the relevant objects
-                    field.clear()
-                    field.add(*objs)
-                else:
-                    # Remove the related objects by deletion, and set the new ones.
-                    field.exclude(id__in=[obj.id for obj in objs]).delete()
-                    getattr(obj, name).add(*objs)
+            # On some fields we perform some default conversion, if the value was not transformed above.
+            if new_value == value and value is not None and entry.converter:
+                new_value = entry.converter(value)
 
-        for name, objs in many_to_one_to_add.items():
-            getattr(obj, name).add(*objs)
+                if entry.category == FIELD_FOREIGN_KEY:
+                    values.pop(name, None)
+                    name = entry.attname
 
-        for name, objs in many_to_one_to_remove.items():
-            field = getattr(obj, name)
-            if hasattr(field, "remove"):
-                # The field is nullable, and we simply remove the relation
-                related_name = Model._meta.get_field(name).remote_field.name
-                getattr(obj, name).filter(id__in=objs).update(**{related_name: None})
-            else:
-                # Only nullable foreign key reverse rels have the remove method.
-                # For other's we have to delete the relations
-                getattr(obj, name).filter(id__in=objs).delete()
+            values[name] = new_value
 
-        for name, objs in many_to_many_to_set.items():
-            if objs is not None:
-                getattr(obj, name).set(objs)
+        for field in Model._meta.concrete_fields:
+            if getattr(field, "auto_now", False):
+                values[field.name] = field.pre_save(Model(), False)
 
-        for name, objs in many_to_many_to_add.items():
-            getattr(obj, name).add(*objs)
+        return values
 
-        for name, objs in many_to_many_to_remove.items():
-            getattr(obj, name).remove(*objs)
+    @classmethod
+    def get_filter_kwargs(cls, input, info, Model):
+        """
+        Converts a filter input, as created from `filter_fields`, into keyword
+        arguments for `QuerySet.filter`.
+        """
+        model_field_values = {}
 
-        return obj
+        for name, value in super(type(input), input).items():
+            filter_field_split = name.split("__", 1)
+            field_name = filter_field_split[0]
+
+            try:
+                field = Model._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                # This can happen with nested selectors. In this case we set the field to none.
+                field = None
+
+            filter_field_is_list = False
+
+            if len(filter_field_split) > 1:
+                # If we have an "__in" final part of the filter, we are now dealing with
+                # a list of things. Note that all other variants can be coerced directly
+                # on the filter-call, so we don't really have to deal with other cases.
+                filter_field_is_list = filter_field_split[-1] == "in"
+
+            new_value = value
+
+            value_handle_name = "handle_" + name
+            if hasattr(cls, value_handle_name):
+                handle_func = getattr(cls, value_handle_name)
+                assert callable(
+                    handle_func
+                ), f"Property {value_handle_name} on {cls.__name__} is not a function."
+                new_value = handle_func(value, name, info)
+
+            # On some fields we perform some default conversion, if the value was not transformed above.
+            if new_value == value and value is not None:
+                if type(field) in (models.ForeignKey, models.OneToOneField):
+                    name = getattr(field, "db_column", None) or name + "_id"
+                    new_value = disambiguate_id(value)
+                elif (
+                    type(field)
+                    in (
+                        models.ManyToManyField,
+                        models.ManyToManyRel,
+                        models.ManyToOneRel,
+                    )
+                    or filter_field_is_list
+                ):
+                    new_value = disambiguate_ids(value)
+
+            model_field_values[name] = new_value
+
+        return model_field_values
+
+    @classmethod
+    def get_version_argument(cls, model, version_field):
+        """
+        Validates the lock mode and version field of an update mutation, and returns
+        the argument carrying the expected version, if any.
+        """
+        field = model._meta.get_field(version_field)
+        assert isinstance(
+            field, (models.IntegerField, models.DateTimeField)
+        ), f"The version field {version_field} must be an integer or datetime field."
+
+        return convert_django_field_with_choices(field, required=True)
+
+    @classmethod
+    def get_object_for_update(cls, queryset, id):
+        """
+        Fetches the object to update, locking its row as specified by `lock_mode`.
+        This has to be called inside a transaction for the lock to have any effect.
+        """
+        lock_mode = cls._meta.lock_mode
+        if lock_mode:
+            queryset = queryset.select_for_update(**LOCK_MODES[lock_mode])
+
+        return queryset.get(pk=id)
+
+    @classmethod
+    def get_next_version(cls, field, version):
+        if isinstance(field, models.IntegerField):
+            return version + 1
+
+        return timezone.now()
+
+    @classmethod
+    def raise_concurrent_modification(cls, id):
+        raise ConcurrentModificationError(
+            f"{cls._meta.model._meta.object_name} with id {id} has been modified "
+            f"since the supplied version."
+        )
+
+    @classmethod
+    def claim_version(cls, queryset, obj, version):
+        """
+        Moves the version column of the object from the expected version to the
+        next one, with a single conditional `UPDATE`. This fails if the object has
+        been modified by someone else in the meantime, and otherwise locks its row
+        until the end of the transaction, so that it can be saved safely.
+        """
+        field = obj._meta.get_field(cls._meta.version_field)
+
+        if getattr(obj, field.attname) != version:
+            cls.raise_concurrent_modification(obj.pk)
+
+        next_version = cls.get_next_version(field, version)
+        if not queryset.filter(pk=obj.pk, **{field.attname: version}).update(
+            **{field.attname: next_version}
+        ):
+            cls.raise_concurrent_modification(obj.pk)
+
+        setattr(obj, field.attname, next_version)
+
+    @classmethod
+    def fast_delete(cls, queryset, using, return_pks):
+        """
+        Deletes the objects of the queryset directly in the database, without
+        loading them. This requires that the deletion does not cascade and that
+        nobody listens to the delete signals of the model, as checked by
+        `Collector.can_fast_delete`.
+
+        :return: A tuple of the number of deleted objects and a list of their
+            primary keys, or None if `return_pks` is false.
+        """
+        if not return_pks:
+            return queryset._raw_delete(using), None
+
+        if supports_delete_returning(connections[using]):
+            pks = delete_returning_pks(queryset, using)
+            return len(pks), pks
+
+        with transaction.atomic(using=using):
+            pks = list(queryset.select_for_update().values_list("pk", flat=True))
+            return queryset.filter(pk__in=pks)._raw_delete(using), pks
+
+    @classmethod
+    def create_input_type(cls, input_type_name, get_input_fields, lazy):
+        """
+        Creates the input type of the mutation from the fields returned by
+        `get_input_fields`. If lazy, a function returning the input type is
+        returned instead, and the fields and type are only created the first time
+        it is called, which is when a schema containing the mutation is built.
+        Graphene accepts such functions wherever a type is expected.
+        """
+
+        def create():
+            return type(input_type_name, (InputObjectType,), get_input_fields())
+
+        if not lazy:
+            return create()
+
+        input_type = None
+
+        def get_input_type():
+            nonlocal input_type
+            if input_type is None:
+                with profile_mutation_build(cls):
+                    input_type = create()
+            return input_type
+
+        return get_input_type
 
     @classmethod
     def get_permissions(cls, root, info, *args, **kwargs) -> Iterable[str]:
@@ -632,6 +1003,12 @@ class DjangoUpdateMutationOptions(MutationOptions):
     many_to_one_extras = None
     foreign_key_extras = None
     field_types = None
+    lazy_input_type = False
+    field_plan = None
+    instrumentation = None
+    lock_mode = None
+    version_field = None
+    retry_policy = None
 
 
 class DjangoUpdateMutation(DjangoCudBase):
@@ -655,6 +1032,9 @@ class DjangoUpdateMutation(DjangoCudBase):
         foreign_key_extras=None,
         type_name="",
         field_types=None,
+        lazy_input_type=False,
+        lock_mode=None,
+        version_field=None,
         **kwargs,
     ):
         registry = get_global_registry()
@@ -675,42 +1055,56 @@ class DjangoUpdateMutation(DjangoCudBase):
         if many_to_many_extras is None:
             many_to_many_extras = {}
 
+        assert (
+            lock_mode is None or lock_mode in LOCK_MODES
+        ), f"Invalid lock mode {lock_mode}, must be one of {', '.join(LOCK_MODES)}."
+
+        if version_field:
+            # The version is supplied as a separate argument
+            exclude_fields = tuple(exclude_fields) + (version_field,)
+
         input_type_name = type_name or f"Update{model.__name__}Input"
 
-        model_fields = get_input_fields_for_model(
-            model,
-            only_fields,
-            exclude_fields,
-            optional_fields=tuple(auto_context_fields.keys()) + optional_fields,
-            required_fields=required_fields,
-            many_to_many_extras=many_to_many_extras,
-            foreign_key_extras=foreign_key_extras,
-            many_to_one_extras=many_to_one_extras,
-            parent_type_name=input_type_name,
-            field_types=field_types,
-        )
+        def get_input_fields():
+            return get_input_fields_for_model(
+                model,
+                only_fields,
+                exclude_fields,
+                optional_fields=tuple(auto_context_fields.keys()) + optional_fields,
+                required_fields=required_fields,
+                many_to_many_extras=many_to_many_extras,
+                foreign_key_extras=foreign_key_extras,
+                many_to_one_extras=many_to_one_extras,
+                parent_type_name=input_type_name,
+                field_types=field_types,
+            )
 
-        InputType = type(input_type_name, (InputObjectType,), model_fields)
+        InputType = cls.create_input_type(
+            input_type_name, get_input_fields, lazy_input_type
+        )
 
         # Register meta-data
         meta_registry.register(
             input_type_name,
-            {
-                "auto_context_fields": auto_context_fields or {},
-                "optional_fields": optional_fields,
-                "required_fields": required_fields,
-                "many_to_many_extras": many_to_many_extras or {},
-                "many_to_one_extras": many_to_one_extras or {},
-                "foreign_key_extras": foreign_key_extras or {},
-                "field_types": field_types or {},
-            },
+            TypeMeta(
+                auto_context_fields=auto_context_fields or {},
+                optional_fields=optional_fields,
+                required_fields=required_fields,
+                many_to_many_extras=many_to_many_extras or {},
+                many_to_one_extras=many_to_one_extras or {},
+                foreign_key_extras=foreign_key_extras or {},
+                field_types=field_types or {},
+            ),
         )
 
         registry.register_converted_field(input_type_name, InputType)
 
         arguments = OrderedDict(
-            id=graphene.ID(required=True), input=InputType(required=True)
+            id=graphene.ID(required=True),
+            input=graphene.Argument(InputType, required=True),
         )
+        if version_field:
+            arguments["version"] = cls.get_version_argument(model, version_field)
 
         output_fields = OrderedDict()
         output_fields[return_field_name] = graphene.Field(model_type)
@@ -725,14 +1119,24 @@ class DjangoUpdateMutation(DjangoCudBase):
         _meta.required_fields = required_fields
         _meta.InputType = InputType
         _meta.input_type_name = input_type_name
+        _meta.lazy_input_type = lazy_input_type
         _meta.many_to_many_extras = many_to_many_extras
         _meta.many_to_one_extras = many_to_one_extras
         _meta.foreign_key_extras = foreign_key_extras
         _meta.field_types = field_types or {}
+        _meta.lock_mode = lock_mode
+        _meta.version_field = version_field
         _meta.login_required = _meta.login_required or (
             _meta.permissions and len(_meta.permissions) > 0
         )
 
+        _meta.field_plan = cls.get_field_plan(
+            model,
+            _meta.many_to_many_extras,
+            _meta.foreign_key_extras,
+            _meta.many_to_one_extras,
+        )
+
         super().__init_subclass_with_meta__(arguments=arguments, _meta=_meta, **kwargs)
 
     @classmethod
@@ -741,7 +1145,7 @@ class DjangoUpdateMutation(DjangoCudBase):
         return Model.objects
 
     @classmethod
-    def mutate(cls, root, info, id, input):
+    def mutate(cls, root, info, id, input, version=None):
         updated_input = cls.before_mutate(root, info, id, input)
         if updated_input:
             input = updated_input
@@ -754,12 +1158,13 @@ class DjangoUpdateMutation(DjangoCudBase):
         id = disambiguate_id(id)
         Model = cls._meta.model
         queryset = cls.get_queryset(info, id=id, input=input)
-        obj = queryset.get(pk=id)
         auto_context_fields = cls._meta.auto_context_fields or {}
 
-        cls.validate(root, info, input, id=id, obj=obj)
-
         with transaction.atomic():
+            obj = cls.get_object_for_update(queryset, id)
+
+            cls.validate(root, info, input, id=id, obj=obj)
+
             obj = cls.update_obj(
                 obj,
                 input,
@@ -776,6 +1181,9 @@ class DjangoUpdateMutation(DjangoCudBase):
             if updated_obj:
                 obj = updated_obj
 
+            if cls._meta.version_field:
+                cls.claim_version(queryset, obj, version)
+
             obj.save()
 
         kwargs = {cls._meta.return_field_name: obj}
@@ -797,6 +1205,15 @@ class DjangoPatchMutationOptions(MutationOptions):
     foreign_key_extras = None
     type_name = None
     field_types = None
+    lazy_input_type = False
+    use_update_fields = True
+    use_fast_update = True
+    fast_update_field_names = None
+    field_plan = None
+    instrumentation = None
+    lock_mode = None
+    version_field = None
+    retry_policy = None
 
 
 class DjangoPatchMutation(DjangoCudBase):
@@ -818,6 +1235,11 @@ class DjangoPatchMutation(DjangoCudBase):
         foreign_key_extras=None,
         type_name=None,
         field_types=None,
+        lazy_input_type=False,
+        use_update_fields=True,
+        use_fast_update=True,
+        lock_mode=None,
+        version_field=None,
         **kwargs,
     ):
         registry = get_global_registry()
@@ -838,38 +1260,52 @@ class DjangoPatchMutation(DjangoCudBase):
         if many_to_many_extras is None:
             many_to_many_extras = {}
 
+        assert (
+            lock_mode is None or lock_mode in LOCK_MODES
+        ), f"Invalid lock mode {lock_mode}, must be one of {', '.join(LOCK_MODES)}."
+
+        if version_field:
+            # The version is supplied as a separate argument
+            exclude_fields = tuple(exclude_fields) + (version_field,)
+
         input_type_name = type_name or f"Patch{model.__name__}Input"
 
-        model_fields = get_all_optional_input_fields_for_model(
-            model,
-            only_fields,
-            exclude_fields,
-            many_to_many_extras=many_to_many_extras,
-            foreign_key_extras=foreign_key_extras,
-            many_to_one_extras=many_to_one_extras,
-            parent_type_name=type_name,
-            field_types=field_types,
-        )
+        def get_input_fields():
+            return get_all_optional_input_fields_for_model(
+                model,
+                only_fields,
+                exclude_fields,
+                many_to_many_extras=many_to_many_extras,
+                foreign_key_extras=foreign_key_extras,
+                many_to_one_extras=many_to_one_extras,
+                parent_type_name=type_name,
+                field_types=field_types,
+            )
 
-        InputType = type(input_type_name, (InputObjectType,), model_fields)
+        InputType = cls.create_input_type(
+            input_type_name, get_input_fields, lazy_input_type
+        )
 
         # Register meta-data
         meta_registry.register(
             input_type_name,
-            {
-                "auto_context_fields": auto_context_fields or {},
-                "many_to_many_extras": many_to_many_extras or {},
-                "many_to_one_extras": many_to_one_extras or {},
-                "foreign_key_extras": foreign_key_extras or {},
-                "field_types": field_types or {},
-            },
+            TypeMeta(
+                auto_context_fields=auto_context_fields or {},
+                many_to_many_extras=many_to_many_extras or {},
+                many_to_one_extras=many_to_one_extras or {},
+                foreign_key_extras=foreign_key_extras or {},
+                field_types=field_types or {},
+            ),
         )
 
         registry.register_converted_field(input_type_name, InputType)
 
         arguments = OrderedDict(
-            id=graphene.ID(required=True), input=InputType(required=True)
+            id=graphene.ID(required=True),
+            input=graphene.Argument(InputType, required=True),
         )
+        if version_field:
+            arguments["version"] = cls.get_version_argument(model, version_field)
 
         output_fields = OrderedDict()
         output_fields[return_field_name] = graphene.Field(model_type)
@@ -882,23 +1318,121 @@ class DjangoPatchMutation(DjangoCudBase):
         _meta.auto_context_fields = auto_context_fields or {}
         _meta.InputType = InputType
         _meta.input_type_name = input_type_name
+        _meta.lazy_input_type = lazy_input_type
         _meta.many_to_many_extras = many_to_many_extras
         _meta.many_to_one_extras = many_to_one_extras
         _meta.foreign_key_extras = foreign_key_extras
         _meta.field_types = field_types or {}
+        _meta.use_update_fields = use_update_fields
+        _meta.use_fast_update = use_fast_update
+        _meta.lock_mode = lock_mode
+        _meta.version_field = version_field
         _meta.login_required = _meta.login_required or (
             _meta.permissions and len(_meta.permissions) > 0
         )
 
+        # The fast path only writes the patched columns, so it does not apply when
+        # the object should be saved in full. An UPDATE waits for row locks like
+        # select_for_update does, but cannot skip locked rows or fail on them.
+        input_field_names = get_input_field_names_for_model(
+            model, only_fields, exclude_fields, field_types=field_types
+        )
+        if (
+            use_fast_update
+            and use_update_fields
+            and lock_mode in (None, "select_for_update")
+        ) and cls._qualifies_for_fast_update(
+            model,
+            input_field_names,
+            many_to_many_extras,
+            many_to_one_extras,
+            foreign_key_extras,
+        ):
+            _meta.fast_update_field_names = frozenset(
+                name
+                for name in input_field_names
+                if name in {field.name for field in model._meta.concrete_fields}
+            )
+
+        _meta.field_plan = cls.get_field_plan(
+            model,
+            _meta.many_to_many_extras,
+            _meta.foreign_key_extras,
+            _meta.many_to_one_extras,
+        )
+
         super().__init_subclass_with_meta__(arguments=arguments, _meta=_meta, **kwargs)
 
+    @classmethod
+    def _qualifies_for_fast_update(
+        cls,
+        model,
+        input_field_names,
+        many_to_many_extras,
+        many_to_one_extras,
+        foreign_key_extras,
+    ):
+        """
+        A patch can be done with a single `UPDATE` query if nothing besides the
+        mutation itself needs to see or change the object before it is saved.
+        Save signal receivers are checked in `mutate` instead, as they may be
+        connected after the mutation class is created.
+        """
+        if many_to_many_extras or many_to_one_extras or foreign_key_extras:
+            return False
+
+        if model.save is not models.Model.save:
+            return False
+
+        if any(
+            cls._overrides_hook(name)
+            for name in ("validate", "before_save", "after_mutate")
+        ) or cls._overrides_hook("update_obj"):
+            return False
+
+        return not any(
+            hasattr(cls, "handle_" + name) or hasattr(cls, "validate_" + name)
+            for name in input_field_names
+        )
+
+    @classmethod
+    def fast_update(cls, root, info, id, input, queryset, version=None):
+        """
+        Patches the object with a single `UPDATE` query. The object is only read
+        back from the database if it is selected in the query.
+        """
+        Model = cls._meta.model
+        values = cls.get_update_kwargs(
+            input, info, cls._meta.auto_context_fields, Model
+        )
+
+        filter_kwargs = {"pk": id}
+        if cls._meta.version_field:
+            field = Model._meta.get_field(cls._meta.version_field)
+            filter_kwargs[field.attname] = version
+            values[field.attname] = cls.get_next_version(field, version)
+
+        if not queryset.filter(**filter_kwargs).update(**values):
+            if cls._meta.version_field and queryset.filter(pk=id).exists():
+                cls.raise_concurrent_modification(id)
+
+            raise Model.DoesNotExist(
+                f"{Model._meta.object_name} matching query does not exist."
+            )
+
+        obj = None
+        if is_field_selected(info, cls._meta.return_field_name):
+            obj = queryset.get(pk=id)
+
+        return cls(**{cls._meta.return_field_name: obj})
+
     @classmethod
     def get_queryset(cls, info, **args):
         Model = cls._meta.model
         return Model.objects
 
     @classmethod
-    def mutate(cls, root, info, id, input):
+    def mutate(cls, root, info, id, input, version=None):
         updated_input = cls.before_mutate(root, info, id, input)
         if updated_input:
             input = updated_input
@@ -911,12 +1445,24 @@ class DjangoPatchMutation(DjangoCudBase):
         id = disambiguate_id(id)
         Model = cls._meta.model
         queryset = cls.get_queryset(info, id=id, input=input)
-        obj = queryset.get(pk=id)
-        auto_context_fields = cls._meta.auto_context_fields or {}
 
-        cls.validate(root, info, input, id=id, obj=obj)
+        fast_update_field_names = cls._meta.fast_update_field_names
+        if (
+            fast_update_field_names is not None
+            and fast_update_field_names.issuperset(super(type(input), input).keys())
+            and not signals.pre_save.has_listeners(Model)
+            and not signals.post_save.has_listeners(Model)
+        ):
+            return cls.fast_update(root, info, id, input, queryset, version)
+
+        auto_context_fields = cls._meta.auto_context_fields or {}
+        updated_fields = set()
 
         with transaction.atomic():
+            obj = cls.get_object_for_update(queryset, id)
+
+            cls.validate(root, info, input, id=id, obj=obj)
+
             obj = cls.update_obj(
                 obj,
                 input,
@@ -926,6 +1472,7 @@ class DjangoPatchMutation(DjangoCudBase):
                 cls._meta.foreign_key_extras,
                 cls._meta.many_to_one_extras,
                 Model,
+                updated_fields=updated_fields,
             )
 
             updated_obj = cls.before_save(root, info, obj, id, input)
@@ -933,7 +1480,21 @@ class DjangoPatchMutation(DjangoCudBase):
             if updated_obj:
                 obj = updated_obj
 
-            obj.save()
+            if cls._meta.version_field:
+                cls.claim_version(queryset, obj, version)
+
+            # before_save, an overridden save() or pre_save receivers may change
+            # any field, in which case we can no longer tell which fields have to
+            # be saved.
+            if (
+                cls._meta.use_update_fields
+                and not cls._overrides_hook("before_save")
+                and Model.save is models.Model.save
+                and not signals.pre_save.has_listeners(Model)
+            ):
+                obj.save(update_fields=cls.get_update_fields(obj, updated_fields))
+            else:
+                obj.save()
 
         kwargs = {cls._meta.return_field_name: obj}
         cls.after_mutate(root, info, kwargs)
@@ -956,6 +1517,10 @@ class DjangoCreateMutationOptions(MutationOptions):
     foreign_key_extras = None
     type_name = None
     field_types = None
+    lazy_input_type = False
+    field_plan = None
+    instrumentation = None
+    retry_policy = None
 
 
 class DjangoCreateMutation(DjangoCudBase):
@@ -979,6 +1544,7 @@ class DjangoCreateMutation(DjangoCudBase):
         many_to_one_extras=None,
         type_name=None,
         field_types=None,
+        lazy_input_type=False,
         **kwargs,
     ):
         registry = get_global_registry()
@@ -1001,37 +1567,40 @@ class DjangoCreateMutation(DjangoCudBase):
 
         input_type_name = type_name or f"Create{model.__name__}Input"
 
-        model_fields = get_input_fields_for_model(
-            model,
-            only_fields,
-            exclude_fields,
-            tuple(auto_context_fields.keys()) + optional_fields,
-            required_fields,
-            many_to_many_extras,
-            foreign_key_extras,
-            many_to_one_extras,
-            parent_type_name=input_type_name,
-            field_types=field_types,
-        )
+        def get_input_fields():
+            return get_input_fields_for_model(
+                model,
+                only_fields,
+                exclude_fields,
+                tuple(auto_context_fields.keys()) + optional_fields,
+                required_fields,
+                many_to_many_extras,
+                foreign_key_extras,
+                many_to_one_extras,
+                parent_type_name=input_type_name,
+                field_types=field_types,
+            )
 
-        InputType = type(input_type_name, (InputObjectType,), model_fields)
+        InputType = cls.create_input_type(
+            input_type_name, get_input_fields, lazy_input_type
+        )
 
         # Register meta-data
         meta_registry.register(
             input_type_name,
-            {
-                "auto_context_fields": auto_context_fields or {},
-                "optional_fields": optional_fields,
-                "required_fields": required_fields,
-                "many_to_many_extras": many_to_many_extras or {},
-                "foreign_key_extras": foreign_key_extras or {},
-                "field_types": field_types or {},
-            },
+            TypeMeta(
+                auto_context_fields=auto_context_fields or {},
+                optional_fields=optional_fields,
+                required_fields=required_fields,
+                many_to_many_extras=many_to_many_extras or {},
+                foreign_key_extras=foreign_key_extras or {},
+                field_types=field_types or {},
+            ),
         )
 
         registry.register_converted_field(input_type_name, InputType)
 
-        arguments = OrderedDict(input=InputType(required=True))
+        arguments = OrderedDict(input=graphene.Argument(InputType, required=True))
 
         output_fields = OrderedDict()
         output_fields[return_field_name] = graphene.Field(model_type)
@@ -1050,10 +1619,18 @@ class DjangoCreateMutation(DjangoCudBase):
         _meta.field_types = field_types or {}
         _meta.InputType = InputType
         _meta.input_type_name = input_type_name
+        _meta.lazy_input_type = lazy_input_type
         _meta.login_required = _meta.login_required or (
             _meta.permissions and len(_meta.permissions) > 0
         )
 
+        _meta.field_plan = cls.get_field_plan(
+            model,
+            _meta.many_to_many_extras,
+            _meta.foreign_key_extras,
+            _meta.many_to_one_extras,
+        )
+
         super().__init_subclass_with_meta__(arguments=arguments, _meta=_meta, **kwargs)
 
     @classmethod
@@ -1108,6 +1685,12 @@ class DjangoBatchCreateMutationOptions(MutationOptions):
     type_name = None
     use_type_name = None
     field_types = None
+    lazy_input_type = False
+    use_bulk_create = False
+    bulk_create_batch_size = None
+    field_plan = None
+    instrumentation = None
+    retry_policy = None
 
 
 class DjangoBatchCreateMutation(DjangoCudBase):
@@ -1132,6 +1715,9 @@ class DjangoBatchCreateMutation(DjangoCudBase):
         type_name=None,
         use_type_name=None,
         field_types=None,
+        lazy_input_type=False,
+        use_bulk_create=False,
+        bulk_create_batch_size=None,
         **kwargs,
     ):
         registry = get_global_registry()
@@ -1163,32 +1749,35 @@ class DjangoBatchCreateMutation(DjangoCudBase):
         else:
             input_type_name = type_name or f"BatchCreate{model.__name__}Input"
 
-            model_fields = get_input_fields_for_model(
-                model,
-                only_fields,
-                exclude_fields,
-                tuple(auto_context_fields.keys()) + optional_fields,
-                required_fields,
-                many_to_many_extras,
-                foreign_key_extras,
-                many_to_one_extras,
-                parent_type_name=input_type_name,
-                field_types=field_types,
-            )
+            def get_input_fields():
+                return get_input_fields_for_model(
+                    model,
+                    only_fields,
+                    exclude_fields,
+                    tuple(auto_context_fields.keys()) + optional_fields,
+                    required_fields,
+                    many_to_many_extras,
+                    foreign_key_extras,
+                    many_to_one_extras,
+                    parent_type_name=input_type_name,
+                    field_types=field_types,
+                )
 
-            InputType = type(input_type_name, (InputObjectType,), model_fields)
+            InputType = cls.create_input_type(
+                input_type_name, get_input_fields, lazy_input_type
+            )
 
             # Register meta-data
             meta_registry.register(
                 input_type_name,
-                {
-                    "auto_context_fields": auto_context_fields or {},
-                    "optional_fields": optional_fields,
-                    "required_fields": required_fields,
-                    "many_to_many_extras": many_to_many_extras or {},
-                    "foreign_key_extras": foreign_key_extras or {},
-                    "field_types": field_types or {},
-                },
+                TypeMeta(
+                    auto_context_fields=auto_context_fields or {},
+                    optional_fields=optional_fields,
+                    required_fields=required_fields,
+                    many_to_many_extras=many_to_many_extras or {},
+                    foreign_key_extras=foreign_key_extras or {},
+                    field_types=field_types or {},
+                ),
             )
 
             registry.register_converted_field(input_type_name, InputType)
@@ -1212,12 +1801,137 @@ class DjangoBatchCreateMutation(DjangoCudBase):
         _meta.field_types = field_types or {}
         _meta.InputType = InputType
         _meta.input_type_name = input_type_name
+        _meta.lazy_input_type = lazy_input_type
+        _meta.use_bulk_create = use_bulk_create
+        _meta.bulk_create_batch_size = bulk_create_batch_size
         _meta.login_required = _meta.login_required or (
             _meta.permissions and len(_meta.permissions) > 0
         )
 
+        _meta.field_plan = cls.get_field_plan(
+            model,
+            _meta.many_to_many_extras,
+            _meta.foreign_key_extras,
+            _meta.many_to_one_extras,
+        )
+
         super().__init_subclass_with_meta__(arguments=arguments, _meta=_meta, **kwargs)
 
+    @classmethod
+    def bulk_create_objs(
+        cls,
+        input,
+        info,
+        auto_context_fields,
+        many_to_many_extras,
+        foreign_key_extras,
+        many_to_one_extras,
+        Model,
+    ):
+        """
+        Creates all objects of the input with as few queries as possible. The objects
+        themselves are inserted with `bulk_create`, and all many-to-many relations of
+        the batch are written with a single `bulk_create` per through model.
+
+        Note that, as with `bulk_create` in general, `save()` is not called and no
+        `pre_save`/`post_save`/`m2m_changed` signals are sent for the created objects.
+        On backends which cannot return the primary keys of bulk inserted rows, the
+        objects are inserted one at a time with `save()` instead.
+        """
+        batch_size = cls._meta.bulk_create_batch_size
+        connection = connections[router.db_for_write(Model)]
+        # Named can_return_ids_from_bulk_insert before Django 3.0
+        can_return_pks = getattr(
+            connection.features,
+            "can_return_rows_from_bulk_insert",
+            getattr(connection.features, "can_return_ids_from_bulk_insert", False),
+        )
+        field_plan = cls.get_field_plan(
+            Model, many_to_many_extras, foreign_key_extras, many_to_one_extras
+        )
+
+        rows = []
+        for data in input:
+            model_field_values, many_to_many_to_set = cls.get_create_field_values(
+                data,
+                info,
+                auto_context_fields,
+                many_to_many_extras,
+                foreign_key_extras,
+                many_to_one_extras,
+                Model,
+            )
+            (
+                many_to_many_to_set,
+                many_to_many_to_add,
+                many_to_many_to_remove,
+            ) = cls.get_many_to_many_changes(
+                data, info, many_to_many_extras, Model, many_to_many_to_set
+            )
+
+            # The object is new, so setting and adding relations amount to the same thing.
+            through_pks = {}
+            related_changes = ({}, {}, {})
+            for name in set(many_to_many_to_set) | set(many_to_many_to_add):
+                field = field_plan.get(name).field
+                values = many_to_many_to_set.get(name)
+                if not can_write_through_model(field):
+                    # These relations have to go through the related manager
+                    related_changes[0][name] = values
+                    related_changes[1][name] = many_to_many_to_add.get(name, [])
+                    related_changes[2][name] = many_to_many_to_remove.get(name, [])
+                    continue
+
+                values = (values or []) + many_to_many_to_add.get(name, [])
+                removed = set(
+                    get_pks_for_objs(
+                        field.related_model, many_to_many_to_remove.get(name, [])
+                    )
+                )
+                pks = get_pks_for_objs(field.related_model, values)
+                pks = list(OrderedDict.fromkeys(pk for pk in pks if pk not in removed))
+                if pks:
+                    through_pks[name] = pks
+
+            rows.append((Model(**model_field_values), data, through_pks, related_changes))
+
+        objs = [row[0] for row in rows]
+        if can_return_pks:
+            Model.objects.bulk_create(objs, batch_size=batch_size)
+        else:
+            # The backend does not give us the primary keys of bulk inserted rows,
+            # which are needed for relations and the returned ids, so the objects
+            # have to be inserted one at a time.
+            for obj in objs:
+                obj.save(force_insert=True)
+
+        through_fields = {}
+        through_objs = OrderedDict()
+        for obj, data, through_pks, related_changes in rows:
+            for name, pks in through_pks.items():
+                if name not in through_fields:
+                    through_fields[name] = get_m2m_through_fields(
+                        Model._meta.get_field(name)
+                    )
+                through, source_attname, target_attname = through_fields[name]
+                through_objs.setdefault(through, []).extend(
+                    through(**{source_attname: obj.pk, target_attname: pk})
+                    for pk in pks
+                )
+
+            if related_changes[0]:
+                cls.apply_many_to_many_changes(obj, *related_changes)
+
+            if many_to_one_extras:
+                cls.apply_many_to_one_extras(
+                    obj, data, info, many_to_one_extras, Model
+                )
+
+        for through, objs_to_create in through_objs.items():
+            through.objects.bulk_create(objs_to_create, batch_size=batch_size)
+
+        return objs
+
     @classmethod
     def mutate(cls, root, info, input):
         updated_input = cls.before_mutate(root, info, input)
@@ -1236,10 +1950,12 @@ class DjangoBatchCreateMutation(DjangoCudBase):
         created_objs = []
 
         with transaction.atomic():
-            for data in input:
-                cls.validate(root, info, data, full_input=input)
-                obj = cls.create_obj(
-                    data,
+            if cls._meta.use_bulk_create:
+                for data in input:
+                    cls.validate(root, info, data, full_input=input)
+
+                created_objs = cls.bulk_create_objs(
+                    input,
                     info,
                     auto_context_fields,
                     cls._meta.many_to_many_extras,
@@ -1247,7 +1963,19 @@ class DjangoBatchCreateMutation(DjangoCudBase):
                     cls._meta.many_to_one_extras,
                     Model,
                 )
-                created_objs.append(obj)
+            else:
+                for data in input:
+                    cls.validate(root, info, data, full_input=input)
+                    obj = cls.create_obj(
+                        data,
+                        info,
+                        auto_context_fields,
+                        cls._meta.many_to_many_extras,
+                        cls._meta.foreign_key_extras,
+                        cls._meta.many_to_one_extras,
+                        Model,
+                    )
+                    created_objs.append(obj)
 
             updated_objs = cls.before_save(root, info, created_objs)
             if updated_objs:
@@ -1258,13 +1986,29 @@ class DjangoBatchCreateMutation(DjangoCudBase):
         return cls(**kwargs)
 
 
-class DjangoDeleteMutationOptions(MutationOptions):
+class DjangoBatchUpdateMutationOptions(MutationOptions):
     model = None
+    only_fields = None
+    exclude_fields = None
+    return_field_name = None
     permissions = None
     login_required = None
+    auto_context_fields = None
+    optional_fields = ()
+    required_fields = None
+    many_to_many_extras = None
+    many_to_one_extras = None
+    foreign_key_extras = None
+    type_name = None
+    field_types = None
+    lazy_input_type = False
+    bulk_update_batch_size = None
+    field_plan = None
+    instrumentation = None
+    retry_policy = None
 
 
-class DjangoDeleteMutation(DjangoCudBase):
+class DjangoBatchUpdateMutation(DjangoCudBase):
     class Meta:
         abstract = True
 
@@ -1276,19 +2020,483 @@ class DjangoDeleteMutation(DjangoCudBase):
         login_required=None,
         only_fields=(),
         exclude_fields=(),
+        auto_context_fields={},
+        optional_fields=(),
+        required_fields=(),
         return_field_name=None,
+        many_to_many_extras=None,
+        many_to_one_extras=None,
+        foreign_key_extras=None,
+        type_name=None,
+        field_types=None,
+        lazy_input_type=False,
+        bulk_update_batch_size=None,
         **kwargs,
     ):
         registry = get_global_registry()
+        meta_registry = get_type_meta_registry()
+        model_type = registry.get_type_for_model(model)
 
-        if not return_field_name:
-            return_field_name = to_snake_case(model.__name__)
+        assert model_type, f"Model type must be registered for model {model}"
 
-        arguments = OrderedDict(id=graphene.ID(required=True))
+        if not return_field_name:
+            # Pluralize
+            return_field_name = to_snake_case(model.__name__) + "s"
 
-        output_fields = OrderedDict()
-        output_fields["found"] = graphene.Boolean()
-        output_fields["deleted_id"] = graphene.ID()
+        if many_to_one_extras is None:
+            many_to_one_extras = {}
+
+        if foreign_key_extras is None:
+            foreign_key_extras = {}
+
+        if many_to_many_extras is None:
+            many_to_many_extras = {}
+
+        input_type_name = type_name or f"BatchUpdate{model.__name__}Input"
+
+        def get_input_fields():
+            model_fields = get_input_fields_for_model(
+                model,
+                only_fields,
+                exclude_fields,
+                optional_fields=tuple(auto_context_fields.keys()) + optional_fields,
+                required_fields=required_fields,
+                many_to_many_extras=many_to_many_extras,
+                foreign_key_extras=foreign_key_extras,
+                many_to_one_extras=many_to_one_extras,
+                parent_type_name=input_type_name,
+                field_types=field_types,
+            )
+
+            # Each element of the batch is identified by its id.
+            return OrderedDict(
+                [("id", graphene.ID(required=True))] + list(model_fields.items())
+            )
+
+        InputType = cls.create_input_type(
+            input_type_name, get_input_fields, lazy_input_type
+        )
+
+        # Register meta-data
+        meta_registry.register(
+            input_type_name,
+            TypeMeta(
+                auto_context_fields=auto_context_fields or {},
+                optional_fields=optional_fields,
+                required_fields=required_fields,
+                many_to_many_extras=many_to_many_extras or {},
+                many_to_one_extras=many_to_one_extras or {},
+                foreign_key_extras=foreign_key_extras or {},
+                field_types=field_types or {},
+            ),
+        )
+
+        registry.register_converted_field(input_type_name, InputType)
+
+        arguments = OrderedDict(input=graphene.List(InputType, required=True))
+
+        output_fields = OrderedDict()
+        output_fields[return_field_name] = graphene.List(model_type)
+
+        _meta = DjangoBatchUpdateMutationOptions(cls)
+        _meta.model = model
+        _meta.fields = yank_fields_from_attrs(output_fields, _as=graphene.Field)
+        _meta.return_field_name = return_field_name
+        _meta.permissions = permissions
+        _meta.auto_context_fields = auto_context_fields or {}
+        _meta.optional_fields = optional_fields
+        _meta.required_fields = required_fields
+        _meta.InputType = InputType
+        _meta.input_type_name = input_type_name
+        _meta.lazy_input_type = lazy_input_type
+        _meta.many_to_many_extras = many_to_many_extras
+        _meta.many_to_one_extras = many_to_one_extras
+        _meta.foreign_key_extras = foreign_key_extras
+        _meta.field_types = field_types or {}
+        _meta.bulk_update_batch_size = bulk_update_batch_size
+        _meta.login_required = _meta.login_required or (
+            _meta.permissions and len(_meta.permissions) > 0
+        )
+
+        _meta.field_plan = cls.get_field_plan(
+            model,
+            _meta.many_to_many_extras,
+            _meta.foreign_key_extras,
+            _meta.many_to_one_extras,
+        )
+
+        super().__init_subclass_with_meta__(arguments=arguments, _meta=_meta, **kwargs)
+
+    @classmethod
+    def get_queryset(cls, info, **args):
+        Model = cls._meta.model
+        return Model.objects
+
+    @classmethod
+    def mutate(cls, root, info, input):
+        updated_input = cls.before_mutate(root, info, input)
+        if updated_input:
+            input = updated_input
+
+        if cls._meta.login_required and not info.context.user.is_authenticated:
+            raise GraphQLError("Must be logged in to access this mutation.")
+
+        cls.check_permissions(root, info, input)
+
+        queryset = cls.get_queryset(info, input=input)
+        updated_objs = cls.bulk_update_objs(root, info, input, queryset)
+
+        kwargs = {cls._meta.return_field_name: updated_objs}
+        cls.after_mutate(root, info, kwargs)
+
+        return cls(**kwargs)
+
+
+class DjangoBatchPatchMutationOptions(MutationOptions):
+    model = None
+    only_fields = None
+    exclude_fields = None
+    return_field_name = None
+    permissions = None
+    login_required = None
+    auto_context_fields = None
+    many_to_many_extras = None
+    many_to_one_extras = None
+    foreign_key_extras = None
+    type_name = None
+    field_types = None
+    lazy_input_type = False
+    bulk_update_batch_size = None
+    field_plan = None
+    instrumentation = None
+    retry_policy = None
+
+
+class DjangoBatchPatchMutation(DjangoCudBase):
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def __init_subclass_with_meta__(
+        cls,
+        model=None,
+        permissions=None,
+        login_required=None,
+        only_fields=(),
+        exclude_fields=(),
+        auto_context_fields={},
+        return_field_name=None,
+        many_to_many_extras=None,
+        many_to_one_extras=None,
+        foreign_key_extras=None,
+        type_name=None,
+        field_types=None,
+        lazy_input_type=False,
+        bulk_update_batch_size=None,
+        **kwargs,
+    ):
+        registry = get_global_registry()
+        meta_registry = get_type_meta_registry()
+        model_type = registry.get_type_for_model(model)
+
+        assert model_type, f"Model type must be registered for model {model}"
+
+        if not return_field_name:
+            # Pluralize
+            return_field_name = to_snake_case(model.__name__) + "s"
+
+        if many_to_one_extras is None:
+            many_to_one_extras = {}
+
+        if foreign_key_extras is None:
+            foreign_key_extras = {}
+
+        if many_to_many_extras is None:
+            many_to_many_extras = {}
+
+        input_type_name = type_name or f"BatchPatch{model.__name__}Input"
+
+        def get_input_fields():
+            model_fields = get_all_optional_input_fields_for_model(
+                model,
+                only_fields,
+                exclude_fields,
+                many_to_many_extras=many_to_many_extras,
+                foreign_key_extras=foreign_key_extras,
+                many_to_one_extras=many_to_one_extras,
+                parent_type_name=input_type_name,
+                field_types=field_types,
+            )
+
+            # Each element of the batch is identified by its id.
+            return OrderedDict(
+                [("id", graphene.ID(required=True))] + list(model_fields.items())
+            )
+
+        InputType = cls.create_input_type(
+            input_type_name, get_input_fields, lazy_input_type
+        )
+
+        # Register meta-data
+        meta_registry.register(
+            input_type_name,
+            TypeMeta(
+                auto_context_fields=auto_context_fields or {},
+                many_to_many_extras=many_to_many_extras or {},
+                many_to_one_extras=many_to_one_extras or {},
+                foreign_key_extras=foreign_key_extras or {},
+                field_types=field_types or {},
+            ),
+        )
+
+        registry.register_converted_field(input_type_name, InputType)
+
+        arguments = OrderedDict(input=graphene.List(InputType, required=True))
+
+        output_fields = OrderedDict()
+        output_fields[return_field_name] = graphene.List(model_type)
+
+        _meta = DjangoBatchPatchMutationOptions(cls)
+        _meta.model = model
+        _meta.fields = yank_fields_from_attrs(output_fields, _as=graphene.Field)
+        _meta.return_field_name = return_field_name
+        _meta.permissions = permissions
+        _meta.auto_context_fields = auto_context_fields or {}
+        _meta.InputType = InputType
+        _meta.input_type_name = input_type_name
+        _meta.lazy_input_type = lazy_input_type
+        _meta.many_to_many_extras = many_to_many_extras
+        _meta.many_to_one_extras = many_to_one_extras
+        _meta.foreign_key_extras = foreign_key_extras
+        _meta.field_types = field_types or {}
+        _meta.bulk_update_batch_size = bulk_update_batch_size
+        _meta.login_required = _meta.login_required or (
+            _meta.permissions and len(_meta.permissions) > 0
+        )
+
+        _meta.field_plan = cls.get_field_plan(
+            model,
+            _meta.many_to_many_extras,
+            _meta.foreign_key_extras,
+            _meta.many_to_one_extras,
+        )
+
+        super().__init_subclass_with_meta__(arguments=arguments, _meta=_meta, **kwargs)
+
+    @classmethod
+    def get_queryset(cls, info, **args):
+        Model = cls._meta.model
+        return Model.objects
+
+    @classmethod
+    def mutate(cls, root, info, input):
+        updated_input = cls.before_mutate(root, info, input)
+        if updated_input:
+            input = updated_input
+
+        if cls._meta.login_required and not info.context.user.is_authenticated:
+            raise GraphQLError("Must be logged in to access this mutation.")
+
+        cls.check_permissions(root, info, input)
+
+        queryset = cls.get_queryset(info, input=input)
+        updated_objs = cls.bulk_update_objs(root, info, input, queryset)
+
+        kwargs = {cls._meta.return_field_name: updated_objs}
+        cls.after_mutate(root, info, kwargs)
+
+        return cls(**kwargs)
+
+
+class DjangoFilterUpdateMutationOptions(MutationOptions):
+    model = None
+    node_type_name = None
+    filter_fields = None
+    filter_class = None
+    only_fields = None
+    exclude_fields = None
+    permissions = None
+    login_required = None
+    auto_context_fields = None
+    type_name = None
+    field_types = None
+    lazy_input_type = False
+    field_plan = None
+    instrumentation = None
+    retry_policy = None
+
+
+class DjangoFilterUpdateMutation(DjangoCudBase):
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def __init_subclass_with_meta__(
+        cls,
+        model=None,
+        permissions=None,
+        login_required=None,
+        filter_fields=(),
+        filter_class=None,
+        only_fields=(),
+        exclude_fields=(),
+        auto_context_fields={},
+        type_name=None,
+        field_types=None,
+        lazy_input_type=False,
+        **kwargs,
+    ):
+        registry = get_global_registry()
+        model_type = registry.get_type_for_model(model)
+
+        assert model_type, f"Model type must be registered for model {model}"
+        assert (
+            len(filter_fields) > 0
+        ), "You must specify at least one field to filter on for updating."
+
+        input_arguments = get_filter_fields_input_args(filter_fields, model)
+
+        FilterInputType = type(
+            f"FilterUpdate{model.__name__}FilterInput",
+            (InputObjectType,),
+            input_arguments,
+        )
+
+        input_type_name = type_name or f"FilterUpdate{model.__name__}Input"
+
+        # Only concrete fields can be set with a single UPDATE query.
+        concrete_field_names = set(
+            field.name for field in model._meta.concrete_fields
+        )
+
+        def get_input_fields():
+            model_fields = get_all_optional_input_fields_for_model(
+                model,
+                only_fields,
+                exclude_fields,
+                parent_type_name=input_type_name,
+                field_types=field_types,
+            )
+            return OrderedDict(
+                (name, field)
+                for name, field in model_fields.items()
+                if name in concrete_field_names
+            )
+
+        InputType = cls.create_input_type(
+            input_type_name, get_input_fields, lazy_input_type
+        )
+
+        registry.register_converted_field(input_type_name, InputType)
+
+        arguments = OrderedDict(
+            filter=FilterInputType(required=True),
+            input=graphene.Argument(InputType, required=True),
+        )
+
+        output_fields = OrderedDict()
+        output_fields["updated_count"] = graphene.Int()
+        output_fields["updated_ids"] = graphene.List(graphene.ID)
+
+        _meta = DjangoFilterUpdateMutationOptions(cls)
+        _meta.model = model
+        _meta.node_type_name = model_type.__name__
+        _meta.fields = yank_fields_from_attrs(output_fields, _as=graphene.Field)
+        _meta.filter_fields = filter_fields
+        _meta.permissions = permissions
+        _meta.auto_context_fields = auto_context_fields or {}
+        _meta.InputType = InputType
+        _meta.input_type_name = input_type_name
+        _meta.lazy_input_type = lazy_input_type
+        _meta.field_types = field_types or {}
+        _meta.login_required = _meta.login_required or (
+            _meta.permissions and len(_meta.permissions) > 0
+        )
+
+        _meta.field_plan = cls.get_field_plan(model)
+
+        super().__init_subclass_with_meta__(arguments=arguments, _meta=_meta, **kwargs)
+
+    @classmethod
+    def get_queryset(cls, info, **args):
+        Model = cls._meta.model
+        return Model.objects
+
+    @classmethod
+    def mutate(cls, root, info, filter, input):
+        updated_input = cls.before_mutate(root, info, filter, input)
+
+        if updated_input:
+            filter, input = updated_input
+
+        if cls._meta.login_required and not info.context.user.is_authenticated:
+            raise GraphQLError("Must be logged in to access this mutation.")
+
+        cls.check_permissions(root, info, filter, input)
+        cls.validate(root, info, input, filter=filter)
+
+        Model = cls._meta.model
+        filter_kwargs = cls.get_filter_kwargs(filter, info, Model)
+        filter_qs = cls.get_queryset(info, filter=filter, input=input).filter(
+            **filter_kwargs
+        )
+        updated_qs = cls.before_save(root, info, filter_qs, input)
+
+        if updated_qs:
+            filter_qs = updated_qs
+
+        values = cls.get_update_kwargs(
+            input, info, cls._meta.auto_context_fields, Model
+        )
+
+        ids = None
+        with transaction.atomic():
+            if is_field_selected(info, "updated_ids"):
+                ids = to_global_ids(
+                    cls._meta.node_type_name,
+                    filter_qs.select_for_update().values_list("pk", flat=True),
+                )
+
+            updated_count = filter_qs.update(**values)
+
+        cls.after_mutate(root, info, updated_count, ids)
+
+        return cls(updated_count=updated_count, updated_ids=ids)
+
+
+class DjangoDeleteMutationOptions(MutationOptions):
+    model = None
+    permissions = None
+    login_required = None
+    instrumentation = None
+    retry_policy = None
+
+
+class DjangoDeleteMutation(DjangoCudBase):
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def __init_subclass_with_meta__(
+        cls,
+        model=None,
+        permissions=None,
+        login_required=None,
+        only_fields=(),
+        exclude_fields=(),
+        return_field_name=None,
+        **kwargs,
+    ):
+        registry = get_global_registry()
+
+        if not return_field_name:
+            return_field_name = to_snake_case(model.__name__)
+
+        arguments = OrderedDict(id=graphene.ID(required=True))
+
+        output_fields = OrderedDict()
+        output_fields["found"] = graphene.Boolean()
+        output_fields["deleted_id"] = graphene.ID()
 
         _meta = DjangoDeleteMutationOptions(cls)
         _meta.model = model
@@ -1332,10 +2540,16 @@ class DjangoDeleteMutation(DjangoCudBase):
 
 class DjangoBatchDeleteMutationOptions(MutationOptions):
     model = None
+    node_type_name = None
     filter_fields = None
     filter_class = None
     permissions = None
     login_required = None
+    use_fast_delete = False
+    chunk_size = None
+    max_rows_per_request = None
+    instrumentation = None
+    retry_policy = None
 
 
 class DjangoBatchDeleteMutation(DjangoCudBase):
@@ -1350,6 +2564,9 @@ class DjangoBatchDeleteMutation(DjangoCudBase):
         login_required=None,
         filter_fields=(),
         filter_class=None,
+        use_fast_delete=False,
+        chunk_size=None,
+        max_rows_per_request=None,
         **kwargs,
     ):
         registry = get_global_registry()
@@ -1358,7 +2575,14 @@ class DjangoBatchDeleteMutation(DjangoCudBase):
         assert model_type, f"Model type must be registered for model {model}"
         assert (
             len(filter_fields) > 0
-        ), f"You must specify at least one field to filter on for deletion."
+        ), "You must specify at least one field to filter on for deletion."
+        assert (
+            max_rows_per_request is None or chunk_size
+        ), "max_rows_per_request requires chunk_size to be set."
+        assert chunk_size is None or chunk_size >= 1, "chunk_size must be at least 1."
+        assert (
+            max_rows_per_request is None or max_rows_per_request >= 1
+        ), "max_rows_per_request must be at least 1."
 
         input_arguments = get_filter_fields_input_args(filter_fields, model)
 
@@ -1372,11 +2596,20 @@ class DjangoBatchDeleteMutation(DjangoCudBase):
         output_fields["deletion_count"] = graphene.Int()
         output_fields["deleted_ids"] = graphene.List(graphene.ID)
 
+        if chunk_size:
+            # Chunked deletions may be resumed from the returned cursor
+            arguments["after"] = graphene.String()
+            output_fields["cursor"] = graphene.String()
+
         _meta = DjangoBatchDeleteMutationOptions(cls)
         _meta.model = model
+        _meta.node_type_name = model_type.__name__
         _meta.fields = yank_fields_from_attrs(output_fields, _as=graphene.Field)
         _meta.filter_fields = filter_fields
         _meta.permissions = permissions
+        _meta.use_fast_delete = use_fast_delete
+        _meta.chunk_size = chunk_size
+        _meta.max_rows_per_request = max_rows_per_request
         _meta.login_required = _meta.login_required or (
             _meta.permissions and len(_meta.permissions) > 0
         )
@@ -1389,7 +2622,70 @@ class DjangoBatchDeleteMutation(DjangoCudBase):
         return Model.objects
 
     @classmethod
-    def mutate(cls, root, info, input):
+    def chunked_delete(cls, queryset, using, return_pks, after=None):
+        """
+        Deletes the objects of the queryset in slices of `chunk_size` objects,
+        ordered by primary key, with each slice in its own transaction. At most
+        `max_rows_per_request` objects are deleted. Inside an outer transaction,
+        the slices are savepoints, which are only committed with it.
+
+        :return: A tuple of the number of deleted objects, a list of their primary
+            keys (or None if `return_pks` is false), and a cursor to resume from if
+            there may be more objects to delete.
+        """
+        chunk_size = cls._meta.chunk_size
+        max_rows = cls._meta.max_rows_per_request
+        fast_delete = cls._meta.use_fast_delete and Collector(
+            using=using
+        ).can_fast_delete(queryset)
+
+        pk_field = queryset.model._meta.pk
+        last_pk = None
+        if after:
+            try:
+                last_pk = pk_field.to_python(unbase64(after))
+            except (ValueError, ValidationError):
+                raise GraphQLError(f"Invalid cursor: {after}.")
+
+        deletion_count = 0
+        row_count = 0
+        pks = [] if return_pks else None
+
+        while True:
+            size = chunk_size
+            if max_rows is not None:
+                size = min(chunk_size, max_rows - row_count)
+            if size <= 0:
+                # There may be more objects, which are left for the next request
+                return deletion_count, pks, base64(str(last_pk))
+
+            chunk_qs = queryset.order_by("pk")
+            if last_pk is not None:
+                chunk_qs = chunk_qs.filter(pk__gt=last_pk)
+
+            with transaction.atomic(using=using):
+                chunk_pks = list(
+                    chunk_qs.select_for_update().values_list("pk", flat=True)[:size]
+                )
+                if chunk_pks:
+                    to_delete = queryset.filter(pk__in=chunk_pks)
+                    if fast_delete:
+                        count, _ = cls.fast_delete(to_delete, using, False)
+                    else:
+                        count, _ = to_delete.delete()
+                    deletion_count += count
+
+            row_count += len(chunk_pks)
+            if return_pks:
+                pks += chunk_pks
+
+            if len(chunk_pks) < size:
+                return deletion_count, pks, None
+
+            last_pk = chunk_pks[-1]
+
+    @classmethod
+    def mutate(cls, root, info, input, after=None):
         updated_input = cls.before_mutate(root, info, input)
 
         if updated_input:
@@ -1401,67 +2697,151 @@ class DjangoBatchDeleteMutation(DjangoCudBase):
         cls.check_permissions(root, info, input)
 
         Model = cls._meta.model
-        model_field_values = {}
+        model_field_values = cls.get_filter_kwargs(input, info, Model)
 
-        for name, value in super(type(input), input).items():
-            filter_field_split = name.split("__", 1)
-            field_name = filter_field_split[0]
+        filter_qs = cls.get_queryset(info, input=input).filter(**model_field_values)
+        updated_qs = cls.before_save(root, info, filter_qs)
 
-            try:
-                field = Model._meta.get_field(field_name)
-            except FieldDoesNotExist:
-                # This can happen with nested selectors. In this case we set the field to none.
-                field = None
+        if updated_qs:
+            filter_qs = updated_qs
 
-            filter_field_is_list = False
+        # The ids are only needed if they are returned or passed on to a hook
+        return_pks = is_field_selected(info, "deleted_ids") or cls._overrides_hook(
+            "after_mutate"
+        )
+        using = router.db_for_write(Model)
 
-            if len(filter_field_split) > 1:
-                # If we have an "__in" final part of the filter, we are now dealing with
-                # a list of things. Note that all other variants can be coerced directly
-                # on the filter-call, so we don't really have to deal with other cases.
-                filter_field_is_list = filter_field_split[-1] == "in"
+        cursor = None
+        if cls._meta.chunk_size:
+            deletion_count, pks, cursor = cls.chunked_delete(
+                filter_qs, using, return_pks, after
+            )
+        elif cls._meta.use_fast_delete and Collector(using=using).can_fast_delete(
+            filter_qs
+        ):
+            deletion_count, pks = cls.fast_delete(filter_qs, using, return_pks)
+        else:
+            pks = list(filter_qs.values_list("pk", flat=True)) if return_pks else None
+            deletion_count, _ = filter_qs.delete()
 
-            new_value = value
+        ids = None
+        if pks is not None:
+            ids = LazyGlobalIds(cls._meta.node_type_name, pks)
 
-            value_handle_name = "handle_" + name
-            if hasattr(cls, value_handle_name):
-                handle_func = getattr(cls, value_handle_name)
-                assert callable(
-                    handle_func
-                ), f"Property {value_handle_name} on {cls.__name__} is not a function."
-                new_value = handle_func(value, name, info)
+        cls.after_mutate(root, info, deletion_count, ids)
 
-            # On some fields we perform some default conversion, if the value was not transformed above.
-            if new_value == value and value is not None:
-                if type(field) in (models.ForeignKey, models.OneToOneField):
-                    name = getattr(field, "db_column", None) or name + "_id"
-                    new_value = disambiguate_id(value)
-                elif (
-                    type(field)
-                    in (
-                        models.ManyToManyField,
-                        models.ManyToManyRel,
-                        models.ManyToOneRel,
-                    )
-                    or filter_field_is_list
-                ):
-                    new_value = disambiguate_ids(value)
+        if cls._meta.chunk_size:
+            return cls(deletion_count=deletion_count, deleted_ids=ids, cursor=cursor)
 
-            model_field_values[name] = new_value
+        return cls(deletion_count=deletion_count, deleted_ids=ids)
 
-        filter_qs = cls.get_queryset(info, input=input).filter(**model_field_values)
+
+class DjangoBatchDeleteByIdsMutationOptions(MutationOptions):
+    model = None
+    node_type_name = None
+    permissions = None
+    login_required = None
+    use_fast_delete = False
+    instrumentation = None
+    retry_policy = None
+
+
+class DjangoBatchDeleteByIdsMutation(DjangoCudBase):
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def __init_subclass_with_meta__(
+        cls,
+        model=None,
+        permissions=None,
+        login_required=None,
+        use_fast_delete=False,
+        **kwargs,
+    ):
+        registry = get_global_registry()
+        model_type = registry.get_type_for_model(model)
+
+        assert model_type, f"Model type must be registered for model {model}"
+
+        arguments = OrderedDict(
+            ids=graphene.List(graphene.NonNull(graphene.ID), required=True)
+        )
+
+        output_fields = OrderedDict()
+        output_fields["deletion_count"] = graphene.Int()
+        output_fields["deleted_ids"] = graphene.List(graphene.ID)
+        output_fields["found"] = graphene.List(graphene.Boolean)
+
+        _meta = DjangoBatchDeleteByIdsMutationOptions(cls)
+        _meta.model = model
+        _meta.node_type_name = model_type.__name__
+        _meta.fields = yank_fields_from_attrs(output_fields, _as=graphene.Field)
+        _meta.permissions = permissions
+        _meta.use_fast_delete = use_fast_delete
+        _meta.login_required = _meta.login_required or (
+            _meta.permissions and len(_meta.permissions) > 0
+        )
+
+        super().__init_subclass_with_meta__(arguments=arguments, _meta=_meta, **kwargs)
+
+    @classmethod
+    def get_queryset(cls, info, **args):
+        Model = cls._meta.model
+        return Model.objects
+
+    @classmethod
+    def mutate(cls, root, info, ids):
+        updated_ids = cls.before_mutate(root, info, ids)
+
+        if updated_ids:
+            ids = updated_ids
+
+        if cls._meta.login_required and not info.context.user.is_authenticated:
+            raise GraphQLError("Must be logged in to access this mutation.")
+
+        cls.check_permissions(root, info, ids)
+
+        Model = cls._meta.model
+        pk_field = Model._meta.pk
+        pks = []
+        for pk in disambiguate_ids(ids, get_node_type_names(cls._meta.model)):
+            try:
+                pks.append(pk_field.to_python(pk))
+            except ValidationError:
+                # A malformed id cannot match any object, and is reported as
+                # not found.
+                pks.append(None)
+
+        filter_qs = cls.get_queryset(info, ids=ids).filter(
+            pk__in=set(pk for pk in pks if pk is not None)
+        )
         updated_qs = cls.before_save(root, info, filter_qs)
 
         if updated_qs:
             filter_qs = updated_qs
 
-        ids = [
-            to_global_id(get_global_registry().get_type_for_model(Model).__name__, id)
-            for id in filter_qs.values_list("id", flat=True)
-        ]
+        using = router.db_for_write(Model)
 
-        deletion_count, _ = filter_qs.delete()
+        if cls._meta.use_fast_delete and Collector(using=using).can_fast_delete(
+            filter_qs
+        ):
+            deletion_count, deleted_pks = cls.fast_delete(filter_qs, using, True)
+        else:
+            with transaction.atomic(using=using):
+                deleted_pks = list(
+                    filter_qs.select_for_update().values_list("pk", flat=True)
+                )
+                deletion_count, _ = filter_qs.filter(pk__in=deleted_pks).delete()
 
-        cls.after_mutate(root, info, deletion_count, ids)
+        deleted_pks = set(pk_field.to_python(pk) for pk in deleted_pks)
+        found = [pk in deleted_pks for pk in pks]
 
-        return cls(deletion_count=deletion_count, deleted_ids=ids)
+        deleted_ids = LazyGlobalIds(
+            cls._meta.node_type_name,
+            list(OrderedDict.fromkeys(pk for pk in pks if pk in deleted_pks)),
+        )
+
+        cls.after_mutate(root, info, deletion_count, deleted_ids)
+
+        return cls(deletion_count=deletion_count, deleted_ids=deleted_ids, found=found)
@@ -0,0 +1,177 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+_current_profiler = ContextVar("graphene_django_cud_build_profiler", default=None)
+
+# The counters recorded for each mutation class
+BUILD_COUNTERS = ("fields_converted", "nested_input_types", "enums")
+
+
+class SchemaBuildProfiler:
+    """
+    Records, for each mutation class, how long its creation takes, how many fields
+    are converted, and how many nested input types and enums are created. The time
+    spent in the main building steps, such as `get_input_fields_for_model` and
+    `convert_choices_field`, is recorded as well. Step times include the time of
+    the steps they call, and recursive calls of a step are only timed once.
+
+    Input types created lazily are recorded on their mutation class when they are
+    created, typically when the schema is built. Work done outside of any mutation
+    class is recorded under the name None.
+
+    Use it as a context manager around the code creating the mutation classes:
+
+    .. code:: python
+
+        with SchemaBuildProfiler() as profiler:
+            from myapp.schema import schema
+
+        print(profiler.format_report())
+    """
+
+    def __init__(self):
+        self.classes = OrderedDict()
+        self._stack = []
+        self._active_steps = set()
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_profiler.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _current_profiler.reset(self._token)
+        self._token = None
+
+    def _get_stats(self, name):
+        stats = self.classes.get(name)
+        if stats is None:
+            stats = self.classes[name] = {"time": 0.0, "steps": OrderedDict()}
+            for counter in BUILD_COUNTERS:
+                stats[counter] = 0
+        return stats
+
+    def _get_current_stats(self):
+        return self._get_stats(self._stack[-1] if self._stack else None)
+
+    @contextmanager
+    def record_class(self, mutation):
+        self._stack.append(mutation.__name__)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            self._get_stats(mutation.__name__)["time"] += perf_counter() - start
+
+    @contextmanager
+    def record_step(self, name):
+        if name in self._active_steps:
+            yield
+            return
+
+        self._active_steps.add(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._active_steps.discard(name)
+            steps = self._get_current_stats()["steps"]
+            step = steps.get(name)
+            if step is None:
+                step = steps[name] = {"time": 0.0, "calls": 0}
+            step["time"] += perf_counter() - start
+            step["calls"] += 1
+
+    def count(self, counter, amount=1):
+        self._get_current_stats()[counter] += amount
+
+    def get_report(self):
+        report = {
+            "time": sum(stats["time"] for stats in self.classes.values()),
+            "classes": self.classes,
+        }
+        for counter in BUILD_COUNTERS:
+            report[counter] = sum(stats[counter] for stats in self.classes.values())
+        return report
+
+    def format_report(self, limit=None):
+        """
+        Formats the report as a table of the mutation classes, slowest first.
+        """
+        report = self.get_report()
+        lines = [
+            f"{len(self.classes)} classes, {report['time'] * 1000:.1f} ms, "
+            + ", ".join(f"{report[counter]} {counter}" for counter in BUILD_COUNTERS)
+        ]
+
+        classes = sorted(
+            self.classes.items(), key=lambda item: item[1]["time"], reverse=True
+        )
+        for name, stats in classes[:limit]:
+            lines.append(
+                f"  {name}: {stats['time'] * 1000:.2f} ms, "
+                + ", ".join(f"{stats[counter]} {counter}" for counter in BUILD_COUNTERS)
+            )
+            for step_name, step in stats["steps"].items():
+                lines.append(
+                    f"    {step_name}: {step['time'] * 1000:.2f} ms, "
+                    f"{step['calls']} calls"
+                )
+
+        return "\n".join(lines)
+
+
+def get_build_profiler():
+    """
+    Returns the active schema build profiler, if any.
+    """
+    return _current_profiler.get()
+
+
+@contextmanager
+def profile_mutation_build(mutation):
+    """
+    Records the time spent within the block on the mutation class, if a profiler
+    is active.
+    """
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield
+        return
+
+    with profiler.record_class(mutation):
+        yield
+
+
+def profile_build_step(name):
+    """
+    Decorates a function, such that its calls are recorded as the given step when
+    a profiler is active.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _current_profiler.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+
+            with profiler.record_step(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count_build_event(counter):
+    """
+    Increments one of the `BUILD_COUNTERS`, if a profiler is active.
+    """
+    profiler = _current_profiler.get()
+    if profiler is not None:
+        profiler.count(counter)
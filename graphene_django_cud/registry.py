@@ -1,5 +1,55 @@
+from collections import namedtuple
+from types import MappingProxyType
+
+from graphene import InputObjectType
 from graphene_django.registry import Registry
 
+_EMPTY = MappingProxyType({})
+
+
+class TypeMeta(
+    namedtuple(
+        "TypeMeta",
+        (
+            "auto_context_fields",
+            "optional_fields",
+            "required_fields",
+            "many_to_many_extras",
+            "many_to_one_extras",
+            "foreign_key_extras",
+            "field_types",
+        ),
+    )
+):
+    """
+    The meta-data of an input type. Records are immutable, and missing values
+    default to empty mappings and tuples, so they can be used without checks.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, meta):
+        return cls(
+            **{
+                name: value
+                for name, value in meta.items()
+                if name in cls._fields and value is not None
+            }
+        )
+
+    def get(self, name, default=None):
+        # Kept for code written against the former dict records
+        if name in self._fields:
+            return getattr(self, name)
+        return default
+
+
+# namedtuple only accepts defaults from Python 3.7
+TypeMeta.__new__.__defaults__ = (_EMPTY, (), (), _EMPTY, _EMPTY, _EMPTY, _EMPTY)
+
+EMPTY_TYPE_META = TypeMeta()
+
 
 class TypeMetaRegistry:
     """
@@ -10,23 +60,52 @@ class TypeMetaRegistry:
 
     def __init__(self):
         self._registry = {}
+        # Records by input type class, filled on lookup
+        self._registry_by_class = {}
 
     def register(self, type, meta):
-        assert isinstance(meta, dict)
+        if isinstance(meta, dict):
+            meta = TypeMeta.from_dict(meta)
+        assert isinstance(meta, TypeMeta)
 
         if isinstance(type, str):
             self._registry[type] = meta
         else:
             self._registry[type.__name__] = meta
+        self._registry_by_class.clear()
 
     def unregister(self, type):
         del self._registry[type]
+        self._registry_by_class.clear()
 
     def get_meta_for_type(self, type):
         if isinstance(type, str):
-            return self._registry.get(type, {})
+            return self._registry.get(type, EMPTY_TYPE_META)
         else:
-            return self._registry.get(type.__name__, {})
+            return self._registry.get(type.__name__, EMPTY_TYPE_META)
+
+    def get_meta_for_value(self, value, type_name):
+        """
+        Returns the meta-data for a nested input value. Values parsed by graphene
+        are instances of their input type, whose record is looked up by class.
+        Other values, e.g. plain dicts, and values of input types registered
+        under another name fall back to the given type name.
+        """
+        value_type = type(value)
+        meta = self._registry_by_class.get(value_type)
+        if meta is not None:
+            return meta
+
+        if not isinstance(value, InputObjectType):
+            return self.get_meta_for_type(type_name)
+
+        meta = self._registry.get(value_type.__name__)
+        if meta is None:
+            # E.g. input types whose Meta.name differs from the class name
+            return self.get_meta_for_type(type_name)
+
+        self._registry_by_class[value_type] = meta
+        return meta
 
 
 input_type_registry = None
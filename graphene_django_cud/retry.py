@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+
+from django.db import OperationalError, router, transaction
+
+# SQLSTATE codes of serialization failures and deadlocks
+RETRYABLE_SQLSTATES = ("40001", "40P01")
+# MySQL error codes of deadlocks and lock wait timeouts
+RETRYABLE_MYSQL_ERRORS = (1213, 1205)
+
+_retry_counts = Counter()
+_retry_counts_lock = threading.Lock()
+
+_before_mutate_results = ContextVar(
+    "graphene_django_cud_before_mutate_results", default=None
+)
+
+
+def is_transient_database_error(error):
+    """
+    Checks if an error is a deadlock or serialization failure, after which the
+    transaction can be retried.
+    """
+    if not isinstance(error, OperationalError):
+        return False
+
+    cause = error.__cause__
+    if getattr(cause, "pgcode", None) in RETRYABLE_SQLSTATES:
+        return True
+    if getattr(cause, "sqlstate", None) in RETRYABLE_SQLSTATES:
+        return True
+
+    args = getattr(cause, "args", None) or error.args
+    if args and args[0] in RETRYABLE_MYSQL_ERRORS:
+        return True
+
+    return "database is locked" in str(error)
+
+
+def get_retry_count(mutation):
+    """
+    Returns the number of times calls to the mutation have been retried.
+    """
+    return _retry_counts[mutation]
+
+
+def get_retry_counts():
+    """
+    Returns the number of retries of all mutations, keyed on the mutation name.
+    """
+    counts = Counter()
+    with _retry_counts_lock:
+        for mutation, count in _retry_counts.items():
+            counts[mutation.__name__] += count
+    return dict(counts)
+
+
+class RetryPolicy:
+    """
+    Describes how a mutation is retried if it fails on a deadlock or serialization
+    failure. Each attempt runs in its own transaction, so a mutation is only retried
+    when it is not called inside a transaction already.
+
+    :param max_attempts: The maximum number of attempts, including the first one.
+    :param backoff: The delay in seconds before the first retry. The delay is doubled
+        for each following retry, up to `max_backoff`, and a random delay between
+        zero and this value is used.
+    :param retryable_errors: A tuple of exception classes which are retried. By
+        default, deadlocks and serialization failures are detected from the errors
+        of the database driver.
+    :param idempotent_before_mutate: If False, `before_mutate` is only called on the
+        first attempt, and its result is reused for the retries.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff=0.05,
+        max_backoff=1.0,
+        retryable_errors=None,
+        idempotent_before_mutate=True,
+    ):
+        assert max_attempts >= 1, "A retry policy must allow at least one attempt."
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retryable_errors = retryable_errors
+        self.idempotent_before_mutate = idempotent_before_mutate
+
+    def is_retryable(self, error):
+        if self.retryable_errors is not None:
+            return isinstance(error, self.retryable_errors)
+
+        return is_transient_database_error(error)
+
+    def get_delay(self, retry):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** retry))
+
+    def wrap_resolver(self, mutation, resolver):
+        """
+        Returns a resolver which retries the given resolver according to the
+        policy, and instruments `before_mutate` of the mutation if it should
+        only be called once.
+        """
+        if not self.idempotent_before_mutate:
+            _cache_before_mutate(mutation)
+
+        def retrying_resolver(root, info, **kwargs):
+            using = router.db_for_write(mutation._meta.model)
+            if transaction.get_connection(using).in_atomic_block:
+                # A failed transaction can only be retried as a whole, which is
+                # not ours to do.
+                return resolver(root, info, **kwargs)
+
+            token = _before_mutate_results.set({})
+            try:
+                for retry in range(self.max_attempts):
+                    try:
+                        with transaction.atomic(using=using):
+                            return resolver(root, info, **kwargs)
+                    except Exception as error:
+                        if retry + 1 >= self.max_attempts or not self.is_retryable(
+                            error
+                        ):
+                            raise
+
+                    with _retry_counts_lock:
+                        _retry_counts[mutation] += 1
+                    time.sleep(self.get_delay(retry))
+            finally:
+                _before_mutate_results.reset(token)
+
+        return retrying_resolver
+
+
+def _cache_before_mutate(mutation):
+    before_mutate = mutation.before_mutate.__func__
+
+    @wraps(before_mutate)
+    def cached_before_mutate(cls, root, info, *args, **kwargs):
+        results = _before_mutate_results.get()
+        if results is None:
+            return before_mutate(cls, root, info, *args, **kwargs)
+
+        if "result" not in results:
+            results["result"] = before_mutate(cls, root, info, *args, **kwargs)
+        return results["result"]
+
+    mutation.before_mutate = classmethod(cached_before_mutate)
@@ -4,7 +4,7 @@ import factory
 from django.contrib.auth.models import Permission
 from django.db import models
 
-from graphene_django_cud.tests.models import User, Cat, Dog, Mouse
+from graphene_django_cud.tests.models import User, Cat, Dog, Mouse, Fish
 
 
 class UserFactory(factory.DjangoModelFactory):
@@ -98,3 +98,10 @@ class MouseFactory(factory.DjangoModelFactory):
         model = Mouse
 
     name = "mouse"
+
+
+class FishFactory(factory.DjangoModelFactory):
+    class Meta:
+        model = Fish
+
+    name = "fish"
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0004_mouse_keeper'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mouse',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
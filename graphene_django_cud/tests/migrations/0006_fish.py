@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0005_mouse_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Fish',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.TextField()),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='fish', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -9,6 +9,7 @@ class User(AbstractUser):
 class Mouse(models.Model):
     name = models.TextField()
     keeper = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='mice')
+    version = models.PositiveIntegerField(default=0)
 
 
 class Cat(models.Model):
@@ -46,3 +47,9 @@ class Dog(models.Model):
         blank=True,
         related_name='friends'
     )
+
+
+class Fish(models.Model):
+    name = models.TextField()
+    owner = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='fish')
+    updated_at = models.DateTimeField(auto_now=True, null=True)
@@ -10,7 +10,7 @@ from graphene_django_cud.mutations import (
     DjangoBatchDeleteMutation,
     DjangoBatchCreateMutation,
 )
-from graphene_django_cud.tests.models import User, Cat, Dog, Mouse
+from graphene_django_cud.tests.models import User, Cat, Dog, Mouse, Fish
 
 
 class UserNode(DjangoObjectType):
@@ -37,6 +37,12 @@ class MouseNode(DjangoObjectType):
         interfaces = (Node,)
 
 
+class FishNode(DjangoObjectType):
+    class Meta:
+        model = Fish
+        interfaces = (Node,)
+
+
 class Query(graphene.ObjectType):
     user = Node.Field(UserNode)
     cat = Node.Field(CatNode)
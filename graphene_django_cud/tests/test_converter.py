@@ -1,9 +1,12 @@
+from unittest import mock
+
 import graphene
 from django.db import models
 from django.test import TestCase
 from graphene_django.registry import get_global_registry
 
-from graphene_django_cud.converter import convert_choices_field, convert_django_field_with_choices
+from graphene_django_cud import converter
+from graphene_django_cud.converter import convert_choices_field, convert_django_field_with_choices, get_choices
 
 
 class TestConvertChoicesField(TestCase):
@@ -27,7 +30,48 @@ class TestConvertChoicesField(TestCase):
         self.assertIsInstance(result, graphene.types.Enum)
         self.assertEqual(result.kwargs.get("required"), True)
 
+    def test__fields_with_identical_choices__share_converted_choices(self):
+        currencies = tuple((f"C{i}", f"Currency {i}") for i in range(500))
+
+        class MockWallet(models.Model):
+            currency = models.CharField(max_length=4, choices=currencies)
+            other = models.CharField(max_length=4, choices=currencies[:-1])
+
+        class MockPrice(models.Model):
+            currency = models.CharField(max_length=4, choices=[list(c) for c in currencies])
+
+        price_field = MockPrice._meta.get_field("currency")
+        with mock.patch(
+            "graphene_django_cud.converter.get_choices", wraps=converter.get_choices
+        ) as get_choices_mock:
+            price_enum = convert_choices_field(price_field, price_field.choices)
+            wallet_enum = convert_choices_field(
+                MockWallet._meta.get_field("currency"), currencies
+            )
+            other_enum = convert_choices_field(
+                MockWallet._meta.get_field("other"), currencies[:-1]
+            )
+            same_wallet_enum = convert_choices_field(
+                MockWallet._meta.get_field("currency"), currencies
+            )
+
+        # The names do not depend on the order of conversion
+        self.assertEqual(price_enum._meta.name, "MockPriceCurrencyInput")
+        self.assertEqual(wallet_enum._meta.name, "MockWalletCurrencyInput")
+        self.assertIs(wallet_enum, same_wallet_enum)
+        self.assertIsNot(wallet_enum, other_enum)
+        self.assertEqual(len(wallet_enum._meta.enum.__members__), 500)
+        self.assertEqual(
+            list(wallet_enum._meta.enum.__members__),
+            list(price_enum._meta.enum.__members__),
+        )
+        # Once for the currencies, and once for the other choices
+        self.assertEqual(get_choices_mock.call_count, 2)
+
+    def test__choice_values_converting_to_the_same_name__are_deduplicated(self):
+        names = [name for name, _, _ in get_choices((("a", "a"), ("A", "A"), ("b", "b"), ("B", "B")))]
 
+        self.assertEqual(names, ["A", "A_1", "B", "B_3"])
 
 
 class ConvertDjangoFieldWithChoices(TestCase):
@@ -1,20 +1,42 @@
+from datetime import timedelta
+from unittest import mock
+
 import graphene
 from addict import Dict
-from django.test import TestCase
+from django.db import connection, OperationalError
+from django.db.models import signals
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from graphene import Schema
 from graphql import ResolveInfo
 from graphql_relay import to_global_id
-
-from graphene_django_cud.mutations import DjangoUpdateMutation, DjangoCreateMutation
+from graphql_relay.utils import base64
+
+from graphene_django_cud.mutations import (
+    DjangoUpdateMutation,
+    DjangoCreateMutation,
+    DjangoBatchCreateMutation,
+    DjangoPatchMutation,
+    DjangoBatchPatchMutation,
+    DjangoBatchUpdateMutation,
+    DjangoFilterUpdateMutation,
+    DjangoBatchDeleteMutation,
+    DjangoBatchDeleteByIdsMutation,
+)
 from graphene_django_cud.tests.factories import (
     UserFactory,
     CatFactory,
     UserWithPermissionsFactory,
     DogFactory,
     MouseFactory,
+    FishFactory,
 )
-from graphene_django_cud.tests.models import User, Cat, Dog
-from graphene_django_cud.util import disambiguate_id
+from graphene_django_cud.profiling import SchemaBuildProfiler
+from graphene_django_cud.registry import get_type_meta_registry
+from graphene_django_cud.retry import RetryPolicy, get_retry_count
+from graphene_django_cud.tests.models import User, Cat, Dog, Mouse, Fish
+from graphene_django_cud.util import clear_input_fields_cache, disambiguate_id
 
 
 def mock_info(context=None):
@@ -1426,6 +1448,70 @@ class TestUpdateMutationManyToOneExtras(TestCase):
 
 
 class TestCreateMutationManyToOneExtras(TestCase):
+    def test_many_to_one_extras__auto_type__registers_its_foreign_key_extras(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        foreign_key_extras = {"keeper": {"type": "ID"}}
+
+        class CreateUserMutation(DjangoCreateMutation):
+            class Meta:
+                model = User
+                exclude_fields = ("password",)
+                many_to_one_extras = {
+                    "mice": {
+                        "add": {
+                            "type": "auto",
+                            "type_name": "CreateUserAddKeptMouseInput",
+                            "foreign_key_extras": foreign_key_extras,
+                        }
+                    }
+                }
+
+        class Mutations(graphene.ObjectType):
+            create_user = CreateUserMutation.Field()
+
+        type_meta = get_type_meta_registry().get_meta_for_type(
+            "CreateUserAddKeptMouseInput"
+        )
+        self.assertEqual(type_meta.foreign_key_extras, foreign_key_extras)
+        self.assertEqual(type_meta.auto_context_fields, {})
+
+        user = UserFactory.build()
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation CreateUser(
+                $input: CreateUserInput! 
+            ){
+                createUser(input: $input){
+                    user{
+                        id
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "input": {
+                    "username": user.username,
+                    "firstName": user.first_name,
+                    "lastName": user.last_name,
+                    "email": user.email,
+                    "miceAdd": [{"name": "Jerry"}],
+                }
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+        data = Dict(result.data)
+        user = User.objects.get(pk=disambiguate_id(data.createUser.user.id))
+
+        self.assertEqual([mouse.name for mouse in user.mice.all()], ["Jerry"])
+
     def test_many_to_one_extras__auto_calling_mutation_with_setting_field__does_nothing(
         self,
     ):
@@ -1625,3 +1711,1704 @@ class TestCreateMutationManyToOneExtras(TestCase):
         user = User.objects.get(pk=disambiguate_id(data.createUser.user.id))
 
         self.assertEqual(user.cats.all().count(), 5)
+
+
+class TestBatchCreateMutationBulkCreate(TestCase):
+    def test_use_bulk_create__creates_all_objects_in_input_order(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class BatchCreateCatMutation(DjangoBatchCreateMutation):
+            class Meta:
+                model = Cat
+                use_bulk_create = True
+                bulk_create_batch_size = 2
+
+        class Mutations(graphene.ObjectType):
+            batch_create_cat = BatchCreateCatMutation.Field()
+
+        user = UserFactory.create()
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchCreateCat(
+                $input: [BatchCreateCatInput]! 
+            ){
+                batchCreateCat(input: $input){
+                    cats{
+                        id
+                        name
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "input": [
+                    {"name": f"Cat {i}", "owner": to_global_id("UserNode", user.id)}
+                    for i in range(5)
+                ]
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+        data = Dict(result.data)
+        self.assertEqual(
+            [cat.name for cat in data.batchCreateCat.cats],
+            [f"Cat {i}" for i in range(5)],
+        )
+        self.assertEqual(user.cats.count(), 5)
+        # The returned ids are those of the created rows, also on backends which
+        # cannot return primary keys from bulk inserts.
+        self.assertEqual(
+            [disambiguate_id(cat.id) for cat in data.batchCreateCat.cats],
+            [str(pk) for pk in user.cats.order_by("pk").values_list("pk", flat=True)],
+        )
+
+    def test_use_bulk_create__many_to_many_extras__sets_relations(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class BatchCreateCatMutation(DjangoBatchCreateMutation):
+            class Meta:
+                model = Cat
+                use_bulk_create = True
+                many_to_many_extras = {"targets": {"add": True, "remove": True}}
+
+        class Mutations(graphene.ObjectType):
+            batch_create_cat = BatchCreateCatMutation.Field()
+
+        user = UserFactory.create()
+        mice = MouseFactory.create_batch(3)
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchCreateCat(
+                $input: [BatchCreateCatInput]! 
+            ){
+                batchCreateCat(input: $input){
+                    cats{
+                        id
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "input": [
+                    {
+                        "name": "Cat with targets",
+                        "owner": to_global_id("UserNode", user.id),
+                        "targets": [mice[0].id],
+                        "targetsAdd": [mice[1].id, mice[2].id],
+                        "targetsRemove": [mice[2].id],
+                    },
+                    {
+                        "name": "Cat without targets",
+                        "owner": to_global_id("UserNode", user.id),
+                    },
+                ]
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+
+        cat_with_targets = Cat.objects.get(name="Cat with targets")
+        cat_without_targets = Cat.objects.get(name="Cat without targets")
+        self.assertEqual(
+            set(cat_with_targets.targets.values_list("id", flat=True)),
+            {mice[0].id, mice[1].id},
+        )
+        self.assertEqual(cat_without_targets.targets.count(), 0)
+
+
+class TestPatchMutationUpdateFields(TestCase):
+    def _patch_dog_name(self, PatchDogMutation, dog, user):
+        class Mutations(graphene.ObjectType):
+            patch_dog = PatchDogMutation.Field()
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation PatchDog(
+                $id: ID!,
+                $input: PatchDogInput! 
+            ){
+                patchDog(id: $id, input: $input){
+                    dog{
+                        id
+                    }
+                }
+            }
+        """
+
+        with CaptureQueriesContext(connection) as context:
+            result = schema.execute(
+                mutation,
+                variables={
+                    "id": to_global_id("DogNode", dog.id),
+                    "input": {"name": "New name"},
+                },
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+
+    def test_use_update_fields__default__only_saves_patched_fields(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class PatchDogMutation(DjangoPatchMutation):
+            class Meta:
+                model = Dog
+                use_fast_update = False
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+        updates = self._patch_dog_name(PatchDogMutation, dog, user)
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"name"', updates[0])
+        self.assertNotIn('"tag"', updates[0])
+
+        dog.refresh_from_db()
+        self.assertEqual(dog.name, "New name")
+
+    def test_use_update_fields__pre_save_receiver__saves_all_fields(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class PatchDogMutation(DjangoPatchMutation):
+            class Meta:
+                model = Dog
+
+        def receiver(sender, instance, **kwargs):
+            instance.tag = "Dog-2"
+
+        signals.pre_save.connect(receiver, sender=Dog)
+        self.addCleanup(signals.pre_save.disconnect, receiver, sender=Dog)
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+        updates = self._patch_dog_name(PatchDogMutation, dog, user)
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"tag"', updates[0])
+
+        dog.refresh_from_db()
+        self.assertEqual(dog.name, "New name")
+        self.assertEqual(dog.tag, "Dog-2")
+
+    def test_use_update_fields__false__saves_all_fields(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class PatchDogMutation(DjangoPatchMutation):
+            class Meta:
+                model = Dog
+                use_update_fields = False
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+        updates = self._patch_dog_name(PatchDogMutation, dog, user)
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"tag"', updates[0])
+
+
+class TestPatchMutationFastUpdate(TestCase):
+    def test_fast_update__no_hooks_and_return_field_not_selected__single_query(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class PatchDogMutation(DjangoPatchMutation):
+            class Meta:
+                model = Dog
+
+        class Mutations(graphene.ObjectType):
+            patch_dog = PatchDogMutation.Field()
+
+        self.assertIsNotNone(PatchDogMutation._meta.fast_update_field_names)
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation PatchDog(
+                $id: ID!,
+                $input: PatchDogInput! 
+            ){
+                patchDog(id: $id, input: $input){
+                    __typename
+                }
+            }
+        """
+
+        with self.assertNumQueries(1):
+            result = schema.execute(
+                mutation,
+                variables={
+                    "id": to_global_id("DogNode", dog.id),
+                    "input": {
+                        "name": "New name",
+                        "owner": to_global_id("UserNode", user.id),
+                    },
+                },
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+
+        dog.refresh_from_db()
+        self.assertEqual(dog.name, "New name")
+        self.assertEqual(dog.owner, user)
+
+    def test_fast_update__save_signal_receivers__sends_signals(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class PatchDogMutation(DjangoPatchMutation):
+            class Meta:
+                model = Dog
+
+        class Mutations(graphene.ObjectType):
+            patch_dog = PatchDogMutation.Field()
+
+        # The receivers are connected after the mutation qualified for the fast path
+        self.assertIsNotNone(PatchDogMutation._meta.fast_update_field_names)
+        saved_names = []
+
+        def receiver(sender, instance, **kwargs):
+            saved_names.append(instance.name)
+
+        for signal in (signals.pre_save, signals.post_save):
+            signal.connect(receiver, sender=Dog)
+            self.addCleanup(signal.disconnect, receiver, sender=Dog)
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+        saved_names.clear()
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation PatchDog(
+                $id: ID!,
+                $input: PatchDogInput! 
+            ){
+                patchDog(id: $id, input: $input){
+                    __typename
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "id": to_global_id("DogNode", dog.id),
+                "input": {"name": "New name"},
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual(saved_names, ["New name", "New name"])
+
+    def test_fast_update__return_field_selected__reads_object(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class PatchDogMutation(DjangoPatchMutation):
+            class Meta:
+                model = Dog
+
+        class Mutations(graphene.ObjectType):
+            patch_dog = PatchDogMutation.Field()
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation PatchDog(
+                $id: ID!,
+                $input: PatchDogInput! 
+            ){
+                patchDog(id: $id, input: $input){
+                    dog{
+                        name
+                    }
+                }
+            }
+        """
+
+        with self.assertNumQueries(2):
+            result = schema.execute(
+                mutation,
+                variables={
+                    "id": to_global_id("DogNode", dog.id),
+                    "input": {"name": "New name"},
+                },
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data["patchDog"]["dog"]["name"], "New name")
+
+    def test_fast_update__handle_field_defined__does_not_qualify(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class PatchDogMutation(DjangoPatchMutation):
+            class Meta:
+                model = Dog
+
+            @classmethod
+            def handle_name(cls, value, *args, **kwargs):
+                return value
+
+        self.assertIsNone(PatchDogMutation._meta.fast_update_field_names)
+
+
+class TestBatchPatchMutation(TestCase):
+    def test_batch_patch__multiple_objects__updates_and_returns_in_input_order(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class BatchPatchDogMutation(DjangoBatchPatchMutation):
+            class Meta:
+                model = Dog
+
+        class Mutations(graphene.ObjectType):
+            batch_patch_dog = BatchPatchDogMutation.Field()
+
+        user = UserFactory.create()
+        dogs = DogFactory.create_batch(3)
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchPatchDog(
+                $input: [BatchPatchDogInput]! 
+            ){
+                batchPatchDog(input: $input){
+                    dogs{
+                        id
+                        name
+                        tag
+                    }
+                }
+            }
+        """
+
+        # One query to fetch the dogs, one bulk update per set of fields, and a
+        # savepoint and its release for the transaction.
+        with self.assertNumQueries(5):
+            result = schema.execute(
+                mutation,
+                variables={
+                    "input": [
+                        {"id": to_global_id("DogNode", dogs[2].id), "name": "Third"},
+                        {"id": to_global_id("DogNode", dogs[0].id), "name": "First"},
+                        {"id": dogs[1].id, "tag": "Dog-2"},
+                    ]
+                },
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+
+        data = Dict(result.data)
+        self.assertEqual(
+            [dog.name for dog in data.batchPatchDog.dogs], ["Third", "First", "dog"]
+        )
+        self.assertEqual(
+            [dog.tag for dog in data.batchPatchDog.dogs], ["tag", "tag", "Dog-2"]
+        )
+
+        for dog in dogs:
+            dog.refresh_from_db()
+        self.assertEqual(
+            [(dog.name, dog.tag) for dog in dogs],
+            [("First", "tag"), ("dog", "Dog-2"), ("Third", "tag")],
+        )
+
+    def test_batch_patch__unknown_id__returns_error_and_updates_nothing(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class BatchPatchDogMutation(DjangoBatchPatchMutation):
+            class Meta:
+                model = Dog
+
+        class Mutations(graphene.ObjectType):
+            batch_patch_dog = BatchPatchDogMutation.Field()
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchPatchDog(
+                $input: [BatchPatchDogInput]! 
+            ){
+                batchPatchDog(input: $input){
+                    dogs{
+                        id
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "input": [
+                    {"id": dog.id, "name": "New name"},
+                    {"id": dog.id + 1000, "name": "New name"},
+                ]
+            },
+            context=Dict(user=user),
+        )
+        self.assertEqual(len(result.errors), 1)
+
+        dog.refresh_from_db()
+        self.assertEqual(dog.name, "dog")
+
+    def test_batch_patch__objects__are_loaded_inside_the_transaction(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class BatchPatchDogMutation(DjangoBatchPatchMutation):
+            class Meta:
+                model = Dog
+
+        class Mutations(graphene.ObjectType):
+            batch_patch_dog = BatchPatchDogMutation.Field()
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchPatchDog(
+                $input: [BatchPatchDogInput]! 
+            ){
+                batchPatchDog(input: $input){
+                    dogs{
+                        id
+                    }
+                }
+            }
+        """
+
+        with CaptureQueriesContext(connection) as context, mock.patch(
+            "django.db.models.QuerySet.select_for_update",
+            autospec=True,
+            side_effect=lambda queryset, **kwargs: queryset,
+        ) as select_for_update:
+            result = schema.execute(
+                mutation,
+                variables={"input": [{"id": dog.id, "name": "New name"}]},
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+        select_for_update.assert_called_once()
+
+        queries = [query["sql"] for query in context.captured_queries]
+        self.assertTrue(queries[0].startswith("SAVEPOINT"))
+        self.assertTrue(queries[1].startswith("SELECT"))
+
+    def test_batch_patch__duplicate_ids__returns_error_and_updates_nothing(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class BatchPatchDogMutation(DjangoBatchPatchMutation):
+            class Meta:
+                model = Dog
+
+        class Mutations(graphene.ObjectType):
+            batch_patch_dog = BatchPatchDogMutation.Field()
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchPatchDog(
+                $input: [BatchPatchDogInput]! 
+            ){
+                batchPatchDog(input: $input){
+                    dogs{
+                        id
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "input": [
+                    {"id": to_global_id("DogNode", dog.id), "name": "First"},
+                    {"id": dog.id, "name": "Second"},
+                ]
+            },
+            context=Dict(user=user),
+        )
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn("more than once", str(result.errors[0]))
+
+        dog.refresh_from_db()
+        self.assertEqual(dog.name, "dog")
+
+    def test_batch_patch__auto_now_field__is_refreshed(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        class BatchPatchFishMutation(DjangoBatchPatchMutation):
+            class Meta:
+                model = Fish
+
+        class Mutations(graphene.ObjectType):
+            batch_patch_fish = BatchPatchFishMutation.Field()
+
+        user = UserFactory.create()
+        fish = FishFactory.create_batch(2)
+        long_ago = timezone.now() - timedelta(days=1)
+        Fish.objects.update(updated_at=long_ago)
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchPatchFish(
+                $input: [BatchPatchFishInput]! 
+            ){
+                batchPatchFish(input: $input){
+                    fishs{
+                        id
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "input": [
+                    {"id": to_global_id("FishNode", fish[0].id), "name": "Nemo"},
+                    {"id": to_global_id("FishNode", fish[1].id)},
+                ]
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+
+        for f in fish:
+            f.refresh_from_db()
+            self.assertGreater(f.updated_at, long_ago)
+        self.assertEqual(fish[0].name, "Nemo")
+
+
+class TestBatchUpdateMutation(TestCase):
+    def test_batch_update__multiple_objects__updates_objects(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class BatchUpdateMouseMutation(DjangoBatchUpdateMutation):
+            class Meta:
+                model = Mouse
+
+        class Mutations(graphene.ObjectType):
+            batch_update_mouse = BatchUpdateMouseMutation.Field()
+
+        user = UserFactory.create()
+        mice = MouseFactory.create_batch(2)
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchUpdateMouse(
+                $input: [BatchUpdateMouseInput]! 
+            ){
+                batchUpdateMouse(input: $input){
+                    mouses{
+                        id
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "input": [
+                    {"id": mice[0].id, "name": "Mickey", "keeper": user.id},
+                    {"id": mice[1].id, "name": "Minnie"},
+                ]
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+
+        for mouse in mice:
+            mouse.refresh_from_db()
+        self.assertEqual(
+            [(mouse.name, mouse.keeper) for mouse in mice],
+            [("Mickey", user), ("Minnie", None)],
+        )
+
+
+class TestFilterUpdateMutation(TestCase):
+    def test_filter_update__matching_objects__updates_in_single_query(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class FilterUpdateDogMutation(DjangoFilterUpdateMutation):
+            class Meta:
+                model = Dog
+                filter_fields = ("name", "tag")
+
+        class Mutations(graphene.ObjectType):
+            filter_update_dog = FilterUpdateDogMutation.Field()
+
+        user = UserFactory.create()
+        dog_1 = DogFactory.create(name="Rex", tag="Dog-1")
+        dog_2 = DogFactory.create(name="Rex", tag="Dog-1")
+        dog_3 = DogFactory.create(name="Rex", tag="Dog-2")
+        other_dog = DogFactory.create(name="Fido", tag="Dog-1")
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation FilterUpdateDog(
+                $filter: FilterUpdateDogFilterInput!,
+                $input: FilterUpdateDogInput!
+            ){
+                filterUpdateDog(filter: $filter, input: $input){
+                    updatedCount
+                }
+            }
+        """
+
+        # The ids are not requested, so only the UPDATE itself is executed,
+        # wrapped in a savepoint and its release.
+        with self.assertNumQueries(3):
+            result = schema.execute(
+                mutation,
+                variables={
+                    "filter": {"name": "Rex", "tag": "Dog-1"},
+                    "input": {"breed": "LABRADOR", "owner": to_global_id("UserNode", user.id)},
+                },
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data["filterUpdateDog"]["updatedCount"], 2)
+
+        for dog in (dog_1, dog_2, dog_3, other_dog):
+            dog.refresh_from_db()
+        self.assertEqual(dog_1.breed, "LABRADOR")
+        self.assertEqual(dog_1.owner_id, user.id)
+        self.assertEqual(dog_2.breed, "LABRADOR")
+        self.assertEqual(dog_3.breed, "HUSKY")
+        self.assertEqual(other_dog.breed, "HUSKY")
+
+    def test_filter_update__ids_selected__returns_updated_ids(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        class FilterUpdateDogMutation(DjangoFilterUpdateMutation):
+            class Meta:
+                model = Dog
+                filter_fields = ("name",)
+
+        class Mutations(graphene.ObjectType):
+            filter_update_dog = FilterUpdateDogMutation.Field()
+
+        user = UserFactory.create()
+        dogs = DogFactory.create_batch(2, name="Rex")
+        DogFactory.create(name="Fido")
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation FilterUpdateDog(
+                $filter: FilterUpdateDogFilterInput!,
+                $input: FilterUpdateDogInput!
+            ){
+                filterUpdateDog(filter: $filter, input: $input){
+                    updatedCount
+                    updatedIds
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={"filter": {"name": "Rex"}, "input": {"name": "Max"}},
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+
+        data = Dict(result.data)
+        self.assertEqual(data.filterUpdateDog.updatedCount, 2)
+        self.assertEqual(
+            sorted(data.filterUpdateDog.updatedIds),
+            sorted(to_global_id("DogNode", dog.id) for dog in dogs),
+        )
+        self.assertEqual(Dog.objects.filter(name="Max").count(), 2)
+        self.assertEqual(Dog.objects.filter(name="Fido").count(), 1)
+
+
+class TestTypedGlobalIds(TestCase):
+    def test_create__foreign_key_id_of_other_type__is_rejected_before_queries(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode, CatNode
+
+        class CreateDogMutation(DjangoCreateMutation):
+            class Meta:
+                model = Dog
+
+        class Mutations(graphene.ObjectType):
+            create_dog = CreateDogMutation.Field()
+
+        user = UserFactory.create()
+        cat = CatFactory.create()
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation CreateDog(
+                $input: CreateDogInput! 
+            ){
+                createDog(input: $input){
+                    dog{
+                        id
+                    }
+                }
+            }
+        """
+
+        with CaptureQueriesContext(connection) as queries:
+            result = schema.execute(
+                mutation,
+                variables={
+                    "input": {
+                        "name": "Sparky",
+                        "breed": "HUSKY",
+                        "tag": "1234",
+                        "owner": to_global_id("CatNode", cat.id),
+                    }
+                },
+                context=Dict(user=user),
+            )
+        self.assertIsNotNone(result.errors)
+        self.assertIn("Expected an id of type UserNode", str(result.errors[0]))
+        self.assertFalse(
+            any(
+                query["sql"].startswith(("SELECT", "INSERT"))
+                for query in queries.captured_queries
+            )
+        )
+        self.assertFalse(Dog.objects.exists())
+
+
+class TestLazyInputTypes(TestCase):
+    def test_lazy_input_type__is_created_when_schema_is_built(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode, CatNode
+
+        with mock.patch(
+            "graphene_django_cud.mutations.get_input_fields_for_model"
+        ) as get_input_fields_for_model:
+
+            class CreateLazyUserMutation(DjangoCreateMutation):
+                class Meta:
+                    model = User
+                    type_name = "CreateLazyUserInput"
+                    only_fields = ("username", "first_name", "last_name", "email")
+                    lazy_input_type = True
+
+            class CreateLazyCatMutation(DjangoCreateMutation):
+                class Meta:
+                    model = Cat
+                    type_name = "CreateLazyCatInput"
+                    foreign_key_extras = {"owner": {"type": "CreateLazyUserInput"}}
+                    lazy_input_type = True
+
+        get_input_fields_for_model.assert_not_called()
+
+        class Mutations(graphene.ObjectType):
+            create_user = CreateLazyUserMutation.Field()
+            create_cat = CreateLazyCatMutation.Field()
+
+        user = UserFactory.create()
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation CreateCat(
+                $input: CreateLazyCatInput! 
+            ){
+                createCat(input: $input){
+                    cat{
+                        name
+                        owner{
+                            username
+                        }
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "input": {
+                    "name": "Garfield",
+                    "owner": {
+                        "username": "jon",
+                        "firstName": "Jon",
+                        "lastName": "Arbuckle",
+                        "email": "jon@example.com",
+                    },
+                }
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data["createCat"]["cat"]["owner"]["username"], "jon")
+        self.assertEqual(
+            CreateLazyCatMutation._meta.InputType().__name__, "CreateLazyCatInput"
+        )
+
+
+class TestSchemaBuildProfiler(TestCase):
+    def test_profiler__records_class_builds_and_lazy_input_types(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode, DogNode
+
+        clear_input_fields_cache()
+        with SchemaBuildProfiler() as profiler:
+
+            class CreateProfiledUserMutation(DjangoCreateMutation):
+                class Meta:
+                    model = User
+                    type_name = "CreateProfiledUserInput"
+                    many_to_one_extras = {"dogs": {"add": {"type": "auto"}}}
+
+            class PatchProfiledDogMutation(DjangoPatchMutation):
+                class Meta:
+                    model = Dog
+                    type_name = "PatchProfiledDogInput"
+                    lazy_input_type = True
+
+            self.assertEqual(
+                profiler.classes["PatchProfiledDogMutation"]["fields_converted"], 0
+            )
+
+            class Mutations(graphene.ObjectType):
+                create_user = CreateProfiledUserMutation.Field()
+                patch_dog = PatchProfiledDogMutation.Field()
+
+            Schema(mutation=Mutations)
+
+        user_stats = profiler.classes["CreateProfiledUserMutation"]
+        self.assertGreater(user_stats["time"], 0)
+        self.assertGreater(user_stats["fields_converted"], 0)
+        self.assertEqual(user_stats["nested_input_types"], 1)
+        self.assertEqual(user_stats["steps"]["get_input_fields_for_model"]["calls"], 1)
+
+        dog_stats = profiler.classes["PatchProfiledDogMutation"]
+        self.assertGreater(dog_stats["fields_converted"], 0)
+        self.assertIn("get_all_optional_input_fields_for_model", dog_stats["steps"])
+
+        report = profiler.get_report()
+        self.assertEqual(report["nested_input_types"], 1)
+        self.assertIn("CreateProfiledUserMutation", profiler.format_report())
+
+
+class TestMutationInstrumentation(TestCase):
+    def test_instrumentation__create_with_many_to_many__reports_phases(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        reports = []
+
+        def sink(info, mutation, report):
+            reports.append(report)
+
+        class CreateDogMutation(DjangoCreateMutation):
+            class Meta:
+                model = Dog
+                instrumentation = sink
+
+            @classmethod
+            def handle_name(cls, value, name, info):
+                return value.upper()
+
+        class Mutations(graphene.ObjectType):
+            create_dog = CreateDogMutation.Field()
+
+        user = UserFactory.create()
+        cat = CatFactory.create()
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation CreateDog(
+                $input: CreateDogInput! 
+            ){
+                createDog(input: $input){
+                    dog{
+                        id
+                        name
+                    }
+                }
+            }
+        """
+
+        with CaptureQueriesContext(connection) as queries:
+            result = schema.execute(
+                mutation,
+                variables={
+                    "input": {
+                        "name": "Sparky",
+                        "breed": "HUSKY",
+                        "tag": "1234",
+                        "owner": to_global_id("UserNode", user.id),
+                        "enemies": [to_global_id("CatNode", cat.id)],
+                    }
+                },
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data["createDog"]["dog"]["name"], "SPARKY")
+
+        self.assertEqual(len(reports), 1)
+        report = reports[0]
+        self.assertEqual(report["mutation"], "CreateDogMutation")
+        self.assertEqual(report["queries"], len(queries))
+        for phase in ("mutate", "validate", "handlers", "create", "many_to_many"):
+            self.assertIn(phase, report["phases"])
+        self.assertGreater(report["phases"]["many_to_many"]["queries"], 0)
+        self.assertAlmostEqual(
+            report["time"],
+            sum(stats["time"] for stats in report["phases"].values()),
+        )
+
+    def test_instrumentation__disabled__leaves_mutation_untouched(self):
+        class CreateDogMutation(DjangoCreateMutation):
+            class Meta:
+                model = Dog
+
+        self.assertEqual(
+            CreateDogMutation._meta.resolver, CreateDogMutation.mutate
+        )
+        self.assertIs(
+            CreateDogMutation.validate.__func__,
+            DjangoCreateMutation.validate.__func__,
+        )
+
+    def test_instrumentation__patch_mutation__keeps_fast_update(self):
+        reports = []
+
+        class PatchDogMutation(DjangoPatchMutation):
+            class Meta:
+                model = Dog
+                instrumentation = lambda info, mutation, report: reports.append(report)
+
+        class Mutations(graphene.ObjectType):
+            patch_dog = PatchDogMutation.Field()
+
+        self.assertIsNotNone(PatchDogMutation._meta.fast_update_field_names)
+
+        user = UserFactory.create()
+        dog = DogFactory.create()
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation PatchDog(
+                $id: ID!,
+                $input: PatchDogInput! 
+            ){
+                patchDog(id: $id, input: $input){
+                    __typename
+                }
+            }
+        """
+
+        with self.assertNumQueries(1):
+            result = schema.execute(
+                mutation,
+                variables={
+                    "id": to_global_id("DogNode", dog.id),
+                    "input": {"name": "New name"},
+                },
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+        self.assertEqual(reports[0]["phases"]["update"]["queries"], 1)
+
+
+class TestUpdateMutationConcurrency(TestCase):
+    def test_version_field__patch_with_current_version__bumps_version_in_one_query(self):
+        class PatchMouseMutation(DjangoPatchMutation):
+            class Meta:
+                model = Mouse
+                version_field = "version"
+
+        class Mutations(graphene.ObjectType):
+            patch_mouse = PatchMouseMutation.Field()
+
+        user = UserFactory.create()
+        mouse = MouseFactory.create(version=3)
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation PatchMouse(
+                $id: ID!,
+                $version: Int!,
+                $input: PatchMouseInput! 
+            ){
+                patchMouse(id: $id, version: $version, input: $input){
+                    __typename
+                }
+            }
+        """
+
+        with self.assertNumQueries(1):
+            result = schema.execute(
+                mutation,
+                variables={
+                    "id": to_global_id("MouseNode", mouse.id),
+                    "version": 3,
+                    "input": {"name": "Jerry"},
+                },
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+
+        mouse.refresh_from_db()
+        self.assertEqual(mouse.name, "Jerry")
+        self.assertEqual(mouse.version, 4)
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "id": to_global_id("MouseNode", mouse.id),
+                "version": 3,
+                "input": {"name": "Tom"},
+            },
+            context=Dict(user=user),
+        )
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn("has been modified", result.errors[0].message)
+
+        mouse.refresh_from_db()
+        self.assertEqual(mouse.name, "Jerry")
+        self.assertEqual(mouse.version, 4)
+
+    def test_version_field__update_with_stale_version__reports_conflict(self):
+        class UpdateMouseMutation(DjangoUpdateMutation):
+            class Meta:
+                model = Mouse
+                version_field = "version"
+                lock_mode = "select_for_update"
+
+        class Mutations(graphene.ObjectType):
+            update_mouse = UpdateMouseMutation.Field()
+
+        self.assertNotIn(
+            "version", UpdateMouseMutation._meta.InputType._meta.fields
+        )
+
+        user = UserFactory.create()
+        mouse = MouseFactory.create(version=1)
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation UpdateMouse(
+                $id: ID!,
+                $version: Int!,
+                $input: UpdateMouseInput! 
+            ){
+                updateMouse(id: $id, version: $version, input: $input){
+                    mouse{
+                        name
+                        version
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "id": to_global_id("MouseNode", mouse.id),
+                "version": 0,
+                "input": {"name": "Tom"},
+            },
+            context=Dict(user=user),
+        )
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn("has been modified", result.errors[0].message)
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "id": to_global_id("MouseNode", mouse.id),
+                "version": 1,
+                "input": {"name": "Tom"},
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual(
+            result.data["updateMouse"]["mouse"], {"name": "Tom", "version": 2}
+        )
+
+    def test_lock_mode__skip_locked__reads_object_instead_of_fast_update(self):
+        class PatchMouseMutation(DjangoPatchMutation):
+            class Meta:
+                model = Mouse
+                lock_mode = "skip_locked"
+
+        class Mutations(graphene.ObjectType):
+            patch_mouse = PatchMouseMutation.Field()
+
+        self.assertIsNone(PatchMouseMutation._meta.fast_update_field_names)
+
+        user = UserFactory.create()
+        mouse = MouseFactory.create()
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation PatchMouse(
+                $id: ID!,
+                $input: PatchMouseInput! 
+            ){
+                patchMouse(id: $id, input: $input){
+                    mouse{
+                        name
+                    }
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "id": to_global_id("MouseNode", mouse.id),
+                "input": {"name": "Jerry"},
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data["patchMouse"]["mouse"]["name"], "Jerry")
+
+    def test_lock_mode__unknown_mode__raises_on_class_creation(self):
+        with self.assertRaises(AssertionError):
+
+            class PatchMouseMutation(DjangoPatchMutation):
+                class Meta:
+                    model = Mouse
+                    lock_mode = "exclusive"
+
+
+class TestMutationRetryPolicy(TransactionTestCase):
+    mutation = """
+        mutation CreateMouse(
+            $input: CreateMouseInput! 
+        ){
+            createMouse(input: $input){
+                mouse{
+                    name
+                }
+            }
+        }
+    """
+
+    def test_retry_policy__transient_error__retries_in_new_transaction(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        calls = Dict(before_mutate=0, before_save=0)
+
+        class CreateMouseMutation(DjangoCreateMutation):
+            class Meta:
+                model = Mouse
+                retry_policy = RetryPolicy(
+                    backoff=0,
+                    retryable_errors=(OperationalError,),
+                    idempotent_before_mutate=False,
+                )
+
+            @classmethod
+            def before_mutate(cls, root, info, input):
+                calls.before_mutate += 1
+
+            @classmethod
+            def before_save(cls, root, info, obj):
+                calls.before_save += 1
+                if calls.before_save == 1:
+                    raise OperationalError("deadlock detected")
+
+        class Mutations(graphene.ObjectType):
+            create_mouse = CreateMouseMutation.Field()
+
+        user = UserFactory.create()
+        schema = Schema(mutation=Mutations)
+        result = schema.execute(
+            self.mutation,
+            variables={"input": {"name": "Jerry"}},
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data["createMouse"]["mouse"]["name"], "Jerry")
+
+        self.assertEqual(calls.before_save, 2)
+        self.assertEqual(calls.before_mutate, 1)
+        self.assertEqual(get_retry_count(CreateMouseMutation), 1)
+        # The object of the failed attempt was rolled back
+        self.assertEqual(Mouse.objects.filter(name="Jerry").count(), 1)
+
+    def test_retry_policy__attempts_exhausted__returns_error(self):
+        # This registers the UserNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode
+
+        calls = Dict(before_save=0)
+
+        class CreateMouseMutation(DjangoCreateMutation):
+            class Meta:
+                model = Mouse
+                retry_policy = RetryPolicy(
+                    max_attempts=2, backoff=0, retryable_errors=(OperationalError,)
+                )
+
+            @classmethod
+            def before_save(cls, root, info, obj):
+                calls.before_save += 1
+                raise OperationalError("deadlock detected")
+
+        class Mutations(graphene.ObjectType):
+            create_mouse = CreateMouseMutation.Field()
+
+        user = UserFactory.create()
+        schema = Schema(mutation=Mutations)
+        result = schema.execute(
+            self.mutation,
+            variables={"input": {"name": "Jerry"}},
+            context=Dict(user=user),
+        )
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(calls.before_save, 2)
+        self.assertFalse(Mouse.objects.exists())
+
+    def test_retry_policy__default_errors__only_retries_deadlocks(self):
+        policy = RetryPolicy()
+
+        class DriverError(Exception):
+            pgcode = "40P01"
+
+        deadlock = OperationalError("deadlock detected")
+        deadlock.__cause__ = DriverError()
+
+        self.assertTrue(policy.is_retryable(deadlock))
+        self.assertFalse(policy.is_retryable(OperationalError("no such table")))
+        self.assertFalse(policy.is_retryable(ValueError("deadlock detected")))
+
+
+class TestBatchDeleteMutation(TestCase):
+    def test_fast_delete__ids_selected__deletes_with_single_query(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        class BatchDeleteFishMutation(DjangoBatchDeleteMutation):
+            class Meta:
+                model = Fish
+                filter_fields = ("name",)
+                use_fast_delete = True
+
+        class Mutations(graphene.ObjectType):
+            batch_delete_fish = BatchDeleteFishMutation.Field()
+
+        user = UserFactory.create()
+        fish = FishFactory.create_batch(2, name="Nemo")
+        other_fish = FishFactory.create(name="Dory")
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchDeleteFish(
+                $input: BatchDeleteFishInput! 
+            ){
+                batchDeleteFish(input: $input){
+                    deletionCount
+                    deletedIds
+                }
+            }
+        """
+
+        with self.assertNumQueries(1):
+            result = schema.execute(
+                mutation,
+                variables={"input": {"name": "Nemo"}},
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+
+        data = Dict(result.data)
+        self.assertEqual(data.batchDeleteFish.deletionCount, 2)
+        self.assertEqual(
+            sorted(data.batchDeleteFish.deletedIds),
+            sorted(to_global_id("FishNode", f.id) for f in fish),
+        )
+        self.assertEqual(list(Fish.objects.all()), [other_fish])
+
+    def test_batch_delete__ids_not_selected__does_not_select_ids(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        class BatchDeleteFishMutation(DjangoBatchDeleteMutation):
+            class Meta:
+                model = Fish
+                filter_fields = ("name",)
+
+        class Mutations(graphene.ObjectType):
+            batch_delete_fish = BatchDeleteFishMutation.Field()
+
+        user = UserFactory.create()
+        FishFactory.create_batch(2, name="Nemo")
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchDeleteFish(
+                $input: BatchDeleteFishInput! 
+            ){
+                batchDeleteFish(input: $input){
+                    deletionCount
+                }
+            }
+        """
+
+        with CaptureQueriesContext(connection) as queries:
+            result = schema.execute(
+                mutation,
+                variables={"input": {"name": "Nemo"}},
+                context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data["batchDeleteFish"]["deletionCount"], 2)
+        self.assertFalse(
+            any(query["sql"].startswith("SELECT") for query in queries.captured_queries)
+        )
+
+    def test_fast_delete__model_with_cascades__falls_back_to_collector(self):
+        # This registers the MouseNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import MouseNode
+
+        class BatchDeleteMouseMutation(DjangoBatchDeleteMutation):
+            class Meta:
+                model = Mouse
+                filter_fields = ("name",)
+                use_fast_delete = True
+
+        class Mutations(graphene.ObjectType):
+            batch_delete_mouse = BatchDeleteMouseMutation.Field()
+
+        user = UserFactory.create()
+        mouse = MouseFactory.create(name="Jerry")
+        cat = CatFactory.create()
+        cat.targets.add(mouse)
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchDeleteMouse(
+                $input: BatchDeleteMouseInput! 
+            ){
+                batchDeleteMouse(input: $input){
+                    deletedIds
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation, variables={"input": {"name": "Jerry"}}, context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+        self.assertEqual(
+            result.data["batchDeleteMouse"]["deletedIds"],
+            [to_global_id("MouseNode", mouse.id)],
+        )
+        self.assertFalse(Mouse.objects.exists())
+        self.assertEqual(cat.targets.count(), 0)
+
+    def test_chunked_delete__row_cap_reached__returns_cursor_to_resume(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        class BatchDeleteFishMutation(DjangoBatchDeleteMutation):
+            class Meta:
+                model = Fish
+                filter_fields = ("name",)
+                chunk_size = 2
+                max_rows_per_request = 3
+
+        class Mutations(graphene.ObjectType):
+            batch_delete_fish = BatchDeleteFishMutation.Field()
+
+        user = UserFactory.create()
+        fish = FishFactory.create_batch(5, name="Nemo")
+        other_fish = FishFactory.create(name="Dory")
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchDeleteFish(
+                $input: BatchDeleteFishInput!,
+                $after: String
+            ){
+                batchDeleteFish(input: $input, after: $after){
+                    deletionCount
+                    deletedIds
+                    cursor
+                }
+            }
+        """
+
+        result = schema.execute(
+            mutation, variables={"input": {"name": "Nemo"}}, context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+
+        data = Dict(result.data)
+        self.assertEqual(data.batchDeleteFish.deletionCount, 3)
+        self.assertEqual(
+            data.batchDeleteFish.deletedIds,
+            [to_global_id("FishNode", f.id) for f in fish[:3]],
+        )
+        self.assertIsNotNone(data.batchDeleteFish.cursor)
+        self.assertEqual(Fish.objects.filter(name="Nemo").count(), 2)
+
+        result = schema.execute(
+            mutation,
+            variables={
+                "input": {"name": "Nemo"},
+                "after": data.batchDeleteFish.cursor,
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+
+        data = Dict(result.data)
+        self.assertEqual(data.batchDeleteFish.deletionCount, 2)
+        self.assertIsNone(data.batchDeleteFish.cursor)
+        self.assertEqual(list(Fish.objects.all()), [other_fish])
+
+    def test_chunked_delete__invalid_cursor__returns_error(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        class BatchDeleteFishMutation(DjangoBatchDeleteMutation):
+            class Meta:
+                model = Fish
+                filter_fields = ("name",)
+                chunk_size = 2
+
+        class Mutations(graphene.ObjectType):
+            batch_delete_fish = BatchDeleteFishMutation.Field()
+
+        user = UserFactory.create()
+        FishFactory.create_batch(3, name="Nemo")
+
+        schema = Schema(mutation=Mutations)
+        mutation = """
+            mutation BatchDeleteFish(
+                $input: BatchDeleteFishInput!,
+                $after: String
+            ){
+                batchDeleteFish(input: $input, after: $after){
+                    deletionCount
+                    cursor
+                }
+            }
+        """
+
+        # Neither valid base64, nor the base64 of a primary key
+        for cursor in ("not base64!", base64("not-a-number")):
+            result = schema.execute(
+                mutation,
+                variables={"input": {"name": "Nemo"}, "after": cursor},
+                context=Dict(user=user),
+            )
+            self.assertIsNotNone(result.errors)
+            self.assertIn("Invalid cursor", str(result.errors[0]))
+
+        self.assertEqual(Fish.objects.filter(name="Nemo").count(), 3)
+
+    def test_chunked_delete__row_cap_below_one__is_rejected(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        with self.assertRaises(AssertionError):
+
+            class BatchDeleteFishMutation(DjangoBatchDeleteMutation):
+                class Meta:
+                    model = Fish
+                    filter_fields = ("name",)
+                    chunk_size = 2
+                    max_rows_per_request = 0
+
+
+class TestBatchDeleteByIdsMutation(TestCase):
+    mutation = """
+        mutation BatchDeleteFishByIds(
+            $ids: [ID!]!
+        ){
+            batchDeleteFishByIds(ids: $ids){
+                deletionCount
+                deletedIds
+                found
+            }
+        }
+    """
+
+    def test_mutate__existing_and_missing_ids__returns_found_in_input_order(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        class BatchDeleteFishByIdsMutation(DjangoBatchDeleteByIdsMutation):
+            class Meta:
+                model = Fish
+
+        class Mutations(graphene.ObjectType):
+            batch_delete_fish_by_ids = BatchDeleteFishByIdsMutation.Field()
+
+        user = UserFactory.create()
+        first, second, other = FishFactory.create_batch(3)
+
+        schema = Schema(mutation=Mutations)
+        ids = [
+            to_global_id("FishNode", second.id),
+            to_global_id("FishNode", 9999),
+            to_global_id("FishNode", first.id),
+        ]
+        result = schema.execute(
+            self.mutation, variables={"ids": ids}, context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+
+        data = Dict(result.data)
+        self.assertEqual(data.batchDeleteFishByIds.deletionCount, 2)
+        self.assertEqual(data.batchDeleteFishByIds.found, [True, False, True])
+        self.assertEqual(data.batchDeleteFishByIds.deletedIds, [ids[0], ids[2]])
+        self.assertEqual(list(Fish.objects.all()), [other])
+
+    def test_mutate__malformed_id__is_reported_as_not_found(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        class BatchDeleteFishByIdsMutation(DjangoBatchDeleteByIdsMutation):
+            class Meta:
+                model = Fish
+
+        class Mutations(graphene.ObjectType):
+            batch_delete_fish_by_ids = BatchDeleteFishByIdsMutation.Field()
+
+        user = UserFactory.create()
+        fish = FishFactory.create()
+
+        schema = Schema(mutation=Mutations)
+        ids = [to_global_id("FishNode", "not-a-number"), to_global_id("FishNode", fish.id)]
+        result = schema.execute(
+            self.mutation, variables={"ids": ids}, context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+
+        data = Dict(result.data)
+        self.assertEqual(data.batchDeleteFishByIds.deletionCount, 1)
+        self.assertEqual(data.batchDeleteFishByIds.found, [False, True])
+        self.assertFalse(Fish.objects.exists())
+
+    def test_mutate__get_queryset_overridden__only_deletes_scoped_objects(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        class BatchDeleteFishByIdsMutation(DjangoBatchDeleteByIdsMutation):
+            class Meta:
+                model = Fish
+
+            @classmethod
+            def get_queryset(cls, info, **args):
+                return Fish.objects.filter(owner=info.context.user)
+
+        class Mutations(graphene.ObjectType):
+            batch_delete_fish_by_ids = BatchDeleteFishByIdsMutation.Field()
+
+        user = UserFactory.create()
+        own_fish = FishFactory.create(owner=user)
+        other_fish = FishFactory.create(owner=UserFactory.create())
+
+        schema = Schema(mutation=Mutations)
+        result = schema.execute(
+            self.mutation,
+            variables={
+                "ids": [
+                    to_global_id("FishNode", other_fish.id),
+                    to_global_id("FishNode", own_fish.id),
+                ]
+            },
+            context=Dict(user=user),
+        )
+        self.assertIsNone(result.errors)
+
+        data = Dict(result.data)
+        self.assertEqual(data.batchDeleteFishByIds.deletionCount, 1)
+        self.assertEqual(data.batchDeleteFishByIds.found, [False, True])
+        self.assertEqual(list(Fish.objects.all()), [other_fish])
+
+    def test_fast_delete__deletes_with_single_query(self):
+        # This registers the FishNode type
+        # noinspection PyUnresolvedReferences
+        from .schema import FishNode
+
+        class BatchDeleteFishByIdsMutation(DjangoBatchDeleteByIdsMutation):
+            class Meta:
+                model = Fish
+                use_fast_delete = True
+
+        class Mutations(graphene.ObjectType):
+            batch_delete_fish_by_ids = BatchDeleteFishByIdsMutation.Field()
+
+        user = UserFactory.create()
+        fish = FishFactory.create_batch(3)
+
+        schema = Schema(mutation=Mutations)
+        ids = [to_global_id("FishNode", f.id) for f in fish[:2]]
+        with self.assertNumQueries(1):
+            result = schema.execute(
+                self.mutation, variables={"ids": ids}, context=Dict(user=user),
+            )
+        self.assertIsNone(result.errors)
+
+        data = Dict(result.data)
+        self.assertEqual(data.batchDeleteFishByIds.deletionCount, 2)
+        self.assertEqual(data.batchDeleteFishByIds.found, [True, True])
+        self.assertEqual(list(Fish.objects.all()), [fish[2]])
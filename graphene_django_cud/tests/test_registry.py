@@ -0,0 +1,62 @@
+import graphene
+from django.test import TestCase
+
+from graphene_django_cud.registry import EMPTY_TYPE_META, TypeMeta, TypeMetaRegistry
+
+
+class TestTypeMetaRegistry(TestCase):
+    def test__registered_dicts__are_stored_as_immutable_records(self):
+        registry = TypeMetaRegistry()
+        registry.register(
+            "CreateDogInput",
+            {"many_to_many_extras": {"enemies": {"add": True}}, "unknown": 1},
+        )
+
+        meta = registry.get_meta_for_type("CreateDogInput")
+        self.assertIsInstance(meta, TypeMeta)
+        self.assertEqual(meta.many_to_many_extras, {"enemies": {"add": True}})
+        self.assertEqual(meta.get("many_to_many_extras"), {"enemies": {"add": True}})
+        self.assertEqual(meta.auto_context_fields, {})
+        self.assertEqual(meta.optional_fields, ())
+        self.assertIsNone(meta.get("unknown"))
+        with self.assertRaises(AttributeError):
+            meta.field_types = {}
+
+        self.assertIs(registry.get_meta_for_type("UnknownInput"), EMPTY_TYPE_META)
+
+    def test_get_meta_for_value__looks_up_parsed_values_by_class(self):
+        class LookupDogInput(graphene.InputObjectType):
+            name = graphene.String()
+
+        registry = TypeMetaRegistry()
+        meta = TypeMeta(auto_context_fields={"owner": "user"})
+        registry.register("LookupDogInput", meta)
+
+        value = LookupDogInput._meta.container({"name": "Lassie"})
+        self.assertIs(registry.get_meta_for_value(value, "OtherInput"), meta)
+        self.assertIs(registry._registry_by_class[type(value)], meta)
+
+        # Plain values fall back to the type name
+        self.assertIs(registry.get_meta_for_value({"name": "Lassie"}, "LookupDogInput"), meta)
+        self.assertIs(registry.get_meta_for_value({}, "OtherInput"), EMPTY_TYPE_META)
+
+        # Registering again invalidates the records looked up by class
+        other_meta = TypeMeta()
+        registry.register("LookupDogInput", other_meta)
+        self.assertIs(registry.get_meta_for_value(value, "LookupDogInput"), other_meta)
+
+    def test_get_meta_for_value__class_name_not_registered__falls_back_to_type_name(self):
+        class RenamedDogInput(graphene.InputObjectType):
+            class Meta:
+                name = "CustomDogInput"
+
+            name = graphene.String()
+
+        registry = TypeMetaRegistry()
+        meta = TypeMeta(auto_context_fields={"owner": "user"})
+        registry.register("CustomDogInput", meta)
+
+        value = RenamedDogInput._meta.container({"name": "Lassie"})
+        self.assertIs(registry.get_meta_for_value(value, "OtherInput"), EMPTY_TYPE_META)
+        self.assertIs(registry.get_meta_for_value(value, "CustomDogInput"), meta)
+        self.assertNotIn(type(value), registry._registry_by_class)
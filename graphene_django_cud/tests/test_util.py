@@ -0,0 +1,392 @@
+from unittest import mock
+
+from django.db.models import signals
+from django.test import TestCase
+from graphene_django import DjangoObjectType
+from graphql import GraphQLError
+from graphql_relay import to_global_id
+
+from graphene_django_cud.tests.factories import CatFactory, DogFactory, MouseFactory
+from graphene_django_cud.tests.models import Cat, Dog, Mouse, User
+from graphene_django_cud import util
+from graphene_django_cud.util import (
+    compile_field_plan,
+    disambiguate_id,
+    disambiguate_ids,
+    FIELD_EXTRA,
+    FIELD_FOREIGN_KEY,
+    FIELD_MANY_TO_MANY,
+    FIELD_SCALAR,
+    get_objs_by_ids,
+    clear_input_fields_cache,
+    get_all_optional_input_fields_for_model,
+    get_input_fields_for_model,
+    get_pks_by_ids,
+    LazyGlobalIds,
+    to_global_ids,
+    update_many_to_many_relation,
+)
+
+
+class TestDisambiguateId(TestCase):
+    def test__integer_tokens__returns_int(self):
+        self.assertEqual(disambiguate_id(12), 12)
+        self.assertEqual(disambiguate_id("12"), 12)
+        self.assertEqual(disambiguate_id(" -3 "), -3)
+
+    def test__global_id__returns_id(self):
+        self.assertEqual(disambiguate_id(to_global_id("MouseNode", 7)), "7")
+        self.assertEqual(disambiguate_id(to_global_id("MouseNode", "abc")), "abc")
+
+    def test__invalid_tokens__returns_minus_one(self):
+        self.assertEqual(disambiguate_id("John"), -1)
+        self.assertEqual(disambiguate_id("abc"), -1)
+        self.assertEqual(disambiguate_id(None), -1)
+
+    def test__expected_type_name__rejects_other_types(self):
+        global_id = to_global_id("MouseNode", 7)
+
+        self.assertEqual(disambiguate_id(global_id, "MouseNode"), "7")
+        self.assertEqual(disambiguate_id("7", "MouseNode"), 7)
+        with self.assertRaises(GraphQLError):
+            disambiguate_id(global_id, "CatNode")
+
+        self.assertEqual(disambiguate_id(global_id, ("CatNode", "MouseNode")), "7")
+        with self.assertRaisesMessage(
+            GraphQLError, "Expected an id of type CatNode or DogNode"
+        ):
+            disambiguate_id(global_id, ("CatNode", "DogNode"))
+
+    def test_disambiguate_ids__string__is_treated_as_single_id(self):
+        self.assertEqual(disambiguate_ids("12"), [12])
+        self.assertEqual(
+            disambiguate_ids(["12", to_global_id("MouseNode", 3)]), [12, "3"]
+        )
+
+
+class TestToGlobalIds(TestCase):
+    def test__mixed_ids__encodes_like_to_global_id(self):
+        ids = [1, "2", "æøå", 10 ** 12]
+
+        self.assertEqual(
+            to_global_ids("MouseNode", ids),
+            [to_global_id("MouseNode", _id) for _id in ids],
+        )
+
+    def test_lazy_global_ids__not_read__does_not_encode(self):
+        ids = LazyGlobalIds("MouseNode", [1, 2])
+
+        self.assertEqual(len(ids), 2)
+        self.assertIsNone(ids._global_ids)
+
+        self.assertEqual(
+            ids, [to_global_id("MouseNode", 1), to_global_id("MouseNode", 2)]
+        )
+        self.assertEqual(ids[1], to_global_id("MouseNode", 2))
+
+
+class TestGetObjsByIds(TestCase):
+    def test__mixed_ids_with_duplicates__returns_objects_in_input_order(self):
+        mice = MouseFactory.create_batch(3)
+        ids = [
+            mice[2].id,
+            to_global_id("MouseNode", mice[0].id),
+            str(mice[1].id),
+            mice[2].id,
+        ]
+
+        with self.assertNumQueries(1):
+            result = get_objs_by_ids(Mouse, ids)
+
+        self.assertEqual(result, [mice[2], mice[0], mice[1], mice[2]])
+
+    def test__missing_ids__raises_error_listing_all_missing_ids(self):
+        mouse = MouseFactory.create()
+
+        with self.assertRaises(Mouse.DoesNotExist) as context:
+            get_objs_by_ids(Mouse, [mouse.id, 9998, 9999])
+
+        self.assertIn("9998, 9999", str(context.exception))
+
+
+class TestGetPksByIds(TestCase):
+    def test__check_exists_false__does_not_query(self):
+        with self.assertNumQueries(0):
+            result = get_pks_by_ids(
+                Mouse, [to_global_id("MouseNode", 3), "4"], check_exists=False
+            )
+
+        self.assertEqual(result, [3, 4])
+
+    def test__check_exists__raises_error_listing_all_missing_ids(self):
+        mouse = MouseFactory.create()
+
+        with self.assertNumQueries(1):
+            with self.assertRaises(Mouse.DoesNotExist) as context:
+                get_pks_by_ids(Mouse, [mouse.id, 9998, 9999])
+
+        self.assertIn("9998, 9999", str(context.exception))
+
+
+class TestUpdateManyToManyRelation(TestCase):
+    def test__set_add_and_remove__writes_net_change_in_three_queries(self):
+        dog = DogFactory.create()
+        cats = CatFactory.create_batch(5)
+        dog.enemies.set(cats[:3])
+        field = Dog._meta.get_field("enemies")
+
+        with self.assertNumQueries(3):
+            update_many_to_many_relation(
+                dog,
+                field,
+                to_set=[cats[1], cats[2].id],
+                to_add=[cats[3].id, cats[4]],
+                to_remove=[cats[4].id],
+            )
+
+        self.assertEqual(
+            set(dog.enemies.values_list("id", flat=True)),
+            {cats[1].id, cats[2].id, cats[3].id},
+        )
+
+    def test__reverse_relation__sends_m2m_changed_signals(self):
+        cat = CatFactory.create()
+        dogs = DogFactory.create_batch(2)
+        cat.enemies.add(dogs[0])
+        field = cat._meta.get_field("enemies")
+        actions = []
+
+        def receiver(sender, action, pk_set, reverse, **kwargs):
+            actions.append((action, pk_set, reverse))
+
+        signals.m2m_changed.connect(receiver, sender=Dog.enemies.through)
+        try:
+            update_many_to_many_relation(cat, field, to_set=[dogs[1].id])
+        finally:
+            signals.m2m_changed.disconnect(receiver, sender=Dog.enemies.through)
+
+        self.assertEqual(
+            actions,
+            [
+                ("pre_remove", {dogs[0].id}, True),
+                ("post_remove", {dogs[0].id}, True),
+                ("pre_add", {dogs[1].id}, True),
+                ("post_add", {dogs[1].id}, True),
+            ],
+        )
+        self.assertEqual(list(cat.enemies.all()), [dogs[1]])
+
+
+class TestCompileFieldPlan(TestCase):
+    def test__model_fields__are_categorized_with_converters(self):
+        class Handlers:
+            @classmethod
+            def handle_name(cls, value, name, info):
+                return value.upper()
+
+        field_plan = compile_field_plan(Handlers, Dog, None, None, None)
+
+        owner = field_plan.get("owner")
+        self.assertEqual(owner.category, FIELD_FOREIGN_KEY)
+        self.assertEqual(owner.attname, "owner_id")
+        self.assertIs(owner.converter.decode, disambiguate_id)
+
+        enemies = field_plan.get("enemies")
+        self.assertEqual(enemies.category, FIELD_MANY_TO_MANY)
+        self.assertIs(enemies.converter.decode, disambiguate_ids)
+
+        name = field_plan.get("name")
+        self.assertEqual(name.category, FIELD_SCALAR)
+        self.assertIsNone(name.converter)
+        self.assertEqual(name.handler("dog", "name", None), "DOG")
+        self.assertIsNone(field_plan.get("tag").handler)
+
+    def test__extras__are_marked_as_extras(self):
+        field_plan = compile_field_plan(
+            object,
+            Dog,
+            {"enemies": {"exact": {"type": "ID"}, "add": {"type": "ID"}}},
+            {"owner": {"type": "CreateUserInput"}},
+            None,
+        )
+
+        for name in ("enemies", "enemies_add", "owner"):
+            self.assertEqual(field_plan.get(name).category, FIELD_EXTRA)
+        self.assertEqual(field_plan.get("friends").category, FIELD_MANY_TO_MANY)
+
+        with self.assertRaises(TypeError):
+            field_plan.entries["name"] = None
+
+    def test__relation_converters__reject_global_ids_of_other_types(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode, CatNode
+
+        field_plan = compile_field_plan(object, Dog, None, None, None)
+        owner = field_plan.get("owner")
+        enemies = field_plan.get("enemies")
+
+        self.assertEqual(owner.converter(to_global_id("UserNode", 1)), "1")
+        self.assertEqual(owner.converter("1"), 1)
+        self.assertEqual(enemies.converter([to_global_id("CatNode", 2)]), ["2"])
+
+        with self.assertRaises(GraphQLError):
+            owner.converter(to_global_id("CatNode", 1))
+        with self.assertRaises(GraphQLError):
+            enemies.converter([to_global_id("CatNode", 2), to_global_id("UserNode", 1)])
+
+    def test__relation_converters__accept_ids_of_any_node_type_of_the_model(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode, CatNode
+
+        field_plan = compile_field_plan(object, Dog, None, None, None)
+        enemies = field_plan.get("enemies")
+        self.assertEqual(enemies.converter([to_global_id("CatNode", 2)]), ["2"])
+
+        class CatSummaryNode(DjangoObjectType):
+            class Meta:
+                model = Cat
+                fields = ("name",)
+                skip_registry = True
+
+        self.assertEqual(
+            enemies.converter(
+                [to_global_id("CatNode", 2), to_global_id("CatSummaryNode", 3)]
+            ),
+            ["2", "3"],
+        )
+        with self.assertRaisesMessage(
+            GraphQLError, "Expected an id of type CatNode or CatSummaryNode"
+        ):
+            enemies.converter([to_global_id("UserNode", 1)])
+
+    def test__relation_converters__unknown_type_names__are_looked_up_once(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode, CatNode
+
+        clear_input_fields_cache()
+        field_plan = compile_field_plan(object, Dog, None, None, None)
+        enemies = field_plan.get("enemies")
+
+        with mock.patch(
+            "graphene_django_cud.util._find_node_type_names",
+            wraps=util._find_node_type_names,
+        ) as find_node_type_names:
+            enemies.converter([to_global_id("CatNode", 1), to_global_id("CatNode", 2)])
+            for _ in range(3):
+                with self.assertRaises(GraphQLError):
+                    enemies.converter([to_global_id("UserNode", 1)])
+
+        # Once for the first lookup, and once more for the first unknown name
+        self.assertEqual(find_node_type_names.call_count, 2)
+
+    def test__relation_converters__check_disabled__accept_ids_of_any_type(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode, CatNode
+
+        field_plan = compile_field_plan(object, Dog, None, None, None)
+        owner = field_plan.get("owner")
+
+        with self.settings(GRAPHENE_DJANGO_CUD_CHECK_ID_TYPES=False):
+            self.assertEqual(owner.converter(to_global_id("CatNode", 1)), "1")
+
+
+class TestGetInputFieldsForModel(TestCase):
+    def test__same_configuration__reuses_converted_fields(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import DogNode
+
+        fields = get_input_fields_for_model(
+            Dog, ("name", "tag"), (), optional_fields=("tag",)
+        )
+        other_fields = get_input_fields_for_model(
+            Dog, ["tag", "name"], [], optional_fields=["tag"]
+        )
+
+        self.assertEqual(list(fields), ["name", "tag"])
+        self.assertIsNot(fields, other_fields)
+        # Each type gets a copy of the converted field
+        self.assertIsNot(fields["name"], other_fields["name"])
+        self.assertIs(fields["name"].kwargs, other_fields["name"].kwargs)
+
+        required_fields = get_input_fields_for_model(
+            Dog, ("name", "tag"), (), required_fields=("tag",)
+        )
+        self.assertIsNot(fields["tag"], required_fields["tag"])
+
+    def test__nested_type_name__reuses_nested_input_type(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import UserNode, DogNode
+
+        many_to_one_extras = {
+            "dogs": {"add": {"type": "auto", "type_name": "SharedUserDogsAddInput"}}
+        }
+
+        fields = get_input_fields_for_model(
+            User,
+            (),
+            (),
+            many_to_one_extras=many_to_one_extras,
+            parent_type_name="CreateUserInput",
+        )
+        other_fields = get_input_fields_for_model(
+            User,
+            (),
+            (),
+            many_to_one_extras=many_to_one_extras,
+            parent_type_name="UpdateUserInput",
+        )
+
+        self.assertEqual(fields["dogs_add"].of_type.__name__, "SharedUserDogsAddInput")
+        self.assertIs(fields["dogs_add"].of_type, other_fields["dogs_add"].of_type)
+
+    def test__regular_and_all_optional_fields__share_one_walk_of_the_model(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import DogNode
+
+        clear_input_fields_cache()
+        with mock.patch(
+            "graphene_django_cud.util.get_model_fields",
+            wraps=util.get_model_fields,
+        ) as get_model_fields:
+            fields = get_input_fields_for_model(
+                Dog, (), (), optional_fields=("tag",), parent_type_name="UpdateDogInput"
+            )
+            optional_fields = get_all_optional_input_fields_for_model(
+                Dog, (), (), parent_type_name="PatchDogInput"
+            )
+
+        self.assertEqual(get_model_fields.call_count, 1)
+        self.assertEqual(list(fields), list(optional_fields))
+        self.assertIs(fields["tag"].kwargs, optional_fields["tag"].kwargs)
+        self.assertIsNot(fields["name"], optional_fields["name"])
+        self.assertFalse(optional_fields["name"].kwargs.get("required"))
+
+    def test__cached_fields__keep_the_order_of_the_model_fields(self):
+        # This registers the node types
+        # noinspection PyUnresolvedReferences
+        from .schema import DogNode
+
+        many_to_many_extras = {"enemies": {"add": {"type": "ID"}, "remove": True}}
+        get_input_fields_for_model(Dog, (), (), many_to_many_extras=many_to_many_extras)
+        # Reuses the walk of the model, but converts the fields again
+        fields = get_input_fields_for_model(
+            Dog,
+            (),
+            (),
+            optional_fields=("tag",),
+            many_to_many_extras=many_to_many_extras,
+        )
+
+        # Graphene orders the fields of a type by their creation
+        ordered_names = [
+            name for name, _ in sorted(fields.items(), key=lambda item: item[1])
+        ]
+        self.assertEqual(ordered_names, list(fields))
+        self.assertEqual(ordered_names[-2:], ["enemies_add", "enemies_remove"])
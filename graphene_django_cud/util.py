@@ -1,48 +1,324 @@
-from collections import OrderedDict
+import copy
+import inspect
+import re
+from base64 import b64encode
+from collections import OrderedDict, namedtuple
+from collections.abc import Sequence
+from functools import lru_cache, wraps
+from types import MappingProxyType
 
 import graphene
-from django.db import models
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections, models, router
+from django.db.models import signals, sql
 from graphene import InputObjectType
+from graphene_django import DjangoObjectType
 from graphene_django.registry import get_global_registry
 from graphene_django.utils import get_model_fields
+from graphene.utils.str_converters import to_camel_case
 from graphql import GraphQLError
+from graphql.language import ast
 from graphql_relay import from_global_id
-from typing import Union
+from typing import Collection, Union
 
 from graphene_django_cud.converter import (
+    _choices_enums,
+    _converted_choices,
     convert_django_field_with_choices,
     convert_many_to_many_field,
 )
-from graphene_django_cud.registry import get_type_meta_registry
+from graphene_django_cud.profiling import count_build_event, profile_build_step
+from graphene_django_cud.registry import TypeMeta, get_type_meta_registry
 
 
-def disambiguate_id(ambiguous_id: Union[int, float, str]):
+# The number of decoded relay global ids which are cached
+GLOBAL_ID_CACHE_SIZE = 4096
+
+_INTEGER_RE = re.compile(r"\s*[+-]?\d+\s*\Z")
+
+
+@lru_cache(maxsize=GLOBAL_ID_CACHE_SIZE)
+def _decode_global_id(global_id: str):
+    try:
+        type_name, _id = from_global_id(global_id)
+    except ValueError:
+        # Also covers errors from the base64 and utf-8 decoding
+        return None
+    return type_name, _id
+
+
+def disambiguate_id(
+    ambiguous_id: Union[int, float, str],
+    expected_type_name: Union[str, Collection[str]] = None,
+):
     """
     disambiguate_id takes an id which may either be an integer-parsable
     variable, either as a string or a number; or it might be a base64 encoded
     global relay value.
 
-    The method then attempts to extract from this token the actual id.
+    The method then attempts to extract from this token the actual id. Global ids
+    are decoded through a bounded cache, as the same ids tend to be sent
+    repeatedly.
+
+    :param expected_type_name: If given, global ids of any other type are rejected.
+        Several type names can be given as a collection.
+    :return: The id, or -1 if the token could not be decoded.
+    """
+    if isinstance(ambiguous_id, str):
+        if _INTEGER_RE.match(ambiguous_id):
+            return int(ambiguous_id)
+
+        decoded = _decode_global_id(ambiguous_id)
+        if decoded is None:
+            return -1
+
+        type_name, _id = decoded
+        if expected_type_name is not None:
+            if isinstance(expected_type_name, str):
+                expected_type_name = (expected_type_name,)
+            if type_name not in expected_type_name:
+                raise GraphQLError(
+                    f"Expected an id of type {' or '.join(expected_type_name)}, "
+                    f"got an id of type {type_name}."
+                )
+        return _id
+
+    if isinstance(ambiguous_id, (int, float)):
+        return int(ambiguous_id)
+
+    return -1
+
+
+def disambiguate_ids(ids, expected_type_name: Union[str, Collection[str]] = None):
+    if isinstance(ids, str) or not hasattr(ids, "__iter__"):
+        return [disambiguate_id(ids, expected_type_name)]
+    return [disambiguate_id(_id, expected_type_name) for _id in ids]
+
+
+def to_global_ids(type_name, ids):
+    """
+    Encodes a list of ids as relay global ids of the given type. Equivalent to
+    calling `to_global_id` for each id, but the type prefix is only encoded once.
+    """
+    prefix = f"{type_name}:".encode("utf-8")
+    return [
+        b64encode(prefix + str(_id).encode("utf-8")).decode("ascii") for _id in ids
+    ]
+
+
+class LazyGlobalIds(Sequence):
+    """
+    A sequence of relay global ids, which are encoded from the given ids the
+    first time the sequence is read. If it is never read, e.g. because the
+    field it is returned in is not selected, no encoding is done at all.
+    """
+
+    __slots__ = ("type_name", "_ids", "_global_ids")
+
+    def __init__(self, type_name, ids):
+        self.type_name = type_name
+        self._ids = ids
+        self._global_ids = None
+
+    @property
+    def global_ids(self):
+        if self._global_ids is None:
+            self._global_ids = to_global_ids(self.type_name, self._ids)
+            self._ids = None
+        return self._global_ids
+
+    def __getitem__(self, index):
+        return self.global_ids[index]
+
+    def __iter__(self):
+        return iter(self.global_ids)
+
+    def __len__(self):
+        if self._global_ids is None:
+            return len(self._ids)
+        return len(self._global_ids)
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return self.global_ids == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"LazyGlobalIds({self.global_ids!r})"
+
+
+def _find_node_type_names(model):
+    registry = get_global_registry()
+    names = set()
+    node_types = DjangoObjectType.__subclasses__()
+    while node_types:
+        node_type = node_types.pop()
+        node_types.extend(node_type.__subclasses__())
+        meta = getattr(node_type, "_meta", None)
+        if getattr(meta, "model", None) is model and meta.registry is registry:
+            names.add(node_type.__name__)
+            names.add(meta.name)
+    return frozenset(names)
+
+
+class NodeTypeNames:
+    """
+    The names of all node types of a model, including those created with
+    `skip_registry`, which global ids referring to the model may carry. Any name
+    is accepted if the model has no node type.
+
+    As node types may be created after the first lookup, the names are looked up
+    again the first time an unknown name is seen. Names which are still unknown
+    are remembered as such, so that every later check of a name, known or not,
+    costs one set lookup. `clear_input_fields_cache` forgets all names.
+    """
+
+    __slots__ = ("model", "_names", "_unknown_names")
+
+    def __init__(self, model):
+        self.model = model
+        self._names = None
+        self._unknown_names = set()
+
+    def __contains__(self, name):
+        names = self._names
+        if names is None or (name not in names and name not in self._unknown_names):
+            names = self._names = _find_node_type_names(self.model)
+            if name not in names:
+                self._unknown_names.add(name)
+        return not names or name in names
+
+    def __iter__(self):
+        if self._names is None:
+            self._names = _find_node_type_names(self.model)
+        return iter(sorted(self._names))
+
+
+_node_type_names = {}
+
+
+def get_node_type_names(model):
+    """
+    Returns the names of the node types of a model, which global ids referring to
+    the model are expected to carry, or None if the ids are not to be checked.
+
+    The check is turned off with the `GRAPHENE_DJANGO_CUD_CHECK_ID_TYPES` setting.
+    """
+    if not getattr(settings, "GRAPHENE_DJANGO_CUD_CHECK_ID_TYPES", True):
+        return None
+
+    names = _node_type_names.get(model)
+    if names is None:
+        names = _node_type_names[model] = NodeTypeNames(model)
+    return names
+
+
+class TypedIdConverter:
+    """
+    Converts the id(s) given to an input field referring to another model, and
+    rejects global ids of any other type than the node types of that model.
+    """
+
+    __slots__ = ("decode", "model")
+
+    def __init__(self, decode, model):
+        self.decode = decode
+        self.model = model
+
+    def __call__(self, value):
+        return self.decode(value, get_node_type_names(self.model))
 
+
+def _get_pks_from_ids(model, ids):
+    pk_field = model._meta.pk
+    pks = []
+    for _id in disambiguate_ids(ids, get_node_type_names(model)):
+        try:
+            pks.append(pk_field.to_python(_id))
+        except ValidationError:
+            pks.append(_id)
+    return pks
+
+
+def _raise_for_missing_pks(model, pks, found_pks):
+    missing = [pk for pk in OrderedDict.fromkeys(pks) if pk not in found_pks]
+    if missing:
+        raise model.DoesNotExist(
+            f"{model._meta.object_name} matching the ids "
+            f"{', '.join(str(pk) for pk in missing)} does not exist."
+        )
+
+
+def get_objs_by_ids(model, ids, queryset=None):
+    """
+    get_objs_by_ids fetches all objects of a model with the given ids in a single
+    query. The ids may be any mix of primary keys and relay global ids. If a
+    queryset is supplied, the objects are looked up within it.
+
+    The objects are returned in the order of the ids, and an id occurring multiple
+    times yields the same object multiple times.
+
+    :raises model.DoesNotExist: If any of the ids cannot be found. The error lists
+        every missing id.
     :return:
     """
-    # First see if it is an integer, if so
-    # it is definitely not a relay global id
-    final_id = -1
-    try:
-        final_id = int(ambiguous_id)
-        return final_id
-    except ValueError:
-        # Try global value
-        (_, final_id) = from_global_id(ambiguous_id)
-    finally:
-        return final_id
+    if queryset is None:
+        queryset = model.objects
 
+    pks = _get_pks_from_ids(model, ids)
+    objs = queryset.in_bulk(set(pks))
+    _raise_for_missing_pks(model, pks, objs)
 
-def disambiguate_ids(ids):
-    if not hasattr(ids, "__iter__"):
-        return [disambiguate_id(ids)]
-    return [disambiguate_id(_id) for _id in ids]
+    return [objs[pk] for pk in pks]
+
+
+def get_pks_by_ids(model, ids, check_exists=True):
+    """
+    get_pks_by_ids converts a list of ids, which may be any mix of primary keys and
+    relay global ids, into primary keys of the given model without fetching the
+    objects themselves.
+
+    If check_exists is true, a single query is made to ensure that all the
+    primary keys exist.
+
+    :raises model.DoesNotExist: If check_exists is true and any of the ids cannot
+        be found. The error lists every missing id.
+    :return:
+    """
+    pks = _get_pks_from_ids(model, ids)
+    if check_exists and pks:
+        found_pks = set(
+            model.objects.filter(pk__in=set(pks)).values_list("pk", flat=True)
+        )
+        _raise_for_missing_pks(model, pks, found_pks)
+
+    return pks
+
+
+def is_field_selected(info, field_name):
+    """
+    Checks whether a field of the mutation payload is selected in the query being
+    executed. Fragments are not resolved, so a selection containing fragments is
+    considered to select every field.
+    """
+    field_asts = getattr(info, "field_asts", None)
+    if not field_asts:
+        return True
+
+    names = (field_name, to_camel_case(field_name))
+    for field_ast in field_asts:
+        selection_set = getattr(field_ast, "selection_set", None)
+        if selection_set is None:
+            continue
+
+        for selection in selection_set.selections:
+            if not isinstance(selection, ast.Field):
+                return True
+            if selection.name.value in names:
+                return True
+
+    return False
 
 
 def overload_nested_fields(nested_fields):
@@ -65,197 +341,161 @@ def overload_nested_fields(nested_fields):
         return {}
 
 
-def get_input_fields_for_model(
-    model,
-    only_fields,
-    exclude_fields,
-    optional_fields=(),
-    required_fields=(),
-    many_to_many_extras=None,
-    foreign_key_extras=None,
-    many_to_one_extras=None,
-    parent_type_name="",
-    field_types=None,
-    ignore_primary_key=True,
-) -> OrderedDict:
-
-    registry = get_global_registry()
-    meta_registry = get_type_meta_registry()
-    model_fields = get_model_fields(model)
-
-    many_to_many_extras = many_to_many_extras or {}
-    foreign_key_extras = foreign_key_extras or {}
-    many_to_one_extras = many_to_one_extras or {}
-    field_types = field_types or {}
+class _IdentityKey:
+    """
+    Makes an unhashable object, such as a graphene field, part of a cache key by
+    its identity. The object is kept alive, so its id cannot be reused.
+    """
 
-    fields = OrderedDict()
-    fields_lookup = {}
-    for name, field in model_fields:
-        # We ignore the primary key
-        if getattr(field, "primary_key", False) and ignore_primary_key:
-            continue
+    __slots__ = ("value",)
 
-        # If the field has an override, use that
-        if name in field_types:
-            fields[name] = field_types[name]
-            continue
+    def __init__(self, value):
+        self.value = value
 
-        # Save for later
-        fields_lookup[name] = field
+    def __hash__(self):
+        return id(self.value)
 
-        is_not_in_only = only_fields and name not in only_fields
-        # is_already_created = name in options.fields
-        is_excluded = name in exclude_fields  # or is_already_created
-        # https://docs.djangoproject.com/en/1.10/ref/models/fields/#django.db.models.ForeignKey.related_query_name
-        is_no_backref = str(name).endswith("+")
-        if is_not_in_only or is_excluded or is_no_backref:
-            # We skip this field if we specify only_fields and is not
-            # in there. Or when we exclude this field in exclude_fields.
-            # Or when there is no back reference.
-            continue
+    def __eq__(self, other):
+        return isinstance(other, _IdentityKey) and other.value is self.value
 
-        required = None
-        if name in optional_fields:
-            required = False
-        elif name in required_fields:
-            required = True
 
-        converted = convert_django_field_with_choices(
-            field,
-            registry,
-            required,
-            many_to_many_extras.get(name, {}).get("exact"),
-            foreign_key_extras.get(name, {}),
-        )
-        fields[name] = converted
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return _IdentityKey(value)
+    return value
 
-    # Create extra many_to_many_fields
-    for name, extras in many_to_many_extras.items():
-        field = fields_lookup.get(name)
-        if field is None:
-            raise GraphQLError(
-                f"Error adding extras for {name} in model f{model}. Field {name} does not exist."
-            )
 
-        for extra_name, data in extras.items():
+# Arguments whose order does not matter, and which are hence keyed as sets
+_INPUT_FIELDS_SET_ARGUMENTS = ("only_fields", "exclude_fields")
 
-            # This is handled above
-            if extra_name == "exact":
-                continue
+# Nested input types, keyed on their name, model and configuration
+_nested_input_types = {}
 
-            if isinstance(data, bool):
-                data = {}
+_input_fields_caches = [
+    _nested_input_types,
+    _choices_enums,
+    _converted_choices,
+    _node_type_names,
+]
 
-            _type_name = data.get("type")
-            _field = convert_many_to_many_field(field, registry, False, data, None)
 
-            # Default to the same as the "exact" version
-            if not _field:
-                _field = fields[name]
+def _memoize_input_fields(func):
+    """
+    Caches the result of a function generating input fields under a key made of
+    all arguments, so that mutations sharing a configuration reuse the converted
+    fields instead of converting them again. Graphene fields are only mounted when
+    a type is created from them, so the same fields can be used in any number of
+    types.
+    """
+    signature = inspect.signature(func)
+    cache = {}
+    _input_fields_caches.append(cache)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        key = tuple(
+            (
+                frozenset(_freeze(value or ()))
+                if name in _INPUT_FIELDS_SET_ARGUMENTS and not isinstance(value, str)
+                else _freeze(value)
+            )
+            for name, value in arguments.arguments.items()
+        )
 
-            # operation = data.get('operation') or get_likely_operation_from_name(extra_name)
-            fields[name + "_" + extra_name] = _field
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = func(*args, **kwargs)
+        return result
 
-    for name, extras in many_to_one_extras.items():
-        field = fields_lookup.get(name)
-        if field is None:
-            raise GraphQLError(
-                f"Error adding extras for {name} in model f{model}. Field {name} does not exist."
-            )
+    return wrapper
 
-        for extra_name, data in extras.items():
 
-            argument_name = data.get("name", name + "_" + extra_name)
+def clear_input_fields_cache():
+    """
+    Clears the cached input fields, nested input types, choice enums and node type
+    names, e.g. after models have been changed in tests.
+    """
+    for cache in _input_fields_caches:
+        cache.clear()
 
-            # Override default
-            if extra_name == "exact":
-                argument_name = name
 
-            if isinstance(data, bool):
-                data = {"type": "ID"}
+_UNCONVERTED = object()
 
-            _type = data.get("type")
-            if not _type or _type == "auto":
-                # Create new type.
-                operation_name = data.get(
-                    "operation", get_likely_operation_from_name(extra_name)
-                )
-                _type_name = data.get(
-                    "type_name",
-                    f"{parent_type_name or ''}{operation_name.capitalize()}{model.__name__}{name.capitalize()}",
-                )
 
-                converted_fields = get_input_fields_for_model(
-                    field.related_model,
-                    data.get("only_fields", ()),
-                    data.get(
-                        "exclude_fields", (field.field.name,)
-                    ),  # Exclude the field referring back to the foreign key
-                    data.get("optional_fields", ()),
-                    data.get("required_fields", ()),
-                    data.get("many_to_many_extras"),
-                    data.get("foreign_key_extras"),
-                    data.get("many_to_one_extras"),
-                    parent_type_name=_type_name,
-                    field_types=data.get("field_types"),
-                    # Don't ignore the primary key on updates
-                    ignore_primary_key=operation_name != "update"
-                )
-                InputType = type(_type_name, (InputObjectType,), converted_fields)
-                meta_registry.register(
-                    _type_name,
-                    {
-                        "auto_context_fields": data.get("auto_context_fields", {}),
-                        "optional_fields": data.get("optional_fields", ()),
-                        "required_fields": data.get("required_fields", ()),
-                        "many_to_many_extras": data.get("many_to_many_extras", {}),
-                        "many_to_one_extras": data.get("many_to_one_extras", {}),
-                        "foreign_key_extras": data.get("auto_context_fields", {}),
-                        "field_types": data.get("field_types", {}),
-                    },
-                )
-                _field = graphene.List(
-                    type(_type_name, (InputObjectType,), converted_fields),
-                    required=False,
-                )
-            else:
-                _field = convert_many_to_many_field(field, registry, False, data, None)
+class _InputFieldConversion:
+    """
+    A model field which is to be converted to an input field. It is converted at
+    most once for each value of `required`.
+    """
 
-            fields[argument_name] = _field
+    __slots__ = (
+        "field",
+        "field_many_to_many_extras",
+        "field_foreign_key_extras",
+        "_converted",
+    )
 
-    return fields
+    def __init__(self, field, field_many_to_many_extras, field_foreign_key_extras):
+        self.field = field
+        self.field_many_to_many_extras = field_many_to_many_extras
+        self.field_foreign_key_extras = field_foreign_key_extras
+        self._converted = {}
+
+    def get(self, required):
+        converted = self._converted.get(required, _UNCONVERTED)
+        if converted is _UNCONVERTED:
+            converted = convert_django_field_with_choices(
+                self.field,
+                get_global_registry(),
+                required,
+                self.field_many_to_many_extras,
+                self.field_foreign_key_extras,
+            )
+            self._converted[required] = converted
+        return converted
 
 
-def get_all_optional_input_fields_for_model(
+@_memoize_input_fields
+def _walk_model_input_fields(
     model,
     only_fields,
     exclude_fields,
-    many_to_many_extras=None,
-    foreign_key_extras=None,
-    many_to_one_extras=None,
-    parent_type_name="",
-    field_types=None,
-    ignore_primary_key=True,
+    many_to_many_extras,
+    foreign_key_extras,
+    field_types,
+    ignore_primary_key,
 ):
-    registry = get_global_registry()
-    meta_registry = get_type_meta_registry()
-    model_fields = get_model_fields(model)
+    """
+    Walks the fields of a model once. Both the regular and the all optional input
+    fields are generated from the result, so that e.g. the create, update and patch
+    mutations of a model share a single walk.
 
-    many_to_many_extras = many_to_many_extras or {}
-    foreign_key_extras = foreign_key_extras or {}
-    many_to_one_extras = many_to_one_extras or {}
-    field_types = field_types or {}
+    :return: A tuple of the input fields as (name, conversion or field type) pairs,
+        the model fields by name, and the many to many extra fields as
+        (argument name, field name, converted field) tuples.
+    """
+    registry = get_global_registry()
 
-    fields = OrderedDict()
+    entries = []
     fields_lookup = {}
-    for name, field in model_fields:
+    for name, field in get_model_fields(model):
         # We ignore the primary key
         if getattr(field, "primary_key", False) and ignore_primary_key:
             continue
 
         # If the field has an override, use that
         if name in field_types:
-            fields[name] = field_types[name]
+            entries.append((name, field_types[name]))
             continue
 
         # Save for later
@@ -272,17 +512,19 @@ def get_all_optional_input_fields_for_model(
             # Or when there is no back reference.
             continue
 
-        converted = convert_django_field_with_choices(
-            field,
-            registry,
-            False,
-            many_to_many_extras.get(name, {}).get("exact"),
-            foreign_key_extras.get(name, {}),
+        entries.append(
+            (
+                name,
+                _InputFieldConversion(
+                    field,
+                    many_to_many_extras.get(name, {}).get("exact"),
+                    foreign_key_extras.get(name, {}),
+                ),
+            )
         )
 
-        fields[name] = converted
-
     # Create extra many_to_many_fields
+    extra_entries = []
     for name, extras in many_to_many_extras.items():
         field = fields_lookup.get(name)
         if field is None:
@@ -299,15 +541,19 @@ def get_all_optional_input_fields_for_model(
             if isinstance(data, bool):
                 data = {}
 
-            _type_name = data.get("type")
             _field = convert_many_to_many_field(field, registry, False, data, None)
 
-            # Default to the same as the "exact" version
-            if not _field:
-                _field = fields[name]
-
             # operation = data.get('operation') or get_likely_operation_from_name(extra_name)
-            fields[name + "_" + extra_name] = _field
+            extra_entries.append((name + "_" + extra_name, name, _field))
+
+    return tuple(entries), fields_lookup, tuple(extra_entries)
+
+
+def _add_many_to_one_extra_fields(
+    fields, model, fields_lookup, many_to_one_extras, parent_type_name
+):
+    registry = get_global_registry()
+    meta_registry = get_type_meta_registry()
 
     for name, extras in many_to_one_extras.items():
         field = fields_lookup.get(name)
@@ -337,47 +583,193 @@ def get_all_optional_input_fields_for_model(
                     "type_name",
                     f"{parent_type_name or ''}{operation_name.capitalize()}{model.__name__}{name.capitalize()}",
                 )
-                converted_fields = get_input_fields_for_model(
-                    field.related_model,
-                    data.get("only_fields", ()),
-                    data.get(
-                        "exclude_fields", (field.field.name,)
-                    ),  # Exclude the field referring back to the foreign key
-                    data.get("optional_fields", ()),
-                    data.get("required_fields", ()),
-                    data.get("many_to_many_extras"),
-                    data.get("foreign_key_extras"),
-                    data.get("many_to_one_extras"),
-                    parent_type_name=_type_name,
-                    field_types=data.get("field_types"),
-                    # Don't ignore the primary key on updates
-                    ignore_primary_key=operation_name != "update"
-                )
-                InputType = type(_type_name, (InputObjectType,), converted_fields)
-                meta_registry.register(
+                type_key = (
                     _type_name,
-                    {
-                        "auto_context_fields": data.get("auto_context_fields", {}),
-                        "optional_fields": data.get("optional_fields", ()),
-                        "required_fields": data.get("required_fields", ()),
-                        "many_to_many_extras": data.get("many_to_many_extras", {}),
-                        "many_to_one_extras": data.get("many_to_one_extras", {}),
-                        "foreign_key_extras": data.get("auto_context_fields", {}),
-                        "field_types": data.get("field_types", {}),
-                    },
-                )
-                _field = graphene.List(
-                    type(_type_name, (InputObjectType,), converted_fields),
-                    required=False,
+                    field.related_model,
+                    operation_name,
+                    _freeze(data),
                 )
+                InputType = _nested_input_types.get(type_key)
+                if InputType is None:
+                    converted_fields = get_input_fields_for_model(
+                        field.related_model,
+                        data.get("only_fields", ()),
+                        data.get(
+                            "exclude_fields", (field.field.name,)
+                        ),  # Exclude the field referring back to the foreign key
+                        data.get("optional_fields", ()),
+                        data.get("required_fields", ()),
+                        data.get("many_to_many_extras"),
+                        data.get("foreign_key_extras"),
+                        data.get("many_to_one_extras"),
+                        parent_type_name=_type_name,
+                        field_types=data.get("field_types"),
+                        # Don't ignore the primary key on updates
+                        ignore_primary_key=operation_name != "update"
+                    )
+                    InputType = type(_type_name, (InputObjectType,), converted_fields)
+                    _nested_input_types[type_key] = InputType
+                    count_build_event("nested_input_types")
+                    meta_registry.register(
+                        _type_name,
+                        TypeMeta(
+                            auto_context_fields=data.get("auto_context_fields", {}),
+                            optional_fields=data.get("optional_fields", ()),
+                            required_fields=data.get("required_fields", ()),
+                            many_to_many_extras=data.get("many_to_many_extras", {}),
+                            many_to_one_extras=data.get("many_to_one_extras", {}),
+                            foreign_key_extras=data.get("foreign_key_extras", {}),
+                            field_types=data.get("field_types", {}),
+                        ),
+                    )
+                _field = graphene.List(InputType, required=False)
             else:
                 _field = convert_many_to_many_field(field, registry, False, data, None)
 
             fields[argument_name] = _field
 
+
+def _copy_input_field(field):
+    """
+    Returns a copy of a cached input field, which is ordered after the fields
+    created before it. Graphene orders the fields of a type by their creation, so
+    the cached fields would otherwise keep the order of the first type built
+    from them.
+    """
+    if field is None:
+        return None
+    field = copy.copy(field)
+    field.reset_counter()
+    return field
+
+
+def _build_input_fields_for_model(
+    model,
+    only_fields,
+    exclude_fields,
+    optional_fields,
+    required_fields,
+    many_to_many_extras,
+    foreign_key_extras,
+    many_to_one_extras,
+    parent_type_name,
+    field_types,
+    ignore_primary_key,
+    all_optional,
+):
+    many_to_many_extras = many_to_many_extras or {}
+    foreign_key_extras = foreign_key_extras or {}
+    many_to_one_extras = many_to_one_extras or {}
+    field_types = field_types or {}
+    optional_fields = set(optional_fields)
+    required_fields = set(required_fields)
+
+    entries, fields_lookup, extra_entries = _walk_model_input_fields(
+        model,
+        only_fields,
+        exclude_fields,
+        many_to_many_extras,
+        foreign_key_extras,
+        field_types,
+        ignore_primary_key,
+    )
+
+    fields = OrderedDict()
+    for name, conversion in entries:
+        if not isinstance(conversion, _InputFieldConversion):
+            fields[name] = conversion
+            continue
+
+        required = None
+        if all_optional or name in optional_fields:
+            required = False
+        elif name in required_fields:
+            required = True
+
+        fields[name] = _copy_input_field(conversion.get(required))
+
+    for argument_name, name, _field in extra_entries:
+        # Default to the same as the "exact" version
+        fields[argument_name] = _copy_input_field(_field) if _field else fields[name]
+
+    _add_many_to_one_extra_fields(
+        fields, model, fields_lookup, many_to_one_extras, parent_type_name
+    )
+
     return fields
 
 
+@profile_build_step("get_input_fields_for_model")
+def get_input_fields_for_model(
+    model,
+    only_fields,
+    exclude_fields,
+    optional_fields=(),
+    required_fields=(),
+    many_to_many_extras=None,
+    foreign_key_extras=None,
+    many_to_one_extras=None,
+    parent_type_name="",
+    field_types=None,
+    ignore_primary_key=True,
+) -> OrderedDict:
+    return _build_input_fields_for_model(
+        model,
+        only_fields,
+        exclude_fields,
+        optional_fields,
+        required_fields,
+        many_to_many_extras,
+        foreign_key_extras,
+        many_to_one_extras,
+        parent_type_name,
+        field_types,
+        ignore_primary_key,
+        all_optional=False,
+    )
+
+
+@profile_build_step("get_all_optional_input_fields_for_model")
+def get_all_optional_input_fields_for_model(
+    model,
+    only_fields,
+    exclude_fields,
+    many_to_many_extras=None,
+    foreign_key_extras=None,
+    many_to_one_extras=None,
+    parent_type_name="",
+    field_types=None,
+    ignore_primary_key=True,
+):
+    return _build_input_fields_for_model(
+        model,
+        only_fields,
+        exclude_fields,
+        (),
+        (),
+        many_to_many_extras,
+        foreign_key_extras,
+        many_to_one_extras,
+        parent_type_name,
+        field_types,
+        ignore_primary_key,
+        all_optional=True,
+    )
+
+
+def get_input_field_names_for_model(
+    model, only_fields, exclude_fields, field_types=None, ignore_primary_key=True
+):
+    """
+    Returns the names of the input fields of a model, not including extras,
+    without converting the fields.
+    """
+    entries, _, _ = _walk_model_input_fields(
+        model, only_fields, exclude_fields, {}, {}, field_types or {}, ignore_primary_key
+    )
+    return [name for name, _ in entries]
+
+
 def get_likely_operation_from_name(extra_name):
     extra_name = extra_name.lower()
     if extra_name == "exact":
@@ -473,6 +865,165 @@ def is_many_to_many(field):
     )
 
 
+def get_m2m_through_fields(field):
+    """
+    Finds the through model of a many-to-many field (or its reverse relation),
+    together with the attribute names of the through model columns pointing
+    at the owning and the related model, respectively.
+
+    :return: A tuple of (through_model, source_attname, target_attname)
+    """
+    if type(field) == models.ManyToManyRel:
+        through = field.through
+        source_field_name = field.field.m2m_reverse_field_name()
+        target_field_name = field.field.m2m_field_name()
+    else:
+        through = field.remote_field.through
+        source_field_name = field.m2m_field_name()
+        target_field_name = field.m2m_reverse_field_name()
+
+    return (
+        through,
+        through._meta.get_field(source_field_name).attname,
+        through._meta.get_field(target_field_name).attname,
+    )
+
+
+def can_write_through_model(field):
+    """
+    Checks whether the relation of a field can be written directly to its
+    through model. This holds for many-to-many fields (and their reverse
+    relations) with an auto-created through model, which are not symmetrical.
+    """
+    if type(field) == models.ManyToManyField:
+        rel = field.remote_field
+    elif type(field) == models.ManyToManyRel:
+        rel = field
+    else:
+        return False
+
+    return rel.through._meta.auto_created and not rel.symmetrical
+
+
+def get_pks_for_objs(model, objs):
+    """
+    Converts a list of model instances and/or primary key values into a list of
+    primary keys of the given model.
+    """
+    pk_field = model._meta.pk
+    return [
+        obj.pk if isinstance(obj, models.Model) else pk_field.to_python(obj)
+        for obj in objs
+    ]
+
+
+def update_many_to_many_relation(obj, field, to_set=None, to_add=(), to_remove=()):
+    """
+    Applies the net result of setting, adding and removing related objects on a
+    many-to-many relation by writing directly to the through model.
+
+    The current state of the relation is read with a single query, and at most one
+    insert and one delete is issued. `m2m_changed` signals are sent as they
+    would have been by the related manager.
+
+    The field has to satisfy `can_write_through_model`.
+
+    :param to_set: The objects or primary keys the relation should consist of.
+        None means that the relation should not be reset.
+    :param to_add: Objects or primary keys to add to the relation.
+    :param to_remove: Objects or primary keys to remove from the relation.
+    """
+    related_model = field.related_model
+    through, source_attname, target_attname = get_m2m_through_fields(field)
+
+    pks_to_add = OrderedDict.fromkeys(
+        get_pks_for_objs(related_model, list(to_set or ()) + list(to_add))
+    )
+    pks_to_remove = set(get_pks_for_objs(related_model, to_remove))
+    for pk in pks_to_remove:
+        pks_to_add.pop(pk, None)
+
+    if to_set is None and not pks_to_add and not pks_to_remove:
+        return
+
+    db = router.db_for_write(through, instance=obj)
+    relation = through._default_manager.using(db).filter(**{source_attname: obj.pk})
+
+    if to_set is not None or pks_to_add:
+        current_pks = set(relation.values_list(target_attname, flat=True))
+        pks_to_insert = [pk for pk in pks_to_add if pk not in current_pks]
+        if to_set is not None:
+            pks_to_delete = current_pks - set(pks_to_add)
+        else:
+            pks_to_delete = current_pks & pks_to_remove
+    else:
+        pks_to_insert = []
+        pks_to_delete = pks_to_remove
+
+    signal_kwargs = {
+        "sender": through,
+        "instance": obj,
+        "reverse": type(field) == models.ManyToManyRel,
+        "model": related_model,
+        "using": db,
+    }
+
+    if pks_to_delete:
+        signals.m2m_changed.send(
+            action="pre_remove", pk_set=set(pks_to_delete), **signal_kwargs
+        )
+        relation.filter(**{f"{target_attname}__in": pks_to_delete}).delete()
+        signals.m2m_changed.send(
+            action="post_remove", pk_set=set(pks_to_delete), **signal_kwargs
+        )
+
+    if pks_to_insert:
+        signals.m2m_changed.send(
+            action="pre_add", pk_set=set(pks_to_insert), **signal_kwargs
+        )
+        through._default_manager.using(db).bulk_create(
+            [
+                through(**{source_attname: obj.pk, target_attname: pk})
+                for pk in pks_to_insert
+            ]
+        )
+        signals.m2m_changed.send(
+            action="post_add", pk_set=set(pks_to_insert), **signal_kwargs
+        )
+
+
+def supports_delete_returning(connection):
+    """
+    Checks whether the database supports `DELETE ... RETURNING`.
+    """
+    if connection.vendor == "postgresql":
+        return True
+    if connection.vendor == "sqlite":
+        return connection.Database.sqlite_version_info >= (3, 35)
+    if connection.vendor == "mysql":
+        return connection.mysql_is_mariadb and connection.mysql_version >= (10, 0, 5)
+    return False
+
+
+def delete_returning_pks(queryset, using):
+    """
+    Deletes the rows of the queryset with a single `DELETE ... RETURNING` query,
+    and returns their primary keys. As for `QuerySet._raw_delete`, no signals are
+    sent and no cascades are followed.
+    """
+    connection = connections[using]
+    query = queryset.query.clone()
+    query.__class__ = sql.DeleteQuery
+    delete_sql, params = query.get_compiler(using).as_sql()
+
+    pk = queryset.model._meta.pk
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"{delete_sql} RETURNING {connection.ops.quote_name(pk.column)}", params
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
 def get_m2m_all_extras_field_names(extras):
     res = []
     if not extras:
@@ -497,3 +1048,98 @@ def get_fk_all_extras_field_names(extras):
     if not extras:
         return []
     return extras.keys()
+
+
+FIELD_EXTRA = "extra"
+FIELD_MANY_TO_MANY = "many_to_many"
+FIELD_FOREIGN_KEY = "foreign_key"
+FIELD_ID = "id"
+FIELD_SCALAR = "scalar"
+
+FieldPlanEntry = namedtuple(
+    "FieldPlanEntry", ("name", "field", "attname", "category", "converter", "handler")
+)
+
+
+def _compile_field_plan_entry(handler_source, name, field):
+    handler = None
+    value_handle_name = "handle_" + name
+    if hasattr(handler_source, value_handle_name):
+        handler = getattr(handler_source, value_handle_name)
+        assert callable(
+            handler
+        ), f"Property {value_handle_name} on {handler_source.__name__} is not a function."
+
+    if is_many_to_many(field):
+        category = FIELD_MANY_TO_MANY
+        converter = TypedIdConverter(disambiguate_ids, field.related_model)
+    elif type(field) in (models.ForeignKey, models.OneToOneField):
+        category = FIELD_FOREIGN_KEY
+        converter = TypedIdConverter(disambiguate_id, field.related_model)
+    elif type(field) in (models.AutoField,):
+        category, converter = FIELD_ID, disambiguate_id
+    else:
+        category, converter = FIELD_SCALAR, None
+
+    return FieldPlanEntry(
+        name, field, getattr(field, "attname", name), category, converter, handler
+    )
+
+
+class FieldPlan:
+    """
+    The precompiled handling of the input fields of a mutation: for every input
+    name, the model field, the attribute to assign, the kind of field, the default
+    value conversion and the `handle_<name>` method, if any.
+    """
+
+    __slots__ = ("model", "entries", "extras", "handler_source")
+
+    def __init__(self, model, entries, extras, handler_source):
+        self.model = model
+        self.entries = MappingProxyType(entries)
+        self.extras = extras
+        self.handler_source = handler_source
+
+    def get(self, name):
+        entry = self.entries.get(name)
+        if entry is None:
+            # Not a field name known up front, e.g. a reverse relation accessed by
+            # another name. Fall back to looking it up.
+            entry = _compile_field_plan_entry(
+                self.handler_source, name, self.model._meta.get_field(name)
+            )
+        return entry
+
+
+def compile_field_plan(
+    handler_source, model, many_to_many_extras, foreign_key_extras, many_to_one_extras
+):
+    """
+    Compiles the field plan of a model. Input names belonging to extras are marked
+    as such, as they are handled separately.
+
+    :param handler_source: The class on which `handle_<name>` methods are looked up.
+    """
+    entries = {}
+
+    extras_field_names = (
+        list(get_m2m_all_extras_field_names(many_to_many_extras))
+        + list(get_m2m_all_extras_field_names(many_to_one_extras))
+        + list(get_fk_all_extras_field_names(foreign_key_extras))
+    )
+    for name in extras_field_names:
+        entries[name] = FieldPlanEntry(name, None, name, FIELD_EXTRA, None, None)
+
+    for field in model._meta.get_fields():
+        if field.name not in entries:
+            entries[field.name] = _compile_field_plan_entry(
+                handler_source, field.name, field
+            )
+
+    return FieldPlan(
+        model,
+        entries,
+        (many_to_many_extras, foreign_key_extras, many_to_one_extras),
+        handler_source,
+    )
@@ -15,7 +15,8 @@ setuptools.setup(
     packages=setuptools.find_packages(),
     install_requires=[
         "graphene-django>=2.0",
-        "graphene-file-upload>=1.2"
+        "graphene-file-upload>=1.2",
+        "contextvars>=2.4; python_version < '3.7'"
     ],
     classifiers=[
         "Programming Language :: Python :: 3",